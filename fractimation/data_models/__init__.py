@@ -5,6 +5,20 @@ Fractimation Data_Models Subpackage contains various modules and classes related
 Public Modules :
   * complex_range_params - Contains class for representing parameters associate with a range of
       complex numbers
+  * density_iteration_data - Contains class for representing the accumulated density of a point
+      cloud fractal
+  * escape_index_iteration_data - Contains class for representing the pixels which escaped during
+      a single fractal iteration
+  * expression_formula_params - Contains class for representing parameters associated with a
+      fractal formula given as an expression
   * formula_params - Contains class for representing parameters associated with a fractal formula
+  * geometric_iteration_data - Contains class for representing the shapes produced by a single
+      geometric fractal iteration
+  * ifs_params - Contains class for representing the affine transforms of an Iterated Function
+      System
   * image_params - Contains class for representing parameters associated with an image
+  * iteration_budget_params - Contains class for representing parameters associated with an
+      adaptive iteration budget
+  * polar_range_params - Contains class for representing parameters associated with a polar grid
+      of complex numbers
 """
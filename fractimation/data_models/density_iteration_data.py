@@ -0,0 +1,36 @@
+"""
+Fractimation specific Density Iteration Data Class
+
+Public Classes :
+  * DensityIterationData - Represents the accumulated point density after a single iteration
+"""
+
+class DensityIterationData(object):
+    """
+    Accumulated hit counts of a point cloud fractal (ie. Chaos Game or Buddhabrot)
+
+    Public Attributes :
+      * histogram - An array of shape (width, height) containing the accumulated number of hits of
+          each pixel; owned by the producing iterator and updated in place by later iterations
+      * sample_count - The total number of samples accumulated into the histogram
+    """
+
+    histogram = None
+    sample_count = None
+
+    def __init__(self, histogram, sample_count):
+        """
+        Constructor
+
+        Parameters :
+          * histogram - An array of shape (width, height) containing the hit count of each pixel
+          * sample_count - The total number of samples accumulated into the histogram
+        """
+        self.histogram = histogram
+        self.sample_count = sample_count
+
+    def get_histogram(self):
+        return self.histogram
+
+    def get_sample_count(self):
+        return self.sample_count
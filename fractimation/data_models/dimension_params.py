@@ -1,5 +1,7 @@
 import numpy
 
+from ..helpers.morton_tools import get_morton_raster_indexes
+
 class DimensionParams(object):
     """description of class"""
 
@@ -7,15 +9,43 @@ class DimensionParams(object):
     height = None
     x_indexes = None
     y_indexes = None
+    allocate_indexes = True
+    morton_order = False
+    raster_indexes = None
 
-    def __init__(self, width, height):
+    def __init__(self, width, height, allocate_indexes=True, morton_order=False):
         self.width = width
         self.height = height
+        # Out-of-core renders (ie. gigapixel prints) never hold full resolution index grids
+        self.allocate_indexes = allocate_indexes
+        # Morton ordered index arrays are 1 dimensional, so nearby surviving pixels stay close in
+        #   memory however far the iteration working set is compacted; symmetry detection needs 2
+        #   dimensional grids, so symmetric renders (ie. Multibrot) compute every pixel instead
+        self.morton_order = morton_order
 
         self.initialize()
 
     def initialize(self):
-        self.x_indexes, self.y_indexes = numpy.mgrid[0:self.width, 0:self.height]
+        if not self.allocate_indexes:
+            return
+
+        if not self.morton_order:
+            self.x_indexes, self.y_indexes = numpy.mgrid[0:self.width, 0:self.height]
+            return
+
+        # The order only depends on the dimensions, so it is reused when zooming
+        if self.raster_indexes is None:
+            self.raster_indexes = get_morton_raster_indexes(self.width, self.height)
+        self.x_indexes, self.y_indexes = numpy.divmod(self.raster_indexes, self.height)
+
+    def __getstate__(self):
+        # Pickled copies (ie. sent to tile workers) only carry the dimensions, since workers never
+        #   use the index grids; call initialize on a copy to rebuild them
+        state = self.__dict__.copy()
+        state.pop("x_indexes", None)
+        state.pop("y_indexes", None)
+        state.pop("raster_indexes", None)
+        return state
 
     def get_width(self):
         return self.width
@@ -23,6 +53,19 @@ class DimensionParams(object):
     def get_height(self):
         return self.height
 
+    def get_allocate_indexes(self):
+        return self.allocate_indexes
+
+    def get_morton_order(self):
+        return self.morton_order
+
+    def get_raster_indexes(self):
+        """
+        Returns the raster flat index (x * height + y) of each position of the uncompacted Morton
+          ordered index arrays, or None for raster ordered index grids
+        """
+        return self.raster_indexes
+
     def get_x_indexes(self):
         return self.x_indexes
 
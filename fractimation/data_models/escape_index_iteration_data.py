@@ -0,0 +1,39 @@
+"""
+Fractimation specific Escape Index Iteration Data Class
+
+Public Classes :
+  * EscapeIndexIterationData - Represents the pixels which escaped during a single iteration
+"""
+
+class EscapeIndexIterationData(object):
+    """
+    Lean iteration data containing only the pixels which escaped during an iteration.  The arrays
+      are views into buffers owned by the producing iterator which are reused by the next
+      iteration; copy them if they must outlive the iteration.
+
+    Public Attributes :
+      * escaped_pixel_indexes - An int32 array of the flat pixel indexes (row-major over the
+          iterator's original pixel grid) which escaped during the iteration
+      * escape_values - An array of the escape magnitudes (ie. final |z|) of the escaped pixels
+          in the same order as escaped_pixel_indexes; None if escape values were not requested
+    """
+
+    escaped_pixel_indexes = None
+    escape_values = None
+
+    def __init__(self, escaped_pixel_indexes, escape_values=None):
+        """
+        Constructor
+
+        Parameters :
+          * escaped_pixel_indexes - An int32 array of the flat pixel indexes which escaped
+          * escape_values (optional) - An array of the escape magnitudes of the escaped pixels
+        """
+        self.escaped_pixel_indexes = escaped_pixel_indexes
+        self.escape_values = escape_values
+
+    def get_escaped_pixel_indexes(self):
+        return self.escaped_pixel_indexes
+
+    def get_escape_values(self):
+        return self.escape_values
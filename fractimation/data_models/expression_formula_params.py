@@ -0,0 +1,40 @@
+"""
+Fractimation specific Expression Formula Parameter Class
+
+Public Classes :
+  * ExpressionFormulaParams - Represents the parameters associated with a Fractal Formula given as
+      an expression
+"""
+
+class ExpressionFormulaParams(object):
+    """
+    Parameters for initializing and executing a Fractal Formula written as an expression of z & c
+      (see helpers.formula_compiler for the allowed names, operators & functions)
+
+    Public Attributes :
+      * expression - Formula of the next z value in terms of z & c
+          (ie. "(abs(re(z)) + 1j*abs(im(z)))**2 + c" for the Burning Ship)
+      * escape_value - A threshold value used to determine when to stop evaluating a pixel's
+          associated complex values
+    """
+
+    expression = None
+    escape_value = None
+
+    def __init__(self, expression, escape_value):
+        """
+        Constructor
+
+        Parameters :
+          * expression - Formula of the next z value in terms of z & c
+          * escape_value - A threshold value used to determine when to stop evaluating a pixel's
+              associated complex values
+        """
+        self.expression = expression
+        self.escape_value = escape_value
+
+    def get_expression(self):
+        return self.expression
+
+    def get_escape_value(self):
+        return self.escape_value
@@ -0,0 +1,36 @@
+"""
+Fractimation specific Geometric Iteration Data Class
+
+Public Classes :
+  * GeometricIterationData - Represents the shapes produced by a single geometric fractal iteration
+"""
+
+class GeometricIterationData(object):
+    """
+    Vertices of all shapes produced by a single iteration of a geometric fractal
+
+    Public Attributes :
+      * vertices - A float array of shape (shape_count, vertex_count, 2) containing the x & y
+          coordinates of each vertex of each shape
+      * closed - Whether the shapes are closed polygons (True) or open polylines (False)
+    """
+
+    vertices = None
+    closed = None
+
+    def __init__(self, vertices, closed):
+        """
+        Constructor
+
+        Parameters :
+          * vertices - A float array of shape (shape_count, vertex_count, 2)
+          * closed - Whether the shapes are closed polygons or open polylines
+        """
+        self.vertices = vertices
+        self.closed = closed
+
+    def get_vertices(self):
+        return self.vertices
+
+    def get_closed(self):
+        return self.closed
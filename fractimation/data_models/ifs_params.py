@@ -0,0 +1,57 @@
+"""
+Fractimation specific Iterated Function System Parameter Class
+
+Public Classes :
+  * IfsParams - Represents the affine transforms of an Iterated Function System
+"""
+
+import numpy
+
+class IfsParams(object):
+    """
+    Parameters describing an Iterated Function System made of affine transforms
+      (ie. [x, y] = matrix . [x, y] + offset)
+
+    Public Attributes :
+      * transform_matrices - A float array of shape (transform_count, 2, 2) containing the linear
+          part of each transform
+      * transform_offsets - A float array of shape (transform_count, 2) containing the translation
+          part of each transform
+      * probabilities - A float array of shape (transform_count) containing the probability of
+          selecting each transform
+    """
+
+    transform_matrices = None
+    transform_offsets = None
+    probabilities = None
+
+    def __init__(self, transform_matrices, transform_offsets, probabilities=None):
+        """
+        Constructor
+
+        Parameters :
+          * transform_matrices - An array of shape (transform_count, 2, 2) containing the linear
+              part of each transform
+          * transform_offsets - An array of shape (transform_count, 2) containing the translation
+              part of each transform
+          * probabilities (optional) - An array of shape (transform_count) containing the relative
+              probability of selecting each transform (default weights each transform by the
+              absolute determinant of its matrix)
+        """
+        self.transform_matrices = numpy.array(transform_matrices, dtype=float)
+        self.transform_offsets = numpy.array(transform_offsets, dtype=float)
+
+        if probabilities is None:
+            probabilities = numpy.abs(numpy.linalg.det(self.transform_matrices))
+            probabilities = numpy.maximum(probabilities, numpy.max(probabilities) * 0.01)
+        probabilities = numpy.array(probabilities, dtype=float)
+        self.probabilities = probabilities / numpy.sum(probabilities)
+
+    def get_transform_matrices(self):
+        return self.transform_matrices
+
+    def get_transform_offsets(self):
+        return self.transform_offsets
+
+    def get_probabilities(self):
+        return self.probabilities
@@ -16,14 +16,17 @@ class ImageParams(object):
       * width - The width of the image
       * heigh - The height of the image
       * color_map - A color map to be applied to the image
+      * equalize_histogram - Whether escape frames are colored by the cumulative distribution of
+          escapes instead of linearly
     """
 
     color_map = None
     initial_value = None
     recolor_image = None
+    equalize_histogram = None
 
     def __init__(self, color_map=_DEFAULT_COLOR_MAP, initial_value=_DEFAULT_IMAGE_ARRAY_VALUE,
-                 recolor_image=False):
+                 recolor_image=False, equalize_histogram=False):
         """
         Constructor
 
@@ -31,10 +34,13 @@ class ImageParams(object):
           * width - The width of the image
           * heigh - The height of the image
           * color_map - A color map to be applied to the image
+          * equalize_histogram (optional) - Whether escape frames are colored by the cumulative
+              distribution of escapes instead of linearly
         """
         self.color_map = color_map
         self.initial_value = initial_value
         self.recolor_image = recolor_image
+        self.equalize_histogram = equalize_histogram
 
     def get_width(self):
         return self.width
@@ -50,3 +56,6 @@ class ImageParams(object):
 
     def get_recolor_image(self):
         return self.recolor_image
+
+    def get_equalize_histogram(self):
+        return self.equalize_histogram
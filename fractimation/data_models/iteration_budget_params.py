@@ -0,0 +1,97 @@
+"""
+Fractimation specific Iteration Budget Parameter Class
+
+Public Classes :
+  * IterationBudgetParams - Represents the parameters of an adaptive iteration budget
+"""
+
+import math
+
+_DEFAULT_BASE_ITERATIONS = 50
+_DEFAULT_ITERATIONS_PER_ZOOM_LEVEL = 20
+_DEFAULT_REFERENCE_SPAN = 4.0
+_DEFAULT_WINDOW_SIZE = 10
+_DEFAULT_MIN_ESCAPE_RATE = 0.0001
+_DEFAULT_EXTENSION_ITERATIONS = 50
+_DEFAULT_MAX_ITERATIONS = 10000
+
+class IterationBudgetParams(object):
+    """
+    Parameters for adapting the number of iterations of a fractal formula to the zoom depth of the
+      view and to the rate at which pixels are still escaping
+
+    Public Attributes :
+      * base_iterations - Iteration budget of a view spanning the reference span
+      * iterations_per_zoom_level - Iterations added to the budget each time the view span halves
+      * reference_span - Span of the complex plane which is considered unzoomed
+      * window_size - Number of trailing iterations used to measure the escape rate
+      * min_escape_rate - Fraction of all pixels which must escape per iteration (averaged over the
+          trailing window) for the budget to be extended
+      * extension_iterations - Iterations added to the budget each time it is extended
+      * max_iterations - Upper limit of the budget
+    """
+
+    base_iterations = None
+    iterations_per_zoom_level = None
+    reference_span = None
+    window_size = None
+    min_escape_rate = None
+    extension_iterations = None
+    max_iterations = None
+
+    def __init__(self, base_iterations=_DEFAULT_BASE_ITERATIONS,
+                 iterations_per_zoom_level=_DEFAULT_ITERATIONS_PER_ZOOM_LEVEL,
+                 reference_span=_DEFAULT_REFERENCE_SPAN, window_size=_DEFAULT_WINDOW_SIZE,
+                 min_escape_rate=_DEFAULT_MIN_ESCAPE_RATE,
+                 extension_iterations=_DEFAULT_EXTENSION_ITERATIONS,
+                 max_iterations=_DEFAULT_MAX_ITERATIONS):
+        """
+        Constructor
+
+        Parameters :
+          * base_iterations (optional) - Iteration budget of a view spanning the reference span
+          * iterations_per_zoom_level (optional) - Iterations added to the budget each time the
+              view span halves
+          * reference_span (optional) - Span of the complex plane which is considered unzoomed
+          * window_size (optional) - Number of trailing iterations used to measure the escape rate
+          * min_escape_rate (optional) - Fraction of all pixels which must escape per iteration
+              (averaged over the trailing window) for the budget to be extended
+          * extension_iterations (optional) - Iterations added to the budget each time it is
+              extended
+          * max_iterations (optional) - Upper limit of the budget
+        """
+        self.base_iterations = base_iterations
+        self.iterations_per_zoom_level = iterations_per_zoom_level
+        self.reference_span = reference_span
+        self.window_size = window_size
+        self.min_escape_rate = min_escape_rate
+        self.extension_iterations = extension_iterations
+        self.max_iterations = max_iterations
+
+    def get_zoom_depth(self, complex_range_params):
+        """
+        Returns the number of times the reference span has been halved to reach the view
+
+        Parameters :
+          * complex_range_params - ComplexRangeParams of the view
+        """
+        real_span = abs(complex_range_params.max_real_number -
+                        complex_range_params.min_real_number)
+        imaginary_span = abs(complex_range_params.max_imaginary_number -
+                             complex_range_params.min_imaginary_number)
+        view_span = max(real_span, imaginary_span)
+        if view_span <= 0:
+            return 0.0
+
+        return max(0.0, math.log2(self.reference_span / view_span))
+
+    def get_initial_budget(self, complex_range_params):
+        """
+        Returns the iteration budget a render of the view starts with
+
+        Parameters :
+          * complex_range_params - ComplexRangeParams of the view
+        """
+        zoom_depth = self.get_zoom_depth(complex_range_params)
+        initial_budget = self.base_iterations + self.iterations_per_zoom_level * zoom_depth
+        return min(int(math.ceil(initial_budget)), self.max_iterations)
@@ -0,0 +1,63 @@
+"""
+Fractimation specific Polar Range Parameter Class
+
+Public Classes :
+  * PolarRangeParams - Represents the parameters associated with a polar grid of complex numbers
+"""
+
+import numpy
+
+class PolarRangeParams(object):
+    """
+    Parameters for creating a polar grid of complex numbers around a center point; the first
+      dimension of the grid is the angle & the second dimension is the radius
+
+    Public Attributes :
+      * center_real_number - Real value of the center of the grid
+      * center_imaginary_number - Imaginary value of the center of the grid
+      * min_radius - Radius of the innermost ring of the grid
+      * max_radius - Radius of the outermost ring of the grid
+      * spacing_func - A function accepting 3 parameters (min_value, max_value, size) which returns
+          an array of increasing radii of the specified size
+    """
+
+    center_real_number = None
+    center_imaginary_number = None
+    min_radius = None
+    max_radius = None
+    spacing_func = None
+
+    def __init__(self, center_real_number, center_imaginary_number, min_radius, max_radius,
+                 spacing_func=numpy.geomspace):
+        """
+        Constructor
+
+        Parameters :
+          * center_real_number - Real value of the center of the grid
+          * center_imaginary_number - Imaginary value of the center of the grid
+          * min_radius - Radius of the innermost ring of the grid
+          * max_radius - Radius of the outermost ring of the grid
+          * spacing_func (optional) - A function accepting 3 parameters (min_value, max_value, size)
+              which returns an array of increasing radii of the specified size (default
+              numpy.geomspace produces a log-polar grid)
+        """
+        self.center_real_number = center_real_number
+        self.center_imaginary_number = center_imaginary_number
+        self.min_radius = min_radius
+        self.max_radius = max_radius
+        self.spacing_func = spacing_func
+
+    def get_center_real_number(self):
+        return self.center_real_number
+
+    def get_center_imaginary_number(self):
+        return self.center_imaginary_number
+
+    def get_min_radius(self):
+        return self.min_radius
+
+    def get_max_radius(self):
+        return self.max_radius
+
+    def get_spacing_func(self):
+        return self.spacing_func
@@ -2,5 +2,16 @@
 Fractimation UI Subpackage contains modules and classes related to Fractimation's User Interface
 
 Public Modules :
-  * zoom_handler - Contains class for managing the Complex Range Zoom Functionality
+  * distributed_render - Contains classes for rendering tiles across worker processes & machines
+  * edge_supersampling - Contains class for anti-aliasing renders by supersampling edge pixels
+  * foveated_render - Contains class for rendering at full resolution only around a focus point
+  * frame_stream - Contains classes for streaming delta encoded frames to remote viewers over TCP
+  * interaction_replay - Contains classes for recording interaction sessions & replaying them to
+      measure latency
+  * lookahead_frame_producer - Contains class for rendering frames ahead of playback on a background
+      thread
+  * out_of_core_render - Contains class for streaming renders larger than memory into .npy files
+  * persistent_render_cache - Contains class for persisting rendered escape maps across processes
+  * render_scheduler - Contains class for sharing render threads & a memory budget across renderers
+  * zoomable_complex_range - Contains class for managing the Complex Range Zoom Functionality
 """
@@ -0,0 +1,465 @@
+"""
+Fractimation specific Distributed Tile Rendering
+
+The coordinator splits the escape map of a FractalFormulaIterable into tile jobs & serves them over
+  TCP using newline delimited JSON messages.  Workers pull jobs, render their tile with the existing
+  iterators & send the escape iterations back.  Jobs are leased; tiles whose lease expires, whose
+  worker disconnects or whose worker reports an error are queued again, and duplicate results for
+  completed tiles are ignored.  A tile which is still not rendered after max_attempts fails the
+  whole render.
+
+The fractal iterable is sent to workers pickled, so workers must only connect to trusted
+  coordinators.  Workers on other machines are started with :
+    python -m fractimation.functionality.distributed_render <coordinator_host> <coordinator_port>
+
+Public Methods :
+  * run_tile_worker - Connects to a coordinator & renders tiles until the render is complete
+  * render_tiles_locally - Renders a fractal using a coordinator & local worker processes
+
+Public Classes :
+  * TileRenderCoordinator - Splits a render into tile jobs & assembles the returned tiles
+  * TileRenderWorker - Pulls tile jobs from a coordinator & renders them
+"""
+
+import base64
+import collections
+import copy
+import json
+import multiprocessing
+import pickle
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+import uuid
+import zlib
+
+import numpy
+
+from ..helpers.escape_map_tools import compute_escape_map
+from ..helpers.formula_tools import generate_complex_range_tile
+
+_DEFAULT_HOST = "127.0.0.1"
+_DEFAULT_TILE_SIZE = 256
+_DEFAULT_LEASE_SECONDS = 60.0
+_DEFAULT_MAX_ATTEMPTS = 5
+_WAIT_SECONDS = 0.25
+_CONNECT_ATTEMPTS = 20
+_ESCAPE_MAP_DTYPE = numpy.int32
+_NOT_ESCAPED_VALUE = 0
+
+def _send_message(stream, message):
+    stream.write(json.dumps(message).encode("utf-8") + b"\n")
+    stream.flush()
+
+def _receive_message(stream):
+    message_line = stream.readline()
+    if not message_line:
+        return None
+
+    return json.loads(message_line.decode("utf-8"))
+
+def _encode_array(values):
+    """
+    Returns a JSON serializable description of an array with its data compressed
+
+    Parameters :
+      * values - The array to encode
+    """
+    values = numpy.ascontiguousarray(values)
+    return {"dtype": values.dtype.str, "shape": list(values.shape),
+            "data": base64.b64encode(zlib.compress(values.tobytes())).decode("ascii")}
+
+def _decode_array(description):
+    """
+    Returns the array described by the output of _encode_array
+
+    Parameters :
+      * description - The encoded array description
+    """
+    data = zlib.decompress(base64.b64decode(description["data"]))
+    values = numpy.frombuffer(data, dtype=numpy.dtype(description["dtype"]))
+    return values.reshape(description["shape"])
+
+class TileRenderCoordinator(object):
+    """
+    Splits the escape map of a FractalFormulaIterable into tiles which are rendered by workers
+      connecting over TCP, then assembles the returned tiles.  Every tile runs exactly
+      max_iterations iterations so tiles rendered on different workers always agree.
+
+    Public Methods :
+      * start - Starts serving tile jobs
+      * get_address - Returns the (host, port) workers connect to
+      * get_progress - Returns [completed_tile_count, tile_count]
+      * wait - Waits for every tile & returns the assembled escape map
+      * stop - Stops serving tile jobs
+    """
+
+    _render_spec = None
+    _max_iterations = None
+    _lease_seconds = None
+    _max_attempts = None
+
+    _tiles = None
+    _pending_jobs = None
+    _leases = None
+    _attempts = None
+    _completed_jobs = None
+    _job_errors = None
+    _escape_map = None
+    _failure = None
+
+    _lock = None
+    _completed_event = None
+    _server = None
+    _server_thread = None
+
+    def __init__(self, fractal_iterable, max_iterations, tile_width=_DEFAULT_TILE_SIZE,
+                 tile_height=_DEFAULT_TILE_SIZE, host=_DEFAULT_HOST, port=0,
+                 lease_seconds=_DEFAULT_LEASE_SECONDS, max_attempts=_DEFAULT_MAX_ATTEMPTS):
+        """
+        Constructor
+
+        Parameters :
+          * fractal_iterable - The FractalFormulaIterable to render
+          * max_iterations - Number of iterations each tile runs
+          * tile_width (optional) - Width of each tile in pixels
+          * tile_height (optional) - Height of each tile in pixels
+          * host (optional) - Interface to listen on (use "0.0.0.0" for workers on other machines)
+          * port (optional) - Port to listen on (default picks a free port)
+          * lease_seconds (optional) - Seconds a worker has to return a tile before the tile is
+              given to another worker
+          * max_attempts (optional) - Number of times a tile is handed out before the render fails
+        """
+        # Tiles run a fixed number of iterations, so the adaptive budget is not sent to workers
+        render_iterable = copy.copy(fractal_iterable)
+        render_iterable.set_iteration_budget_params(None)
+        self._render_spec = base64.b64encode(pickle.dumps(render_iterable)).decode("ascii")
+
+        self._max_iterations = max_iterations
+        self._lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+
+        dimension_params = fractal_iterable.get_dimension_params()
+        width, height = dimension_params.width, dimension_params.height
+        self._tiles = [[x_start, min(x_start + tile_width, width),
+                        y_start, min(y_start + tile_height, height)]
+                       for x_start in range(0, width, tile_width)
+                       for y_start in range(0, height, tile_height)]
+        self._pending_jobs = collections.deque(range(0, len(self._tiles)))
+        self._leases = dict()
+        self._attempts = collections.Counter()
+        self._completed_jobs = set()
+        self._job_errors = dict()
+        self._escape_map = numpy.full([width, height], _NOT_ESCAPED_VALUE,
+                                      dtype=_ESCAPE_MAP_DTYPE)
+
+        self._lock = threading.Lock()
+        self._completed_event = threading.Event()
+        self._server = _CoordinatorServer((host, port), _CoordinatorRequestHandler)
+        self._server.coordinator = self
+
+    def start(self):
+        self._server_thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._server_thread.start()
+
+    def get_address(self):
+        return self._server.server_address[:2]
+
+    def get_progress(self):
+        with self._lock:
+            return [len(self._completed_jobs), len(self._tiles)]
+
+    def wait(self, timeout=None):
+        """
+        Waits for every tile to be rendered and returns the escape map of shape (width, height)
+          containing the frame each pixel escaped on (0 for pixels which never escaped)
+
+        Parameters :
+          * timeout (optional) - Maximum number of seconds to wait
+        """
+        if not self._completed_event.wait(timeout):
+            raise TimeoutError("Tile render did not complete within {} seconds".format(timeout))
+        if self._failure is not None:
+            raise RuntimeError(self._failure)
+
+        return self._escape_map
+
+    def stop(self):
+        if self._server_thread is not None:
+            self._server.shutdown()
+            self._server_thread = None
+        self._server.server_close()
+
+    def _lease_job(self, connection_id):
+        """
+        Returns the next job message for a worker
+
+        Parameters :
+          * connection_id - Identifier of the worker's connection
+        """
+        with self._lock:
+            if self._completed_event.is_set():
+                return {"type": "done"}
+
+            self._expire_leases()
+            if not self._pending_jobs:
+                return {"type": "wait", "seconds": _WAIT_SECONDS}
+
+            job_id = self._pending_jobs.popleft()
+            self._attempts[job_id] += 1
+            if self._attempts[job_id] > self._max_attempts:
+                failure = "Tile {} failed after {} attempts".format(job_id, self._max_attempts)
+                if job_id in self._job_errors:
+                    failure += ", last error :\n{}".format(self._job_errors[job_id])
+                self._fail(failure)
+                return {"type": "done"}
+
+            self._leases[job_id] = [connection_id, time.monotonic() + self._lease_seconds]
+            return {"type": "job", "job_id": job_id, "tile": self._tiles[job_id],
+                    "max_iterations": self._max_iterations}
+
+    def _complete_job(self, job_id, escape_tile):
+        """
+        Stores a rendered tile unless the tile was already completed by another worker
+
+        Parameters :
+          * job_id - The job the tile belongs to
+          * escape_tile - The escape map of the tile
+        """
+        with self._lock:
+            self._leases.pop(job_id, None)
+            if job_id in self._completed_jobs:
+                return
+
+            x_start, x_stop, y_start, y_stop = self._tiles[job_id]
+            self._escape_map[x_start:x_stop, y_start:y_stop] = escape_tile
+            self._completed_jobs.add(job_id)
+            if len(self._completed_jobs) == len(self._tiles):
+                self._completed_event.set()
+
+    def _release_job(self, job_id, job_error):
+        """
+        Queues a job again after its worker reported an error; the job's attempts still count, so
+          a tile failing on every worker fails the render
+
+        Parameters :
+          * job_id - The job to queue again
+          * job_error - Description of the error reported by the worker
+        """
+        with self._lock:
+            self._job_errors[job_id] = job_error
+            if self._leases.pop(job_id, None) is not None and job_id not in self._completed_jobs:
+                self._pending_jobs.append(job_id)
+
+    def _release_connection(self, connection_id):
+        """
+        Queues every job leased by a disconnected worker again
+
+        Parameters :
+          * connection_id - Identifier of the worker's connection
+        """
+        with self._lock:
+            released_jobs = [job_id for job_id, lease in self._leases.items()
+                             if lease[0] == connection_id]
+            for job_id in released_jobs:
+                del self._leases[job_id]
+                if job_id not in self._completed_jobs:
+                    self._pending_jobs.append(job_id)
+
+    def _expire_leases(self):
+        current_time = time.monotonic()
+        expired_jobs = [job_id for job_id, lease in self._leases.items()
+                        if lease[1] < current_time]
+        for job_id in expired_jobs:
+            del self._leases[job_id]
+            self._pending_jobs.append(job_id)
+
+    def _fail(self, failure):
+        self._failure = failure
+        self._completed_event.set()
+
+class _CoordinatorServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    coordinator = None
+
+class _CoordinatorRequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        coordinator = self.server.coordinator
+        connection_id = uuid.uuid4().hex
+        spec_sent = False
+
+        try:
+            while True:
+                message = _receive_message(self.rfile)
+                if message is None:
+                    break
+
+                message_type = message.get("type")
+                if message_type == "request_job":
+                    response = coordinator._lease_job(connection_id)
+                    if response["type"] == "job" and not spec_sent:
+                        response["render_spec"] = coordinator._render_spec
+                        spec_sent = True
+                elif message_type == "result":
+                    escape_tile = _decode_array(message["escape_tile"])
+                    coordinator._complete_job(message["job_id"], escape_tile)
+                    response = {"type": "ack"}
+                elif message_type == "error":
+                    coordinator._release_job(message["job_id"], message.get("message"))
+                    # Workers which failed to load the render spec get it again with their next job
+                    if not message.get("render_spec_loaded", True):
+                        spec_sent = False
+                    response = {"type": "ack"}
+                else:
+                    response = {"type": "error", "message": "Unknown message type"}
+
+                _send_message(self.wfile, response)
+        except (OSError, ValueError):
+            pass
+        finally:
+            coordinator._release_connection(connection_id)
+
+class TileRenderWorker(object):
+    """
+    Pulls tile jobs from a TileRenderCoordinator and renders them until the render is complete
+
+    Public Methods :
+      * run - Renders tiles until the coordinator reports the render is complete
+      * get_rendered_tile_count - Returns the number of tiles this worker rendered
+    """
+
+    _host = None
+    _port = None
+    _fractal_iterable = None
+    _rendered_tile_count = 0
+
+    def __init__(self, host, port):
+        """
+        Constructor
+
+        Parameters :
+          * host - Host name of the coordinator
+          * port - Port of the coordinator
+        """
+        self._host = host
+        self._port = port
+
+    def get_rendered_tile_count(self):
+        return self._rendered_tile_count
+
+    def run(self):
+        with self._connect() as connection:
+            stream = connection.makefile("rwb")
+            while True:
+                _send_message(stream, {"type": "request_job"})
+                message = _receive_message(stream)
+                if message is None or message["type"] == "done":
+                    break
+                if message["type"] == "wait":
+                    time.sleep(message["seconds"])
+                    continue
+
+                # Errors are reported & the worker carries on, so the coordinator decides when a
+                #   tile has failed too often
+                try:
+                    if "render_spec" in message:
+                        self._fractal_iterable = None
+                        self._fractal_iterable = self._load_render_spec(message["render_spec"])
+                    escape_tile = self._render_tile(message["tile"], message["max_iterations"])
+                except Exception:
+                    _send_message(stream, {"type": "error", "job_id": message["job_id"],
+                                           "message": traceback.format_exc(),
+                                           "render_spec_loaded":
+                                               self._fractal_iterable is not None})
+                    _receive_message(stream)
+                    continue
+
+                _send_message(stream, {"type": "result", "job_id": message["job_id"],
+                                       "escape_tile": _encode_array(escape_tile)})
+                _receive_message(stream)
+                self._rendered_tile_count += 1
+
+    def _load_render_spec(self, render_spec):
+        return pickle.loads(base64.b64decode(render_spec))
+
+    def _connect(self):
+        # Workers may start before the coordinator is listening
+        for attempt_counter in range(1, _CONNECT_ATTEMPTS + 1):
+            try:
+                return socket.create_connection((self._host, self._port))
+            except ConnectionRefusedError:
+                if attempt_counter == _CONNECT_ATTEMPTS:
+                    raise
+                time.sleep(_WAIT_SECONDS)
+
+    def _render_tile(self, tile, max_iterations):
+        x_start, x_stop, y_start, y_stop = tile
+        fractal_iterable = self._fractal_iterable
+        dimension_params = fractal_iterable.get_dimension_params()
+
+        exploit_symmetry = fractal_iterable.get_exploit_symmetry()
+        z_values_range = generate_complex_range_tile(fractal_iterable.get_z_values_range_params(),
+                                                     dimension_params, x_start, x_stop, y_start,
+                                                     y_stop, exploit_symmetry)
+        c_values_range = generate_complex_range_tile(fractal_iterable.get_c_values_range_params(),
+                                                     dimension_params, x_start, x_stop, y_start,
+                                                     y_stop, exploit_symmetry)
+
+        fractal_iterator = fractal_iterable.create_iterator(z_values_range, c_values_range)
+        tile_shape = [x_stop - x_start, y_stop - y_start]
+        escape_tile, iteration_count = compute_escape_map(fractal_iterator,
+                                                          tile_shape[0] * tile_shape[1],
+                                                          max_iterations, _NOT_ESCAPED_VALUE)
+        return escape_tile.astype(_ESCAPE_MAP_DTYPE).reshape(tile_shape)
+
+def run_tile_worker(host, port):
+    """
+    Connects to a TileRenderCoordinator and renders tiles until the render is complete
+
+    Parameters :
+      * host - Host name of the coordinator
+      * port - Port of the coordinator
+    """
+    TileRenderWorker(host, port).run()
+
+def render_tiles_locally(fractal_iterable, max_iterations, worker_count,
+                         tile_width=_DEFAULT_TILE_SIZE, tile_height=_DEFAULT_TILE_SIZE,
+                         timeout=None):
+    """
+    Renders the escape map of a FractalFormulaIterable using a TileRenderCoordinator and local
+      worker processes standing in for remote machines
+
+    Parameters :
+      * fractal_iterable - The FractalFormulaIterable to render
+      * max_iterations - Number of iterations each tile runs
+      * worker_count - Number of worker processes
+      * tile_width (optional) - Width of each tile in pixels
+      * tile_height (optional) - Height of each tile in pixels
+      * timeout (optional) - Maximum number of seconds to wait for the render
+    """
+    coordinator = TileRenderCoordinator(fractal_iterable, max_iterations, tile_width, tile_height)
+    coordinator.start()
+    host, port = coordinator.get_address()
+
+    worker_processes = [multiprocessing.Process(target=run_tile_worker, args=(host, port),
+                                                daemon=True)
+                        for worker_counter in range(0, worker_count)]
+    try:
+        for worker_process in worker_processes:
+            worker_process.start()
+
+        return coordinator.wait(timeout)
+    finally:
+        for worker_process in worker_processes:
+            worker_process.join(_WAIT_SECONDS * 4)
+            if worker_process.is_alive():
+                worker_process.terminate()
+        coordinator.stop()
+
+if __name__ == "__main__":
+    run_tile_worker(sys.argv[1], int(sys.argv[2]))
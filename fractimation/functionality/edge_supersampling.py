@@ -0,0 +1,170 @@
+"""
+Fractimation specific Edge Adaptive Supersampling
+
+Public Classes :
+  * EdgeSupersampler - Renders anti-aliased escape images by supersampling only edge pixels
+"""
+
+import numpy
+
+from ..data_models.complex_range import ComplexRange
+from ..helpers.escape_map_tools import compute_escape_map, find_edge_pixels
+from ..helpers.formula_tools import generate_range_axes
+
+_DEFAULT_SUPERSAMPLE_FACTOR = 4
+_DEFAULT_BATCH_SIZE = 1000000
+_NOT_ESCAPED_VALUE = 0
+
+def _interpolate_axis(axis_values, positions):
+    """
+    Returns the axis values at fractional pixel positions, extrapolating linearly half a pixel
+      beyond both ends of the axis
+
+    Parameters :
+      * axis_values - 1 dimensional array of the value at the center of each pixel
+      * positions - Array of fractional pixel positions
+    """
+    if axis_values.size < 2:
+        return numpy.full(numpy.shape(positions), axis_values[0], dtype=float)
+
+    axis_positions = numpy.arange(-1, axis_values.size + 1)
+    extended_values = numpy.concatenate([[2 * axis_values[0] - axis_values[1]], axis_values,
+                                         [2 * axis_values[-1] - axis_values[-2]]])
+    return numpy.interp(positions, axis_positions, extended_values)
+
+class EdgeSupersampler(object):
+    """
+    Renders an anti-aliased image of a Fractal Formula by first computing the escape map at native
+      resolution and then computing stratified, jittered sub-pixel samples only for pixels whose
+      escape iteration differs from a neighbor.  The escape iterations of each edge pixel's samples
+      are averaged into the final image.
+
+    Public Methods :
+      * render - Returns the anti-aliased image
+      * get_escape_map - Returns the native resolution escape map of the last render
+      * get_edge_pixels - Returns the mask of pixels which were supersampled in the last render
+    """
+
+    _fractal_iterable = None
+    _supersample_factor = None
+    _interior_value = None
+    _batch_size = None
+    _seed = None
+
+    _escape_map = None
+    _edge_pixels = None
+
+    def __init__(self, fractal_iterable, supersample_factor=_DEFAULT_SUPERSAMPLE_FACTOR,
+                 interior_value=None, batch_size=_DEFAULT_BATCH_SIZE, seed=None):
+        """
+        Constructor
+
+        Parameters :
+          * fractal_iterable - The FractalFormulaIterable to render
+          * supersample_factor (optional) - Number of samples along each axis of an edge pixel
+              (edge pixels receive supersample_factor squared samples)
+          * interior_value (optional) - Value of samples which never escaped (default is the
+              number of iterations run plus 1)
+          * batch_size (optional) - Maximum number of sub-pixel samples iterated at once
+          * seed (optional) - Seed for the sub-pixel jitter
+        """
+        self._fractal_iterable = fractal_iterable
+        self._supersample_factor = supersample_factor
+        self._interior_value = interior_value
+        self._batch_size = batch_size
+        self._seed = seed
+
+    def get_escape_map(self):
+        return self._escape_map
+
+    def get_edge_pixels(self):
+        return self._edge_pixels
+
+    def render(self, max_iterations):
+        """
+        Returns a float array of shape (width, height) containing the escape iteration of each
+          pixel averaged over its sub-pixel samples
+
+        Parameters :
+          * max_iterations - Maximum number of iterations of the fractal formula
+        """
+        fractal_iterable = self._fractal_iterable
+        dimension_params = fractal_iterable.get_dimension_params()
+        width, height = dimension_params.width, dimension_params.height
+
+        fractal_iterator = fractal_iterable.create_iterator(fractal_iterable.get_z_values_range(),
+                                                            fractal_iterable.get_c_values_range())
+        escape_map, iteration_count = compute_escape_map(fractal_iterator, width * height,
+                                                         max_iterations, _NOT_ESCAPED_VALUE)
+        raster_indexes = dimension_params.get_raster_indexes()
+        if raster_indexes is not None:
+            raster_escape_map = numpy.empty_like(escape_map)
+            raster_escape_map[raster_indexes] = escape_map
+            escape_map = raster_escape_map
+        escape_map = escape_map.reshape(width, height)
+
+        interior_value = self._interior_value
+        if interior_value is None:
+            interior_value = iteration_count + 1
+
+        image = numpy.where(escape_map == _NOT_ESCAPED_VALUE, interior_value,
+                            escape_map).astype(float)
+        edge_pixels = find_edge_pixels(escape_map)
+        self._escape_map = escape_map
+        self._edge_pixels = edge_pixels
+
+        edge_x_indexes, edge_y_indexes = numpy.nonzero(edge_pixels)
+        samples_per_pixel = self._supersample_factor ** 2
+        pixels_per_batch = max(1, self._batch_size // samples_per_pixel)
+        random_generator = numpy.random.default_rng(self._seed)
+
+        # Samples only run as many iterations as the native pass so every pixel shares one budget
+        for batch_start in range(0, edge_x_indexes.size, pixels_per_batch):
+            batch_x_indexes = edge_x_indexes[batch_start:batch_start + pixels_per_batch]
+            batch_y_indexes = edge_y_indexes[batch_start:batch_start + pixels_per_batch]
+            sample_escape_map = self._compute_sample_escape_map(batch_x_indexes, batch_y_indexes,
+                                                                iteration_count, random_generator)
+
+            sample_values = numpy.where(sample_escape_map == _NOT_ESCAPED_VALUE, interior_value,
+                                        sample_escape_map)
+            sample_values = sample_values.reshape(batch_x_indexes.size, samples_per_pixel)
+            image[batch_x_indexes, batch_y_indexes] = numpy.mean(sample_values, axis=1)
+
+        return image
+
+    def _compute_sample_escape_map(self, x_indexes, y_indexes, iteration_count,
+                                   random_generator):
+        """
+        Returns the flat escape map of the stratified, jittered sub-pixel samples of pixels
+
+        Parameters :
+          * x_indexes - The x index of each pixel to sample
+          * y_indexes - The y index of each pixel to sample
+          * iteration_count - The number of iterations to run
+          * random_generator - numpy.random.Generator providing the jitter
+        """
+        fractal_iterable = self._fractal_iterable
+        supersample_factor = self._supersample_factor
+        pixel_count = x_indexes.size
+
+        # Each pixel is split into a grid of strata which each receive one randomly placed sample
+        strata = numpy.arange(supersample_factor)
+        jitter = random_generator.random((pixel_count, supersample_factor, supersample_factor, 2))
+        x_positions = (x_indexes[:, None, None] - 0.5 +
+                       (strata[None, :, None] + jitter[..., 0]) / supersample_factor).ravel()
+        y_positions = (y_indexes[:, None, None] - 0.5 +
+                       (strata[None, None, :] + jitter[..., 1]) / supersample_factor).ravel()
+
+        dimension_params = fractal_iterable.get_dimension_params()
+        sample_ranges = []
+        for range_params in [fractal_iterable.get_z_values_range_params(),
+                             fractal_iterable.get_c_values_range_params()]:
+            real_axis, imaginary_axis = generate_range_axes(range_params, dimension_params,
+                                                            fractal_iterable.get_exploit_symmetry())
+            sample_ranges.append(ComplexRange(_interpolate_axis(real_axis, x_positions),
+                                              _interpolate_axis(imaginary_axis, y_positions)))
+
+        fractal_iterator = fractal_iterable.create_iterator(sample_ranges[0], sample_ranges[1])
+        sample_escape_map, sample_iteration_count = compute_escape_map(
+            fractal_iterator, x_positions.size, iteration_count, _NOT_ESCAPED_VALUE)
+        return sample_escape_map
@@ -0,0 +1,244 @@
+"""
+Fractimation specific Foveated Rendering
+
+Public Classes :
+  * FoveatedRenderer - Renders escape images at full resolution around a focus point & at
+      progressively coarser sample density towards the periphery, refining the rest when idle
+"""
+
+import copy
+
+import numpy
+
+from ..data_models.complex_range import ComplexRange
+from ..helpers.escape_map_tools import compute_escape_map
+from ..helpers.formula_tools import generate_range_axes
+
+_DEFAULT_MAX_LEVEL = 3
+_DEFAULT_BATCH_SIZE = 1000000
+_DEFAULT_REFINE_PIXEL_COUNT = 65536
+_NOT_ESCAPED_VALUE = 0
+
+class FoveatedRenderer(object):
+    """
+    Renders the escape image of a Fractal Formula with non-uniform sample density.  The image is
+      split into blocks of 2 ** max_level pixels; blocks within fovea_radius pixels (Chebyshev
+      distance) of the focus are sampled at every pixel, blocks within 2 * fovea_radius at every
+      2nd pixel, blocks within 4 * fovea_radius at every 4th pixel & so on up to a stride of
+      2 ** max_level.  Each coarse sample is taken at the center of the cell it represents & is
+      upsampled (nearest neighbor) into the whole cell, so a wide view costs a fraction of a full
+      render while the area being looked at stays exact.
+
+    The pixels which were only upsampled are computed later by refine, nearest to the focus first,
+      so the full image can be filled in from an idle callback (ie. a canvas timer) in small steps.
+      Samples are taken from the range axes of the iterable, so range parameters with a custom
+      spacing_func are supported.
+
+    Public Methods :
+      * render - Renders the foveated image & returns it
+      * refine - Computes up to pixel_count upsampled pixels exactly & returns whether the image
+          is complete
+      * get_image - Returns the current image
+      * get_escape_map - Returns the current escape map
+      * get_exact_pixels - Returns the mask of pixels which have been computed exactly
+      * get_sample_count - Returns the number of samples computed by the last render
+    """
+
+    _fractal_iterable = None
+    _fovea_radius = None
+    _max_level = None
+    _interior_value = None
+    _batch_size = None
+
+    _max_iterations = None
+    _focus = None
+    _range_axes = None
+    _escape_map = None
+    _exact_pixels = None
+    _refine_order = None
+    _refine_position = 0
+    _sample_count = 0
+
+    def __init__(self, fractal_iterable, fovea_radius=None, max_level=_DEFAULT_MAX_LEVEL,
+                 interior_value=None, batch_size=_DEFAULT_BATCH_SIZE):
+        """
+        Constructor
+
+        Parameters :
+          * fractal_iterable - The FractalFormulaIterable to render
+          * fovea_radius (optional) - Pixel distance from the focus rendered at full resolution
+              (default is an eighth of the smaller image dimension)
+          * max_level (optional) - The coarsest periphery samples every 2 ** max_level pixels
+          * interior_value (optional) - Value of pixels which never escaped (default is
+              max_iterations plus 1)
+          * batch_size (optional) - Maximum number of samples iterated at once
+        """
+        self._fractal_iterable = fractal_iterable
+        self._fovea_radius = fovea_radius
+        self._max_level = max_level
+        self._interior_value = interior_value
+        self._batch_size = batch_size
+
+    def get_escape_map(self):
+        return self._escape_map
+
+    def get_exact_pixels(self):
+        return self._exact_pixels
+
+    def get_sample_count(self):
+        return self._sample_count
+
+    def get_image(self):
+        """
+        Returns a float array of shape (width, height) containing the escape iteration of each
+          pixel, with interior_value for pixels which never escaped
+        """
+        interior_value = self._interior_value
+        if interior_value is None:
+            interior_value = self._max_iterations + 1
+
+        return numpy.where(self._escape_map == _NOT_ESCAPED_VALUE, interior_value,
+                           self._escape_map).astype(float)
+
+    def render(self, max_iterations, focus_x=None, focus_y=None):
+        """
+        Renders the foveated image & returns it (see get_image)
+
+        Parameters :
+          * max_iterations - Number of iterations of the fractal formula
+          * focus_x (optional) - Pixel x position of the focus (default is the image center)
+          * focus_y (optional) - Pixel y position of the focus (default is the image center)
+        """
+        dimension_params = self._fractal_iterable.get_dimension_params()
+        width, height = dimension_params.width, dimension_params.height
+        if focus_x is None:
+            focus_x = width // 2
+        if focus_y is None:
+            focus_y = height // 2
+
+        fovea_radius = self._fovea_radius
+        if fovea_radius is None:
+            fovea_radius = max(1, min(width, height) // 8)
+
+        self._max_iterations = max_iterations
+        self._focus = [focus_x, focus_y]
+        exploit_symmetry = self._fractal_iterable.get_exploit_symmetry()
+        self._range_axes = [
+            generate_range_axes(self._fractal_iterable.get_z_values_range_params(),
+                                dimension_params, exploit_symmetry),
+            generate_range_axes(self._fractal_iterable.get_c_values_range_params(),
+                                dimension_params, exploit_symmetry)]
+
+        pixel_strides = self._build_pixel_strides(width, height, focus_x, focus_y, fovea_radius)
+        x_indexes, y_indexes = numpy.mgrid[0:width, 0:height]
+
+        # Samples sit at the center of their cell; cells cut off by the image edge are centered on
+        #   the part of the cell inside the image
+        cell_x_starts = x_indexes - x_indexes % pixel_strides
+        cell_y_starts = y_indexes - y_indexes % pixel_strides
+        sample_x_indexes = (cell_x_starts + numpy.minimum(cell_x_starts + pixel_strides,
+                                                          width) - 1) // 2
+        sample_y_indexes = (cell_y_starts + numpy.minimum(cell_y_starts + pixel_strides,
+                                                          height) - 1) // 2
+
+        exact_pixels = (sample_x_indexes == x_indexes) & (sample_y_indexes == y_indexes)
+        sample_escape_values = self._compute_pixels(x_indexes[exact_pixels],
+                                                    y_indexes[exact_pixels])
+
+        escape_map = numpy.full([width, height], _NOT_ESCAPED_VALUE, dtype=int)
+        escape_map[exact_pixels] = sample_escape_values
+        escape_map = escape_map[sample_x_indexes, sample_y_indexes]
+
+        # Refinement visits the upsampled pixels nearest to the focus first
+        refine_x_indexes, refine_y_indexes = numpy.nonzero(~exact_pixels)
+        refine_distances = numpy.maximum(numpy.abs(refine_x_indexes - focus_x),
+                                         numpy.abs(refine_y_indexes - focus_y))
+        refine_order = numpy.argsort(refine_distances, kind="stable")
+
+        self._escape_map = escape_map
+        self._exact_pixels = exact_pixels
+        self._refine_order = [refine_x_indexes[refine_order], refine_y_indexes[refine_order]]
+        self._refine_position = 0
+        self._sample_count = int(sample_escape_values.size)
+
+        return self.get_image()
+
+    def refine(self, pixel_count=_DEFAULT_REFINE_PIXEL_COUNT):
+        """
+        Computes up to pixel_count of the upsampled pixels exactly (nearest to the focus first) &
+          returns True once every pixel of the image is exact
+
+        Parameters :
+          * pixel_count (optional) - Maximum number of pixels computed by this call
+        """
+        refine_x_indexes, refine_y_indexes = self._refine_order
+        refine_start = self._refine_position
+        refine_stop = min(refine_start + pixel_count, refine_x_indexes.size)
+
+        x_indexes = refine_x_indexes[refine_start:refine_stop]
+        y_indexes = refine_y_indexes[refine_start:refine_stop]
+        if x_indexes.size > 0:
+            self._escape_map[x_indexes, y_indexes] = self._compute_pixels(x_indexes, y_indexes)
+            self._exact_pixels[x_indexes, y_indexes] = True
+
+        self._refine_position = refine_stop
+        return refine_stop >= refine_x_indexes.size
+
+    def _build_pixel_strides(self, width, height, focus_x, focus_y, fovea_radius):
+        """
+        Returns an int array of shape (width, height) containing the sample stride of each pixel's
+          block
+
+        Parameters :
+          * width - Width of the image
+          * height - Height of the image
+          * focus_x - Pixel x position of the focus
+          * focus_y - Pixel y position of the focus
+          * fovea_radius - Pixel distance from the focus rendered at full resolution
+        """
+        block_size = 2 ** self._max_level
+        block_x_starts = numpy.arange(0, width, block_size)
+        block_y_starts = numpy.arange(0, height, block_size)
+
+        # Distance from the focus to the nearest pixel of each block
+        x_distances = numpy.maximum(0, numpy.maximum(block_x_starts - focus_x,
+                                                     focus_x - (block_x_starts + block_size - 1)))
+        y_distances = numpy.maximum(0, numpy.maximum(block_y_starts - focus_y,
+                                                     focus_y - (block_y_starts + block_size - 1)))
+        block_distances = numpy.maximum(x_distances[:, None], y_distances[None, :])
+
+        block_levels = numpy.ceil(numpy.log2(numpy.maximum(block_distances / fovea_radius, 1)))
+        block_strides = 2 ** numpy.minimum(block_levels, self._max_level).astype(int)
+
+        pixel_strides = numpy.repeat(numpy.repeat(block_strides, block_size, axis=0), block_size,
+                                     axis=1)
+        return pixel_strides[:width, :height]
+
+    def _compute_pixels(self, x_indexes, y_indexes):
+        """
+        Returns the escape map values of a set of pixels
+
+        Parameters :
+          * x_indexes - The x index of each pixel
+          * y_indexes - The y index of each pixel
+        """
+        # Every pass runs the same fixed number of iterations, so the adaptive budget is not used
+        fractal_iterable = copy.copy(self._fractal_iterable)
+        fractal_iterable.set_iteration_budget_params(None)
+
+        escape_values = numpy.zeros(x_indexes.size, dtype=int)
+        (z_real_axis, z_imaginary_axis), (c_real_axis, c_imaginary_axis) = self._range_axes
+        for batch_start in range(0, x_indexes.size, self._batch_size):
+            batch_x_indexes = x_indexes[batch_start:batch_start + self._batch_size]
+            batch_y_indexes = y_indexes[batch_start:batch_start + self._batch_size]
+
+            z_values_range = ComplexRange(z_real_axis[batch_x_indexes],
+                                          z_imaginary_axis[batch_y_indexes])
+            c_values_range = ComplexRange(c_real_axis[batch_x_indexes],
+                                          c_imaginary_axis[batch_y_indexes])
+            fractal_iterator = fractal_iterable.create_iterator(z_values_range, c_values_range)
+            batch_escape_map, iteration_count = compute_escape_map(
+                fractal_iterator, batch_x_indexes.size, self._max_iterations, _NOT_ESCAPED_VALUE)
+            escape_values[batch_start:batch_start + batch_x_indexes.size] = batch_escape_map
+
+        return escape_values
@@ -0,0 +1,334 @@
+"""
+Fractimation specific Delta Encoded Frame Streams
+
+Streams the frames of a CachedImageRenderer to remote viewers over plain TCP.  The first frame is
+  sent once as a key frame; every later frame is sent as the flat indexes (x * height + y) of the
+  pixels which escaped on that frame, since no other pixel of an escape time frame changes.
+
+Every message is a 9 byte big endian header (message type as 1 ASCII byte, frame number as uint32,
+  payload length as uint32) followed by the payload :
+  * "H" - Stream header; payload is width, height (uint32), initial_value (int32) & recolor_image
+      (uint8), all big endian
+  * "K" - Key frame; payload is the zlib compressed little endian int32 escape map of shape
+      (width, height) in C order
+  * "D" - Delta frame; payload is zlib compressed little endian int32 values [run_count,
+      run_start_deltas..., run_lengths...] where runs are ranges of consecutive escaped indexes &
+      each run start is stored relative to the end of the previous run
+  * "E" - End of the stream
+
+Public Methods :
+  * encode_escaped_indexes - Returns the payload of a delta frame
+  * decode_escaped_indexes - Returns the escaped indexes of a delta frame payload
+  * receive_frame_stream - Connects to a FrameStreamServer & yields decoded frames
+
+Public Classes :
+  * FrameStreamEncoder - Encodes the frames of a renderer into stream messages
+  * FrameStreamDecoder - Rebuilds frame images from stream messages
+  * FrameStreamServer - Serves the frame stream of a renderer to TCP clients
+"""
+
+import socket
+import socketserver
+import struct
+import threading
+import zlib
+
+import numpy
+
+from ..helpers.escape_map_tools import build_escape_frame
+
+_DEFAULT_HOST = "127.0.0.1"
+_MESSAGE_HEADER = struct.Struct("!cII")
+_STREAM_HEADER = struct.Struct("!IIiB")
+_WIRE_DTYPE = numpy.dtype("<i4")
+_COMPRESSION_LEVEL = 6
+
+_HEADER_MESSAGE = b"H"
+_KEY_FRAME_MESSAGE = b"K"
+_DELTA_FRAME_MESSAGE = b"D"
+_END_MESSAGE = b"E"
+
+def _build_message(message_type, frame_num, payload):
+    return _MESSAGE_HEADER.pack(message_type, frame_num, len(payload)) + payload
+
+def _read_exactly(stream, byte_count):
+    data = stream.read(byte_count)
+    if len(data) < byte_count:
+        raise EOFError("Frame stream ended in the middle of a message")
+
+    return data
+
+def encode_escaped_indexes(escaped_indexes):
+    """
+    Returns the zlib compressed run-length encoding of a set of flat pixel indexes
+
+    Parameters :
+      * escaped_indexes - Array of flat indexes of the pixels which escaped
+    """
+    escaped_indexes = numpy.unique(numpy.asarray(escaped_indexes, dtype=numpy.int64))
+    if escaped_indexes.size < 1:
+        run_values = numpy.zeros(1, dtype=_WIRE_DTYPE)
+        return zlib.compress(run_values.tobytes(), _COMPRESSION_LEVEL)
+
+    # Runs of consecutive indexes start wherever the gap to the previous index is not 1
+    run_starts = numpy.flatnonzero(numpy.diff(escaped_indexes) != 1) + 1
+    run_starts = numpy.concatenate([[0], run_starts])
+    run_lengths = numpy.diff(numpy.concatenate([run_starts, [escaped_indexes.size]]))
+    start_indexes = escaped_indexes[run_starts]
+
+    previous_run_ends = numpy.concatenate([[0], start_indexes[:-1] + run_lengths[:-1]])
+    run_values = numpy.concatenate([[run_starts.size], start_indexes - previous_run_ends,
+                                    run_lengths]).astype(_WIRE_DTYPE)
+    return zlib.compress(run_values.tobytes(), _COMPRESSION_LEVEL)
+
+def decode_escaped_indexes(payload):
+    """
+    Returns the flat pixel indexes encoded by encode_escaped_indexes
+
+    Parameters :
+      * payload - The compressed payload of a delta frame
+    """
+    run_values = numpy.frombuffer(zlib.decompress(payload), dtype=_WIRE_DTYPE).astype(numpy.int64)
+    run_count = int(run_values[0])
+    start_deltas = run_values[1:run_count + 1]
+    run_lengths = run_values[run_count + 1:2 * run_count + 1]
+    if run_count < 1:
+        return numpy.zeros(0, dtype=numpy.int64)
+
+    previous_run_ends = numpy.concatenate([[0], numpy.cumsum(start_deltas + run_lengths)[:-1]])
+    start_indexes = previous_run_ends + start_deltas
+
+    # Each index is its run's start plus its offset within the run
+    run_offsets = numpy.arange(numpy.sum(run_lengths)) - numpy.repeat(
+        numpy.cumsum(run_lengths) - run_lengths, run_lengths)
+    return numpy.repeat(start_indexes, run_lengths) + run_offsets
+
+class FrameStreamEncoder(object):
+    """
+    Encodes the frames of a CachedImageRenderer into frame stream messages, rendering frames which
+      are not cached yet
+
+    Public Methods :
+      * encode_header - Returns the stream header message
+      * encode_frame - Returns the message of a frame
+      * encode_end - Returns the end of stream message
+    """
+
+    _renderer = None
+
+    def __init__(self, renderer):
+        """
+        Constructor
+
+        Parameters :
+          * renderer - The CachedImageRenderer whose frames are encoded
+        """
+        self._renderer = renderer
+
+    def encode_header(self):
+        escape_map = self._get_escape_map(0)
+        image_params = self._renderer.get_image_params()
+        width, height = escape_map.shape
+        payload = _STREAM_HEADER.pack(width, height, int(image_params.initial_value),
+                                      int(bool(image_params.recolor_image)))
+        return _build_message(_HEADER_MESSAGE, 0, payload)
+
+    def encode_frame(self, frame_num):
+        """
+        Returns the key frame message of frame 0 or the delta frame message of a later frame
+
+        Parameters :
+          * frame_num - The frame to encode
+        """
+        escape_map = self._get_escape_map(frame_num)
+        if frame_num == 0:
+            key_frame = build_escape_frame(escape_map, 0,
+                                           self._renderer.get_image_params().initial_value)
+            payload = zlib.compress(numpy.ascontiguousarray(key_frame, dtype=_WIRE_DTYPE).tobytes(),
+                                    _COMPRESSION_LEVEL)
+            return _build_message(_KEY_FRAME_MESSAGE, 0, payload)
+
+        escaped_indexes = numpy.flatnonzero(escape_map == frame_num)
+        return _build_message(_DELTA_FRAME_MESSAGE, frame_num,
+                              encode_escaped_indexes(escaped_indexes))
+
+    def encode_end(self):
+        return _build_message(_END_MESSAGE, 0, b"")
+
+    def _get_escape_map(self, frame_num):
+        renderer = self._renderer
+        renderer.get_frame_image(frame_num)
+
+        escape_map = renderer.get_escape_map()
+        if escape_map is None:
+            raise ValueError("Frame streams require escape time frames")
+
+        return escape_map
+
+class FrameStreamDecoder(object):
+    """
+    Rebuilds frame images from frame stream messages; frames must arrive in order but any frame
+      which has been received can be rebuilt again (ie. when the viewer seeks backwards)
+
+    Public Methods :
+      * decode - Applies a message & returns [frame_num, frame_image] for frame messages
+      * build_frame - Returns the image of a received frame
+      * get_frame_count - Returns the number of frames received
+    """
+
+    _width = None
+    _height = None
+    _initial_value = None
+    _recolor_image = None
+    _escape_map = None
+    _frame_count = 0
+
+    def get_frame_count(self):
+        return self._frame_count
+
+    def decode(self, message_type, frame_num, payload):
+        """
+        Applies a message to the decoder state; returns [frame_num, frame_image] for key & delta
+          frames (images are (height, width) as displayed by CachedImageRenderer) and None for
+          other messages
+
+        Parameters :
+          * message_type - The 1 byte message type
+          * frame_num - The frame number of the message
+          * payload - The payload of the message
+        """
+        if message_type == _HEADER_MESSAGE:
+            width, height, initial_value, recolor_image = _STREAM_HEADER.unpack(payload)
+            self._width, self._height = width, height
+            self._initial_value = initial_value
+            self._recolor_image = bool(recolor_image)
+            return None
+
+        if message_type == _KEY_FRAME_MESSAGE:
+            key_frame = numpy.frombuffer(zlib.decompress(payload), dtype=_WIRE_DTYPE)
+            self._escape_map = key_frame.astype(int).reshape(self._width, self._height)
+        elif message_type == _DELTA_FRAME_MESSAGE:
+            if frame_num != self._frame_count:
+                raise ValueError("Expected frame {} but received frame {}".format(
+                    self._frame_count, frame_num))
+            self._escape_map.flat[decode_escaped_indexes(payload)] = frame_num
+        else:
+            return None
+
+        self._frame_count = frame_num + 1
+        return [frame_num, self.build_frame(frame_num)]
+
+    def build_frame(self, frame_num):
+        """
+        Returns the image of shape (height, width) of a frame which has been received
+
+        Parameters :
+          * frame_num - The frame to build
+        """
+        return build_escape_frame(self._escape_map, frame_num, self._initial_value,
+                                  self._recolor_image).T
+
+class FrameStreamServer(object):
+    """
+    Serves the frame stream of a CachedImageRenderer over TCP; every client receives the header,
+      the key frame & a delta for each frame up to frame_count, after which the connection is
+      closed.  Frames are rendered on demand (under the renderer's render lock) as clients request
+      them, so streaming can start before the render cache is preheated.
+
+    Public Methods :
+      * start - Starts accepting clients
+      * get_address - Returns the (host, port) clients connect to
+      * get_sent_byte_count - Returns the number of bytes sent to every client so far
+      * stop - Stops accepting clients
+    """
+
+    _encoder = None
+    _frame_count = None
+    _sent_byte_count = 0
+
+    _lock = None
+    _server = None
+    _server_thread = None
+
+    def __init__(self, renderer, frame_count, host=_DEFAULT_HOST, port=0):
+        """
+        Constructor
+
+        Parameters :
+          * renderer - The CachedImageRenderer whose frames are streamed
+          * frame_count - Number of frames streamed to each client
+          * host (optional) - Interface to listen on (use "0.0.0.0" for viewers on other machines)
+          * port (optional) - Port to listen on (default picks a free port)
+        """
+        self._encoder = FrameStreamEncoder(renderer)
+        self._frame_count = frame_count
+        self._lock = threading.Lock()
+        self._server = _FrameStreamTCPServer((host, port), _FrameStreamRequestHandler)
+        self._server.frame_stream_server = self
+
+    def start(self):
+        self._server_thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._server_thread.start()
+
+    def get_address(self):
+        return self._server.server_address[:2]
+
+    def get_sent_byte_count(self):
+        return self._sent_byte_count
+
+    def stop(self):
+        if self._server_thread is not None:
+            self._server.shutdown()
+            self._server_thread = None
+        self._server.server_close()
+
+    def _send(self, stream, message):
+        stream.write(message)
+        with self._lock:
+            self._sent_byte_count += len(message)
+
+    def _stream_frames(self, stream):
+        encoder = self._encoder
+        self._send(stream, encoder.encode_header())
+        for frame_num in range(0, self._frame_count):
+            self._send(stream, encoder.encode_frame(frame_num))
+            stream.flush()
+
+        self._send(stream, encoder.encode_end())
+        stream.flush()
+
+class _FrameStreamTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    frame_stream_server = None
+
+class _FrameStreamRequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        try:
+            self.server.frame_stream_server._stream_frames(self.wfile)
+        except OSError:
+            # Viewers may disconnect at any time
+            pass
+
+def receive_frame_stream(host, port):
+    """
+    Connects to a FrameStreamServer & yields [frame_num, frame_image] for every frame received
+
+    Parameters :
+      * host - Host name of the server
+      * port - Port of the server
+    """
+    decoder = FrameStreamDecoder()
+    with socket.create_connection((host, port)) as stream_socket:
+        stream = stream_socket.makefile("rb")
+        while True:
+            message_type, frame_num, payload_length = _MESSAGE_HEADER.unpack(
+                _read_exactly(stream, _MESSAGE_HEADER.size))
+            if message_type == _END_MESSAGE:
+                return
+
+            decoded_frame = decoder.decode(message_type, frame_num,
+                                           _read_exactly(stream, payload_length))
+            if decoded_frame is not None:
+                yield decoded_frame
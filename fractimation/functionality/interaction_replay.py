@@ -0,0 +1,323 @@
+"""
+Fractimation specific Interaction Recording & Replay
+
+Records interaction sessions (zooms, zoom undos, seeks & playback) and replays them headlessly
+  against a ZoomableComplexRange & cached renderer to measure the latency users feel :
+  * time to first frame - Seconds from the action until its first updated frame is drawn
+  * time to complete - Seconds from the action until every frame it requires is drawn
+
+Zooms & zoom undos are recorded by a ZoomHandler given the recorder.  Seeks & playback are inferred
+  from the frames the viewer draws, so the render function passed to PlotPlayer.initialize is
+  wrapped with InteractionRecorder.wrap_render_func : consecutive frames are recorded as playback &
+  any other jump as a seek, while the frames played after a zoom are accounted to the zoom.
+
+Sessions are stored as JSON : {"version": 1, "actions": [{"type": ..., "time": ..., ...}]}
+
+Public Methods :
+  * load_interaction_session - Returns the actions of a recorded session file
+  * format_latency_report - Returns a printable table of replay latencies
+
+Public Classes :
+  * InteractionRecorder - Records the actions of an interaction session
+  * InteractionReplayer - Replays interaction sessions & measures their latency
+"""
+
+import json
+import time
+
+import numpy
+
+_SESSION_VERSION = 1
+_PERCENTILES = [50, 95, 99]
+_WAIT_SECONDS = 0.001
+
+ZOOM_IN_ACTION = "zoom_in"
+ZOOM_OUT_ACTION = "zoom_out"
+SEEK_ACTION = "seek"
+PLAYBACK_ACTION = "playback"
+
+def load_interaction_session(session_path):
+    """
+    Returns the list of actions of a session saved by InteractionRecorder.save
+
+    Parameters :
+      * session_path - Path of the session file
+    """
+    with open(session_path, "r") as session_file:
+        session = json.load(session_file)
+
+    if session.get("version") != _SESSION_VERSION:
+        raise ValueError("Unsupported interaction session version {}".format(
+            session.get("version")))
+
+    return session["actions"]
+
+def format_latency_report(latency_report):
+    """
+    Returns a printable table of the report returned by InteractionReplayer.replay
+
+    Parameters :
+      * latency_report - Dictionary of action type to latency statistics
+    """
+    percentile_names = ["p{}".format(percentile) for percentile in _PERCENTILES]
+    header_line = "{:<10} {:>5}  {:<16} {}".format(
+        "action", "count", "metric", " ".join("{:>9}".format(name) for name in percentile_names))
+
+    report_lines = [header_line]
+    for action_type, action_latency in sorted(latency_report.items()):
+        for metric_name in ["time_to_first_frame", "time_to_complete"]:
+            metric_values = action_latency[metric_name]
+            report_lines.append("{:<10} {:>5}  {:<16} {}".format(
+                action_type, action_latency["count"], metric_name.replace("time_to_", ""),
+                " ".join("{:>7.1f}ms".format(metric_values[name] * 1000)
+                         for name in percentile_names)))
+
+    return "\n".join(report_lines)
+
+class InteractionRecorder(object):
+    """
+    Records the actions of an interaction session along with the seconds since recording started
+
+    Public Methods :
+      * record_zoom_in - Records a zoom to a pixel rectangle of the view
+      * record_zoom_out - Records an undo of the current zoom
+      * record_seek - Records a jump to a frame
+      * record_playback - Records playback of a range of frames
+      * record_displayed_frame - Records a frame drawn by the viewer as a seek or playback
+      * wrap_render_func - Returns a render function recording every frame it draws
+      * get_actions - Returns the recorded actions
+      * save - Writes the session to a JSON file
+    """
+
+    _actions = None
+    _start_time = None
+
+    _displayed_frame = None
+    _playback_run = None
+    _zoom_playback = False
+
+    def __init__(self):
+        self._actions = list()
+        self._start_time = time.perf_counter()
+
+    def get_actions(self):
+        """
+        Returns the list of recorded actions; playback in progress is recorded up to the last
+          displayed frame
+        """
+        self._end_playback_run()
+        return self._actions
+
+    def record_zoom_in(self, top_left_x, top_left_y, bottom_right_x, bottom_right_y):
+        self._start_zoom_playback()
+        self._record(ZOOM_IN_ACTION, {"box": [int(top_left_x), int(top_left_y),
+                                              int(bottom_right_x), int(bottom_right_y)]})
+
+    def record_zoom_out(self):
+        self._start_zoom_playback()
+        self._record(ZOOM_OUT_ACTION, dict())
+
+    def record_seek(self, frame_num):
+        self._record(SEEK_ACTION, {"frame_num": int(frame_num)})
+
+    def record_playback(self, start_frame, frame_count):
+        self._record(PLAYBACK_ACTION, {"start_frame": int(start_frame),
+                                       "frame_count": int(frame_count)})
+
+    def record_displayed_frame(self, frame_num):
+        """
+        Records a frame drawn by the viewer; runs of consecutive frames are recorded as playback &
+          any other jump as a seek, except the frames played after a zoom until playback jumps
+          (the replayed zoom plays them itself).  Redraws of the displayed frame are ignored.
+
+        Parameters :
+          * frame_num - The frame drawn
+        """
+        frame_num = int(frame_num)
+        displayed_frame = self._displayed_frame
+        self._displayed_frame = frame_num
+        if frame_num == displayed_frame:
+            return
+
+        if displayed_frame is not None and frame_num == displayed_frame + 1:
+            if self._zoom_playback:
+                return
+            if self._playback_run is None:
+                self._playback_run = [frame_num, 0, time.perf_counter()]
+            self._playback_run[1] += 1
+            return
+
+        # The first frame drawn (after recording starts or after a zoom) is not a seek
+        self._end_playback_run()
+        if displayed_frame is not None:
+            self.record_seek(frame_num)
+            self._zoom_playback = False
+
+    def wrap_render_func(self, render_func):
+        """
+        Returns a render function calling render_func after recording each frame it draws with
+          record_displayed_frame (ie. pass the result to PlotPlayer.initialize)
+
+        Parameters :
+          * render_func - Function accepting 2 parameters (frame_num, canvas) which draws a frame
+              (ie. the render_to_canvas method of a renderer)
+        """
+        def render_recorded_frame(frame_num, canvas):
+            self.record_displayed_frame(frame_num)
+            return render_func(frame_num, canvas)
+
+        return render_recorded_frame
+
+    def save(self, session_path):
+        """
+        Writes the recorded actions to a JSON file
+
+        Parameters :
+          * session_path - Path of the session file
+        """
+        with open(session_path, "w") as session_file:
+            json.dump({"version": _SESSION_VERSION, "actions": self.get_actions()},
+                      session_file, indent=1)
+
+    def _start_zoom_playback(self):
+        # Zooms restart playback from the first frame, which is not a seek
+        self._end_playback_run()
+        self._displayed_frame = None
+        self._zoom_playback = True
+
+    def _end_playback_run(self):
+        playback_run = self._playback_run
+        if playback_run is None:
+            return
+
+        self._playback_run = None
+        start_frame, frame_count, start_time = playback_run
+        self._record(PLAYBACK_ACTION, {"start_frame": start_frame, "frame_count": frame_count},
+                     start_time)
+
+    def _record(self, action_type, action_params, action_time=None):
+        if action_time is None:
+            action_time = time.perf_counter()
+
+        action = {"type": action_type, "time": action_time - self._start_time}
+        action.update(action_params)
+        self._actions.append(action)
+
+class InteractionReplayer(object):
+    """
+    Replays interaction sessions as fast as possible against a ZoomableComplexRange & its cached
+      renderer, drawing every displayed frame on the renderer's figure canvas (ie. with the Agg
+      backend) so the measured latency includes drawing.  Zooms restart playback from frame 0 and
+      complete once frame_count frames are drawn, matching ZoomHandler.
+
+    Public Methods :
+      * replay - Replays a list of actions & returns latency statistics per action type
+      * get_samples - Returns the raw latency samples of the last replay
+    """
+
+    _zoomable_backend = None
+    _renderer = None
+    _frame_count = None
+    _samples = None
+
+    def __init__(self, zoomable_backend, renderer, frame_count):
+        """
+        Constructor
+
+        Parameters :
+          * zoomable_backend - The ZoomableComplexRange of the renderer
+          * renderer - The CachedImageRenderer being measured
+          * frame_count - Number of frames played after each zoom
+        """
+        self._zoomable_backend = zoomable_backend
+        self._renderer = renderer
+        self._frame_count = frame_count
+
+    def get_samples(self):
+        return self._samples
+
+    def replay(self, actions, repeat_count=1):
+        """
+        Replays actions repeat_count times & returns a dictionary of action type to
+          {"count", "time_to_first_frame", "time_to_complete"} where each time is a dictionary
+          of percentile name (ie. "p95") to seconds
+
+        Parameters :
+          * actions - List of actions (ie. returned by load_interaction_session)
+          * repeat_count (optional) - Number of times the whole session is replayed
+        """
+        samples = dict()
+        for repeat_counter in range(0, repeat_count):
+            for action in actions:
+                action_samples = samples.setdefault(action["type"], [[], []])
+                first_frame_time, complete_time = self._replay_action(action)
+                action_samples[0].append(first_frame_time)
+                action_samples[1].append(complete_time)
+
+        self._samples = samples
+
+        latency_report = dict()
+        for action_type, action_samples in samples.items():
+            latency_report[action_type] = {
+                "count": len(action_samples[0]),
+                "time_to_first_frame": self._summarize(action_samples[0]),
+                "time_to_complete": self._summarize(action_samples[1]),
+            }
+
+        return latency_report
+
+    def _summarize(self, latency_samples):
+        return {"p{}".format(percentile): float(numpy.percentile(latency_samples, percentile))
+                for percentile in _PERCENTILES}
+
+    def _replay_action(self, action):
+        """
+        Performs an action & returns [time_to_first_frame, time_to_complete] in seconds
+
+        Parameters :
+          * action - The action to perform
+        """
+        action_type = action["type"]
+        start_time = time.perf_counter()
+
+        if action_type == ZOOM_IN_ACTION:
+            self._zoomable_backend.zoom_in(*action["box"])
+            frame_nums = range(0, self._frame_count)
+        elif action_type == ZOOM_OUT_ACTION:
+            self._zoomable_backend.zoom_out()
+            frame_nums = range(0, self._frame_count)
+        elif action_type == SEEK_ACTION:
+            frame_nums = [action["frame_num"]]
+        elif action_type == PLAYBACK_ACTION:
+            frame_nums = range(action["start_frame"],
+                               action["start_frame"] + action["frame_count"])
+        else:
+            raise ValueError("Unknown interaction action type {}".format(action_type))
+
+        first_frame_time = None
+        for frame_num in frame_nums:
+            self._draw_frame(frame_num)
+            if first_frame_time is None:
+                first_frame_time = time.perf_counter() - start_time
+
+        complete_time = time.perf_counter() - start_time
+        if first_frame_time is None:
+            first_frame_time = complete_time
+
+        return [first_frame_time, complete_time]
+
+    def _draw_frame(self, frame_num):
+        renderer = self._renderer
+        renderer.render_to_canvas(frame_num, None)
+
+        # Renderers with a background frame producer show the nearest cached frame, so the frame
+        #   only counts as drawn once it has been produced
+        if renderer.get_frame_producer() is not None:
+            while (renderer.get_cached_frame_count() <= frame_num and
+                   not renderer.get_iterations_complete()):
+                time.sleep(_WAIT_SECONDS)
+            renderer.render_to_canvas(frame_num, None)
+
+        render_axes = renderer.get_render_axes()
+        if render_axes is not None:
+            render_axes.figure.canvas.draw()
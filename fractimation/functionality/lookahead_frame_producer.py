@@ -0,0 +1,149 @@
+"""
+Fractimation specific Lookahead Frame Producer
+
+Public Classes :
+  * LookaheadFrameProducer - Fills a renderer's cache ahead of the playback head on a background
+      thread
+"""
+
+import threading
+
+_DEFAULT_LOOKAHEAD_FRAMES = 30
+_JOIN_SECONDS = 5.0
+
+class LookaheadFrameProducer(object):
+    """
+    Renders frames of a CachedImageRenderer on a background thread up to lookahead_frames ahead of
+      the frame being played, so playback can start before the render cache is preheated.  While
+      the producer is running, the renderer displays the nearest cached frame instead of rendering
+      missing frames on the UI thread.  The producer pauses once the lookahead window is cached &
+      restarts from the new playback head whenever a frame is requested (ie. after seeking).
+
+    Frames are produced in order since every iteration depends on the previous one, so seeking
+      forward renders every frame up to the new playback head.  Renderers whose frames are
+      Matplotlib artists (ie. CachedCollectionRenderer) must not be used, since artists may only
+      be created on the UI thread.  A BlittedImageRenderer without a color_range recolorizes its
+      frames whenever newly cached frames widen the value range, so giving it a color_range keeps
+      colors stable from the first frame.
+
+    Public Methods :
+      * start - Attaches the producer to the renderer & starts the background thread
+      * stop - Detaches the producer & waits for the background thread to finish
+      * request_frame - Moves the playback head & wakes the producer
+      * get_playback_frame - Returns the frame at the playback head
+      * is_running - Returns whether the background thread is running
+    """
+
+    _renderer = None
+    _lookahead_frames = None
+    _frame_count = None
+
+    _condition = None
+    _thread = None
+    _stopped = False
+    _playback_frame = None
+    _next_frame_num = None
+
+    def __init__(self, renderer, lookahead_frames=_DEFAULT_LOOKAHEAD_FRAMES, frame_count=None):
+        """
+        Constructor
+
+        Parameters :
+          * renderer - The CachedImageRenderer whose cache is filled
+          * lookahead_frames (optional) - Number of frames cached ahead of the playback head
+          * frame_count (optional) - Number of frames of the animation (frames past the end are
+              never produced)
+        """
+        self._renderer = renderer
+        self._lookahead_frames = lookahead_frames
+        self._frame_count = frame_count
+
+        self._condition = threading.Condition()
+        self._playback_frame = 0
+        self._next_frame_num = 0
+
+    def get_playback_frame(self):
+        return self._playback_frame
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._condition:
+            self._stopped = False
+
+        self._renderer.set_frame_producer(self)
+        self._thread = threading.Thread(target=self._produce_frames, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._renderer.get_frame_producer() is self:
+            self._renderer.set_frame_producer(None)
+
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join(_JOIN_SECONDS)
+            self._thread = None
+
+    def request_frame(self, frame_num):
+        """
+        Moves the playback head; frames from the playback head onwards are produced next
+
+        Parameters :
+          * frame_num - The frame being played
+        """
+        with self._condition:
+            if frame_num < self._next_frame_num and frame_num != self._playback_frame:
+                # Cached frames in the new window may still need to be rebuilt (ie. frames of a
+                #   loaded escape map), so the window is checked again from the playback head
+                self._next_frame_num = frame_num
+
+            self._playback_frame = frame_num
+            self._condition.notify_all()
+
+    def _get_next_frame_num(self):
+        last_frame_num = self._playback_frame + self._lookahead_frames
+        if self._frame_count is not None:
+            last_frame_num = min(last_frame_num, self._frame_count - 1)
+
+        # Re-initialized renderers (ie. after zooming) restart from their first missing frame
+        renderer = self._renderer
+        next_frame_num = min(self._next_frame_num, renderer.get_cached_frame_count())
+        self._next_frame_num = next_frame_num
+        if next_frame_num > last_frame_num:
+            return None
+
+        if (next_frame_num >= renderer.get_cached_frame_count() and
+                renderer.get_iterations_complete()):
+            return None
+
+        return next_frame_num
+
+    def _produce_frames(self):
+        renderer = self._renderer
+        try:
+            while True:
+                with self._condition:
+                    next_frame_num = self._get_next_frame_num()
+                    while not self._stopped and next_frame_num is None:
+                        self._condition.wait()
+                        next_frame_num = self._get_next_frame_num()
+
+                    if self._stopped:
+                        return
+
+                with renderer.get_render_lock():
+                    renderer.get_frame_image(next_frame_num)
+
+                with self._condition:
+                    # Requests made while rendering may have moved the window back
+                    if self._next_frame_num == next_frame_num:
+                        self._next_frame_num = next_frame_num + 1
+        except BaseException:
+            # Playback falls back to rendering on the UI thread, which reports the failure
+            if renderer.get_frame_producer() is self:
+                renderer.set_frame_producer(None)
+            raise
@@ -0,0 +1,226 @@
+"""
+Fractimation specific Out-of-Core Rendering
+
+Renders escape maps larger than memory (ie. 64k x 64k prints) one band of rows at a time.  Each band
+  is written into a memory mapped .npy file & reduced into the levels of an image pyramid in the
+  same pass, so only the working set of a single band is ever held in memory.  Every file is stored
+  in display orientation (height, width) with contiguous rows, so viewers can open any level with
+  numpy.load(path, mmap_mode="r") and read tiles without loading the whole image.
+
+Public Classes :
+  * OutOfCoreRenderer - Streams the escape map of a fractal & its image pyramid into .npy files
+"""
+
+import copy
+import os
+
+import numpy
+
+from ..helpers.escape_map_tools import compute_escape_map
+from ..helpers.formula_tools import generate_complex_range_tile
+
+_DEFAULT_BATCH_SIZE = 1000000
+_DEFAULT_MIN_LEVEL_SIZE = 256
+_ESCAPE_MAP_DTYPE = numpy.int32
+_LEVEL_DTYPE = numpy.float32
+_NOT_ESCAPED_VALUE = 0
+
+def _reduce_level(level_rows):
+    """
+    Returns the rows of the next pyramid level by averaging blocks of 2 x 2 pixels; an odd last
+      row or column is paired with itself
+
+    Parameters :
+      * level_rows - 2 dimensional array of rows of a pyramid level
+    """
+    row_count, column_count = level_rows.shape
+    if row_count % 2 == 1:
+        level_rows = numpy.concatenate([level_rows, level_rows[-1:, :]], axis=0)
+    if column_count % 2 == 1:
+        level_rows = numpy.concatenate([level_rows, level_rows[:, -1:]], axis=1)
+
+    level_rows = level_rows.astype(_LEVEL_DTYPE)
+    return (level_rows[0::2, 0::2] + level_rows[1::2, 0::2] +
+            level_rows[0::2, 1::2] + level_rows[1::2, 1::2]) / 4
+
+class OutOfCoreRenderer(object):
+    """
+    Renders the escape map of a Fractal Formula in bands of rows into a memory mapped .npy file &
+      builds an image pyramid from the same bands.  Level 0 holds the escape iteration of each
+      pixel; every further level halves the previous one until neither side exceeds
+      min_level_size.
+
+    The fractal iterable should be created with DimensionParams(width, height,
+      allocate_indexes=False) so neither the index grids nor the complex ranges are allocated at
+      full resolution.
+
+    Public Methods :
+      * render - Renders every band & returns the paths of the pyramid levels
+      * get_level_paths - Returns the path of each pyramid level
+      * get_level_count - Returns the number of pyramid levels
+      * get_band_height - Returns the number of rows rendered at once
+      * get_completed_row_count - Returns the number of rows written so far
+      * load_level - Returns a read-only memory map of a pyramid level
+    """
+
+    _fractal_iterable = None
+    _output_path = None
+    _max_iterations = None
+    _interior_value = None
+    _batch_size = None
+    _min_level_size = None
+
+    _level_count = None
+    _band_height = None
+    _completed_row_count = None
+
+    def __init__(self, fractal_iterable, output_path, max_iterations, interior_value=None,
+                 band_height=None, batch_size=_DEFAULT_BATCH_SIZE,
+                 min_level_size=_DEFAULT_MIN_LEVEL_SIZE):
+        """
+        Constructor
+
+        Parameters :
+          * fractal_iterable - The FractalFormulaIterable to render
+          * output_path - Path of the level 0 .npy file; further levels are written next to it as
+              <name>.level<N>.npy
+          * max_iterations - Number of iterations each band runs
+          * interior_value (optional) - Value of pixels which never escaped (default is
+              max_iterations + 1)
+          * band_height (optional) - Number of rows rendered at once (default fits batch_size
+              pixels into a band)
+          * batch_size (optional) - Approximate number of pixels iterated at once
+          * min_level_size (optional) - Size below which no further pyramid levels are built
+        """
+        if interior_value is None:
+            interior_value = max_iterations + 1
+
+        self._fractal_iterable = fractal_iterable
+        self._output_path = output_path
+        self._max_iterations = max_iterations
+        self._interior_value = interior_value
+        self._batch_size = batch_size
+        self._min_level_size = min_level_size
+
+        dimension_params = fractal_iterable.get_dimension_params()
+        width, height = dimension_params.width, dimension_params.height
+
+        level_count = 1
+        while max(width, height) > min_level_size:
+            width, height = (width + 1) // 2, (height + 1) // 2
+            level_count += 1
+        self._level_count = level_count
+
+        if band_height is None:
+            band_height = max(1, batch_size // dimension_params.width)
+
+        self._band_height = band_height
+        self._completed_row_count = 0
+
+    def get_level_count(self):
+        return self._level_count
+
+    def get_band_height(self):
+        return self._band_height
+
+    def get_completed_row_count(self):
+        return self._completed_row_count
+
+    def get_level_paths(self):
+        output_root, output_extension = os.path.splitext(self._output_path)
+        level_paths = [self._output_path]
+        for level_num in range(1, self._level_count):
+            level_paths.append("{}.level{}{}".format(output_root, level_num, output_extension))
+
+        return level_paths
+
+    def load_level(self, level_num):
+        """
+        Returns a read-only memory map of shape (height, width) of a rendered pyramid level
+
+        Parameters :
+          * level_num - The level to open (0 is full resolution)
+        """
+        return numpy.load(self.get_level_paths()[level_num], mmap_mode="r")
+
+    def render(self):
+        """
+        Renders every band into the pyramid level files and returns their paths
+        """
+        dimension_params = self._fractal_iterable.get_dimension_params()
+        width, height = dimension_params.width, dimension_params.height
+
+        # Every band runs max_iterations so an adaptive budget must not stop bands early
+        band_iterable = copy.copy(self._fractal_iterable)
+        band_iterable.set_iteration_budget_params(None)
+
+        level_files = []
+        level_width, level_height = width, height
+        for level_num, level_path in enumerate(self.get_level_paths()):
+            level_dtype = _ESCAPE_MAP_DTYPE if level_num == 0 else _LEVEL_DTYPE
+            level_files.append(numpy.lib.format.open_memmap(
+                level_path, mode="w+", dtype=level_dtype, shape=(level_height, level_width)))
+            level_width, level_height = (level_width + 1) // 2, (level_height + 1) // 2
+
+        # Rows of the previous level waiting for the other row of their pair, so bands of any
+        #   height only carry a single row per level into the next band
+        pending_rows = [None] * len(level_files)
+        level_row_starts = [0] * len(level_files)
+
+        self._completed_row_count = 0
+        for row_start in range(0, height, self._band_height):
+            row_stop = min(row_start + self._band_height, height)
+            level_rows = self._render_band(band_iterable, row_start, row_stop)
+
+            for level_num, level_file in enumerate(level_files):
+                if level_num > 0:
+                    if pending_rows[level_num] is not None:
+                        level_rows = numpy.concatenate([pending_rows[level_num], level_rows])
+
+                    # The last row of the image is paired with itself by _reduce_level
+                    paired_row_count = level_rows.shape[0]
+                    if row_stop < height:
+                        paired_row_count -= paired_row_count % 2
+                    pending_rows[level_num] = level_rows[paired_row_count:]
+                    level_rows = _reduce_level(level_rows[:paired_row_count])
+
+                level_row_start = level_row_starts[level_num]
+                level_file[level_row_start:level_row_start + level_rows.shape[0], :] = level_rows
+                level_row_starts[level_num] += level_rows.shape[0]
+
+            self._completed_row_count = row_stop
+
+        for level_file in level_files:
+            level_file.flush()
+
+        return self.get_level_paths()
+
+    def _render_band(self, band_iterable, row_start, row_stop):
+        """
+        Returns an array of shape (row_stop - row_start, width) containing the escape iteration of
+          each pixel of a band of rows
+
+        Parameters :
+          * band_iterable - The FractalFormulaIterable creating the band iterator
+          * row_start - Index of the first row of the band
+          * row_stop - Index after the last row of the band
+        """
+        dimension_params = band_iterable.get_dimension_params()
+        width = dimension_params.width
+
+        exploit_symmetry = band_iterable.get_exploit_symmetry()
+        z_values_range = generate_complex_range_tile(band_iterable.get_z_values_range_params(),
+                                                     dimension_params, 0, width, row_start,
+                                                     row_stop, exploit_symmetry)
+        c_values_range = generate_complex_range_tile(band_iterable.get_c_values_range_params(),
+                                                     dimension_params, 0, width, row_start,
+                                                     row_stop, exploit_symmetry)
+
+        fractal_iterator = band_iterable.create_iterator(z_values_range, c_values_range)
+        band_shape = [width, row_stop - row_start]
+        escape_band, iteration_count = compute_escape_map(fractal_iterator,
+                                                          band_shape[0] * band_shape[1],
+                                                          self._max_iterations,
+                                                          _NOT_ESCAPED_VALUE)
+        escape_band[escape_band == _NOT_ESCAPED_VALUE] = self._interior_value
+        return escape_band.astype(_ESCAPE_MAP_DTYPE).reshape(band_shape).T
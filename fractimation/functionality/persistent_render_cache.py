@@ -0,0 +1,259 @@
+"""
+Fractimation specific Persistent Render Cache
+
+Public Methods :
+  * build_render_cache_key - Returns a stable content hash identifying a render
+
+Public Classes :
+  * PersistentRenderCache - Stores escape maps on disk so renders survive process restarts
+"""
+
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import time
+import types
+
+import numpy
+
+_CACHE_FILE_EXTENSION = ".npy"
+_TEMP_FILE_PREFIX = ".tmp-"
+_LOCK_FILE_NAME = ".eviction.lock"
+_STALE_LOCK_SECONDS = 60
+_DEFAULT_MAX_CACHE_BYTES = 2 * 1024**3
+_KEY_VERSION = 3
+
+def _describe_code(code):
+    """
+    Returns a JSON serializable description of a code object covering its bytecode, constants &
+      referenced names
+
+    Parameters :
+      * code - The code object to describe
+    """
+    constants = [_describe_code(constant) if isinstance(constant, types.CodeType)
+                 else repr(constant) for constant in code.co_consts]
+    return {"bytecode": code.co_code.hex(), "constants": constants,
+            "names": list(code.co_names)}
+
+def _describe_callable(value):
+    """
+    Returns a JSON serializable description of a callable parameter value (ie. a spacing_func);
+      lambdas & nested functions share their qualified name with every other one defined in the
+      same place, so they are described by their code, defaults & closure values instead
+
+    Parameters :
+      * value - Callable to describe
+    """
+    if isinstance(value, functools.partial):
+        return {"partial": _describe_callable(value.func), "args": _describe_value(value.args),
+                "keywords": _describe_value(value.keywords)}
+
+    qualified_name = getattr(value, "__qualname__", None)
+    if qualified_name is None:
+        raise ValueError("Callable {!r} cannot be identified in render cache keys".format(value))
+
+    name = "{}.{}".format(getattr(value, "__module__", ""), qualified_name)
+    code = getattr(value, "__code__", None)
+    if "<" not in qualified_name or code is None:
+        return name
+
+    closure_values = [cell.cell_contents for cell in value.__closure__ or ()]
+    return {"name": name, "code": _describe_code(code),
+            "defaults": _describe_value(value.__defaults__),
+            "closure": _describe_value(closure_values)}
+
+def _describe_value(value):
+    """
+    Returns a JSON serializable description of a parameter value
+
+    Parameters :
+      * value - Value to describe
+    """
+    if isinstance(value, numpy.ndarray) or isinstance(value, numpy.generic):
+        return {"dtype": value.dtype.str, "values": numpy.asarray(value).tolist()}
+    if isinstance(value, (list, tuple)):
+        return [_describe_value(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _describe_value(item) for key, item in value.items()}
+    if callable(value):
+        return _describe_callable(value)
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, complex):
+        return [value.real, value.imag]
+
+    return {"class": type(value).__name__, "attributes": _describe_value(vars(value))}
+
+def build_render_cache_key(fractal_iterable, frame_count, image_params):
+    """
+    Returns a stable hex digest identifying the escape map of a render; identical parameters
+      produce identical keys in every process
+
+    Parameters :
+      * fractal_iterable - The FractalFormulaIterable being rendered
+      * frame_count - The number of cached frames (iterations including the initial frame)
+      * image_params - The ImageParams of the renderer
+    """
+    dimension_params = fractal_iterable.get_dimension_params()
+    fractal_iterable_type = type(fractal_iterable)
+    key_description = {
+        "version": _KEY_VERSION,
+        "fractal": "{}.{}".format(fractal_iterable_type.__module__,
+                                  fractal_iterable_type.__qualname__),
+        "z_values_range_params": _describe_value(fractal_iterable.get_z_values_range_params()),
+        "c_values_range_params": _describe_value(fractal_iterable.get_c_values_range_params()),
+        "dimensions": [dimension_params.width, dimension_params.height],
+        "formula_params": _describe_value(fractal_iterable.get_formula_params()),
+        "iteration_budget_params": _describe_value(
+            fractal_iterable.get_iteration_budget_params()),
+        "precision": numpy.dtype(complex).str,
+        "frame_count": frame_count,
+        "initial_value": _describe_value(image_params.initial_value),
+    }
+    key_json = json.dumps(key_description, sort_keys=True)
+    return hashlib.sha256(key_json.encode("utf-8")).hexdigest()
+
+class PersistentRenderCache(object):
+    """
+    Content addressed on-disk cache of escape maps stored as .npy files which are memory mapped
+      when loaded.  Writes are atomic (write to a temporary file then rename) so concurrent
+      processes never observe partial files, and the least recently used files are evicted once
+      the total size exceeds the configured cap.
+
+    Public Methods :
+      * load - Returns the memory mapped escape map stored for a key
+      * store - Stores an escape map for a key
+      * clear - Removes every file from the cache
+    """
+
+    _cache_directory = None
+    _max_cache_bytes = None
+
+    def __init__(self, cache_directory, max_cache_bytes=_DEFAULT_MAX_CACHE_BYTES):
+        """
+        Constructor
+
+        Parameters :
+          * cache_directory - Directory the cache files are stored in (created if missing)
+          * max_cache_bytes (optional) - Maximum total size of the cache files
+        """
+        self._cache_directory = cache_directory
+        self._max_cache_bytes = max_cache_bytes
+
+        os.makedirs(cache_directory, exist_ok=True)
+
+    def get_cache_directory(self):
+        return self._cache_directory
+
+    def get_max_cache_bytes(self):
+        return self._max_cache_bytes
+
+    def _get_cache_path(self, key):
+        return os.path.join(self._cache_directory, key + _CACHE_FILE_EXTENSION)
+
+    def load(self, key):
+        """
+        Returns the read-only memory mapped escape map stored for key or None if it is not cached
+
+        Parameters :
+          * key - Key produced by build_render_cache_key
+        """
+        cache_path = self._get_cache_path(key)
+        try:
+            escape_map = numpy.load(cache_path, mmap_mode="r")
+            os.utime(cache_path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+
+        return escape_map
+
+    def store(self, key, escape_map):
+        """
+        Atomically stores an escape map for key and evicts the least recently used files if the
+          cache grew beyond its size cap
+
+        Parameters :
+          * key - Key produced by build_render_cache_key
+          * escape_map - Array to store
+        """
+        temp_file, temp_path = tempfile.mkstemp(prefix=_TEMP_FILE_PREFIX,
+                                                suffix=_CACHE_FILE_EXTENSION,
+                                                dir=self._cache_directory)
+        try:
+            with os.fdopen(temp_file, "wb") as cache_file:
+                numpy.save(cache_file, numpy.ascontiguousarray(escape_map))
+            os.replace(temp_path, self._get_cache_path(key))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self._evict()
+
+    def clear(self):
+        """
+        Removes every cached escape map
+        """
+        for cache_path, file_size, access_time in self._list_cache_files():
+            self._remove_file(cache_path)
+
+    def _list_cache_files(self):
+        cache_files = []
+        for file_name in os.listdir(self._cache_directory):
+            if not file_name.endswith(_CACHE_FILE_EXTENSION):
+                continue
+            if file_name.startswith(_TEMP_FILE_PREFIX):
+                continue
+
+            cache_path = os.path.join(self._cache_directory, file_name)
+            try:
+                file_stats = os.stat(cache_path)
+            except FileNotFoundError:
+                continue
+            cache_files.append([cache_path, file_stats.st_size, file_stats.st_mtime])
+
+        return cache_files
+
+    def _remove_file(self, file_path):
+        try:
+            os.remove(file_path)
+        except (FileNotFoundError, PermissionError):
+            # Already evicted by another process or still memory mapped on Windows
+            pass
+
+    def _acquire_eviction_lock(self):
+        lock_path = os.path.join(self._cache_directory, _LOCK_FILE_NAME)
+        try:
+            lock_file = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                lock_age = time.time() - os.stat(lock_path).st_mtime
+            except FileNotFoundError:
+                return None
+            if lock_age > _STALE_LOCK_SECONDS:
+                self._remove_file(lock_path)
+            return None
+
+        os.close(lock_file)
+        return lock_path
+
+    def _evict(self):
+        # Only one process evicts at a time; others skip since the holder brings the size down
+        lock_path = self._acquire_eviction_lock()
+        if lock_path is None:
+            return
+
+        try:
+            cache_files = self._list_cache_files()
+            total_bytes = sum(file_size for cache_path, file_size, access_time in cache_files)
+            cache_files.sort(key=lambda cache_file: cache_file[2])
+            for cache_path, file_size, access_time in cache_files:
+                if total_bytes <= self._max_cache_bytes:
+                    break
+                self._remove_file(cache_path)
+                total_bytes -= file_size
+        finally:
+            self._remove_file(lock_path)
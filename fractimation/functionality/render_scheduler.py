@@ -0,0 +1,319 @@
+"""
+Fractimation specific Render Scheduler
+
+Public Classes :
+  * RenderScheduler - Shares a pool of render threads & a memory budget across renderers
+"""
+
+import os
+import threading
+
+_DEFAULT_LOOKAHEAD_FRAMES = 30
+_JOIN_SECONDS = 5.0
+
+# Work tiers, most urgent first
+_VISIBLE_TIER = 0
+_LOOKAHEAD_TIER = 1
+_PREHEAT_TIER = 2
+
+class RenderScheduler(object):
+    """
+    Renders the frames of several CachedImageRenderers (ie. one per viewer window) on one shared
+      pool of worker threads instead of preheating each renderer in turn.  Registered renderers
+      display their nearest cached frame while the scheduler catches up, like with a
+      LookaheadFrameProducer, so every viewer opens immediately.
+
+    Work is picked one frame at a time in priority order :
+      * frames up to the one being displayed, before frames in the lookahead window, before the
+          remaining frames of the animation
+      * within each of those, the focused renderer (the last one the mouse entered, or the one set
+          with set_focused_renderer) before the others
+    Frames of one renderer are always produced in order by a single worker, since every iteration
+      depends on the previous one.
+
+    With a memory budget, cached frame images beyond the budget are evicted once rendered,
+      starting with the frames furthest from the playback head of renderers without focus; the
+      escape map is kept, so evicted frames are rebuilt cheaply when they are displayed again.
+      Rebuilt frames are cached again, so the budget is also enforced by a worker whenever a
+      frame is requested, keeping eviction off the UI thread.
+
+    Public Methods :
+      * register - Attaches a renderer to the scheduler
+      * unregister - Detaches a renderer from the scheduler
+      * set_focused_renderer - Sets the renderer whose frames are rendered first
+      * get_focused_renderer - Returns the renderer whose frames are rendered first
+      * get_cache_byte_count - Returns the bytes held by the caches of every registered renderer
+      * start - Starts the worker threads
+      * stop - Stops the worker threads
+      * wait_until_idle - Waits until every registered renderer has rendered all of its frames
+    """
+
+    _worker_count = None
+    _memory_budget = None
+    _lookahead_frames = None
+
+    _condition = None
+    _scheduled_renderers = None
+    _focused_renderer = None
+    _worker_threads = None
+    _stopped = False
+    _worker_error = None
+    _budget_check_pending = False
+
+    def __init__(self, worker_count=None, memory_budget=None,
+                 lookahead_frames=_DEFAULT_LOOKAHEAD_FRAMES):
+        """
+        Constructor
+
+        Parameters :
+          * worker_count (optional) - Number of worker threads (default is the number of CPUs)
+          * memory_budget (optional) - Maximum bytes of cached frame images across every renderer
+              (default is unlimited)
+          * lookahead_frames (optional) - Number of frames ahead of each playback head which are
+              rendered before the rest of the animation
+        """
+        if worker_count is None:
+            worker_count = os.cpu_count() or 1
+
+        self._worker_count = worker_count
+        self._memory_budget = memory_budget
+        self._lookahead_frames = lookahead_frames
+
+        self._condition = threading.Condition()
+        self._scheduled_renderers = list()
+        self._worker_threads = list()
+
+    def get_focused_renderer(self):
+        return self._focused_renderer
+
+    def set_focused_renderer(self, renderer):
+        with self._condition:
+            self._focused_renderer = renderer
+            self._condition.notify_all()
+
+    def register(self, renderer, frame_count):
+        """
+        Attaches a renderer; its frames are rendered by the scheduler up to frame_count
+
+        Parameters :
+          * renderer - The CachedImageRenderer to render
+          * frame_count - Number of frames of the renderer's animation
+        """
+        scheduled_renderer = _ScheduledRenderer(self, renderer, frame_count)
+
+        render_axes = renderer.get_render_axes()
+        if render_axes is not None:
+            def handle_axes_enter(event_data):
+                if event_data.inaxes is render_axes:
+                    self.set_focused_renderer(renderer)
+
+            scheduled_renderer.connection_id = render_axes.figure.canvas.mpl_connect(
+                "axes_enter_event", handle_axes_enter)
+
+        with self._condition:
+            self._scheduled_renderers.append(scheduled_renderer)
+            if self._focused_renderer is None:
+                self._focused_renderer = renderer
+            renderer.set_frame_producer(scheduled_renderer)
+            self._condition.notify_all()
+
+    def unregister(self, renderer):
+        with self._condition:
+            scheduled_renderer = self._find_scheduled_renderer(renderer)
+            self._scheduled_renderers.remove(scheduled_renderer)
+            if self._focused_renderer is renderer:
+                self._focused_renderer = None
+
+            # Waits for a worker still rendering one of the renderer's frames
+            while scheduled_renderer.busy:
+                self._condition.wait()
+
+        if renderer.get_frame_producer() is scheduled_renderer:
+            renderer.set_frame_producer(None)
+        if scheduled_renderer.connection_id is not None:
+            renderer.get_render_axes().figure.canvas.mpl_disconnect(
+                scheduled_renderer.connection_id)
+
+    def get_cache_byte_count(self):
+        with self._condition:
+            renderers = [scheduled_renderer.renderer
+                         for scheduled_renderer in self._scheduled_renderers]
+
+        return sum(renderer.get_cache_byte_count() for renderer in renderers)
+
+    def start(self):
+        with self._condition:
+            self._stopped = False
+            self._worker_error = None
+
+        for worker_counter in range(0, self._worker_count):
+            worker_thread = threading.Thread(target=self._render_frames, daemon=True)
+            worker_thread.start()
+            self._worker_threads.append(worker_thread)
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+        for worker_thread in self._worker_threads:
+            worker_thread.join(_JOIN_SECONDS)
+        self._worker_threads.clear()
+
+    def wait_until_idle(self, timeout=None):
+        """
+        Waits until no registered renderer has frames left to render & returns whether it did
+          before the timeout; errors raised by the workers are raised again here
+
+        Parameters :
+          * timeout (optional) - Maximum seconds to wait (default waits indefinitely)
+        """
+        with self._condition:
+            is_idle = self._condition.wait_for(
+                lambda: self._worker_error is not None or (
+                    self._get_next_work() is None and
+                    not any(scheduled_renderer.busy
+                            for scheduled_renderer in self._scheduled_renderers)),
+                timeout)
+
+            if self._worker_error is not None:
+                raise self._worker_error
+
+            return is_idle
+
+    def _find_scheduled_renderer(self, renderer):
+        for scheduled_renderer in self._scheduled_renderers:
+            if scheduled_renderer.renderer is renderer:
+                return scheduled_renderer
+
+        raise ValueError("Renderer is not registered with this scheduler")
+
+    def _request_frame(self):
+        with self._condition:
+            # Playback may have rebuilt evicted frames since the budget was last enforced
+            self._budget_check_pending = self._memory_budget is not None
+            self._condition.notify_all()
+
+    def _get_next_work(self):
+        """
+        Returns [scheduled_renderer, frame_num] of the most urgent frame which is not being
+          rendered or None if there is no work left; must be called holding the condition
+        """
+        next_work = None
+        next_priority = None
+        for scheduled_renderer in self._scheduled_renderers:
+            if scheduled_renderer.busy:
+                continue
+
+            renderer = scheduled_renderer.renderer
+            frame_num = renderer.get_cached_frame_count()
+            if frame_num >= scheduled_renderer.frame_count or renderer.get_iterations_complete():
+                continue
+
+            playback_frame = scheduled_renderer.playback_frame
+            if frame_num <= playback_frame:
+                work_tier = _VISIBLE_TIER
+            elif frame_num <= playback_frame + self._lookahead_frames:
+                work_tier = _LOOKAHEAD_TIER
+            else:
+                work_tier = _PREHEAT_TIER
+
+            priority = (work_tier, renderer is not self._focused_renderer,
+                        frame_num - playback_frame)
+            if next_priority is None or priority < next_priority:
+                next_work = [scheduled_renderer, frame_num]
+                next_priority = priority
+
+        return next_work
+
+    def _render_frames(self):
+        while True:
+            with self._condition:
+                next_work = self._get_next_work()
+                while not self._stopped and next_work is None and not self._budget_check_pending:
+                    self._condition.wait()
+                    next_work = self._get_next_work()
+
+                if self._stopped:
+                    return
+
+                self._budget_check_pending = False
+                if next_work is None:
+                    scheduled_renderer = None
+                else:
+                    scheduled_renderer, frame_num = next_work
+                    scheduled_renderer.busy = True
+
+            if scheduled_renderer is None:
+                self._enforce_memory_budget()
+                continue
+
+            renderer = scheduled_renderer.renderer
+            try:
+                with renderer.get_render_lock():
+                    renderer.get_frame_image(frame_num)
+                self._enforce_memory_budget()
+            except Exception as worker_error:
+                # Playback falls back to rendering on the UI thread, which reports the failure
+                with self._condition:
+                    self._worker_error = worker_error
+                    self._scheduled_renderers.remove(scheduled_renderer)
+                if renderer.get_frame_producer() is scheduled_renderer:
+                    renderer.set_frame_producer(None)
+            finally:
+                with self._condition:
+                    scheduled_renderer.busy = False
+                    self._condition.notify_all()
+
+    def _enforce_memory_budget(self):
+        if self._memory_budget is None:
+            return
+
+        with self._condition:
+            scheduled_renderers = list(self._scheduled_renderers)
+            focused_renderer = self._focused_renderer
+
+        cache_byte_count = sum(scheduled_renderer.renderer.get_cache_byte_count()
+                               for scheduled_renderer in scheduled_renderers)
+        if cache_byte_count <= self._memory_budget:
+            return
+
+        # Frames of renderers without focus are evicted first, furthest from playback first; the
+        #   frame being displayed is never evicted
+        eviction_candidates = []
+        for scheduled_renderer in scheduled_renderers:
+            renderer = scheduled_renderer.renderer
+            playback_frame = scheduled_renderer.playback_frame
+            for frame_num in range(0, renderer.get_cached_frame_count()):
+                if frame_num != playback_frame:
+                    eviction_candidates.append([renderer is focused_renderer,
+                                                -abs(frame_num - playback_frame), frame_num,
+                                                renderer])
+
+        eviction_candidates.sort(key=lambda candidate: candidate[:3])
+        for is_focused, distance, frame_num, renderer in eviction_candidates:
+            if cache_byte_count <= self._memory_budget:
+                break
+
+            cache_byte_count -= renderer.evict_frame(frame_num)
+
+class _ScheduledRenderer(object):
+    """
+    Frame producer attached to each registered renderer; tracks the renderer's playback head
+    """
+
+    scheduler = None
+    renderer = None
+    frame_count = None
+    playback_frame = 0
+    busy = False
+    connection_id = None
+
+    def __init__(self, scheduler, renderer, frame_count):
+        self.scheduler = scheduler
+        self.renderer = renderer
+        self.frame_count = frame_count
+
+    def request_frame(self, frame_num):
+        self.playback_frame = frame_num
+        self.scheduler._request_frame()
@@ -2,15 +2,18 @@ import numpy
 
 from ..data_models.complex_range_params import ComplexRangeParams
 from ..data_models.dimension_params import DimensionParams
+from ..helpers.formula_tools import generate_range_axes
 
 def _reinitialize_renderer(renderer, fractal_iterable, z_values_range_params,
                            c_values_range_params):
-    dimension_params = fractal_iterable.get_dimension_params()
-    dimension_params.initialize()
-    fractal_iterable.initialize(z_values_range_params, c_values_range_params, dimension_params,
-                                fractal_iterable.get_formula_params(),
-                                fractal_iterable.get_max_iterations())
-    renderer.initialize(fractal_iterable)
+    # Background frame producers must not render while the dimensions are being reset
+    with renderer.get_render_lock():
+        dimension_params = fractal_iterable.get_dimension_params()
+        dimension_params.initialize()
+        fractal_iterable.initialize(z_values_range_params, c_values_range_params,
+                                    dimension_params, fractal_iterable.get_formula_params(),
+                                    fractal_iterable.get_max_iterations())
+        renderer.initialize(fractal_iterable)
 
 class ZoomableComplexRange():
     """Base Class for Zoomable Complex Polynomial Fractal Equation Renderers"""
@@ -28,24 +31,29 @@ class ZoomableComplexRange():
         prev_zoom = ZoomCacheItem(fractal_iterable.get_z_values_range_params(),
                                   fractal_iterable.get_c_values_range_params())
 
-        z_values_range = fractal_iterable.get_z_values_range()
-        z_min_real_num = z_values_range.real_number_values[top_left_x][top_left_y]
-        z_max_real_num = z_values_range.real_number_values[bottom_right_x][bottom_right_y]
-        z_min_imaginary_num = z_values_range.imaginary_number_values[top_left_x][top_left_y]
-        z_max_imaginary_num = z_values_range.imaginary_number_values[bottom_right_x][bottom_right_y]
+        # Pixel values are looked up on the range axes, which works for any pixel order
+        dimension_params = fractal_iterable.get_dimension_params()
+        exploit_symmetry = fractal_iterable.get_exploit_symmetry()
+        z_values_range_params = fractal_iterable.get_z_values_range_params()
+        z_real_axis, z_imaginary_axis = generate_range_axes(z_values_range_params,
+                                                            dimension_params, exploit_symmetry)
+        z_min_real_num = z_real_axis[top_left_x]
+        z_max_real_num = z_real_axis[bottom_right_x]
+        z_min_imaginary_num = z_imaginary_axis[top_left_y]
+        z_max_imaginary_num = z_imaginary_axis[bottom_right_y]
 
-        c_values_range = fractal_iterable.get_c_values_range()
-        c_min_real_num = c_values_range.real_number_values[top_left_x][top_left_y]
-        c_max_real_num = c_values_range.real_number_values[bottom_right_x][bottom_right_y]
-        c_min_imaginary_num = c_values_range.imaginary_number_values[top_left_x][top_left_y]
-        c_max_imaginary_num = c_values_range.imaginary_number_values[bottom_right_x][bottom_right_y]
+        c_values_range_params = fractal_iterable.get_c_values_range_params()
+        c_real_axis, c_imaginary_axis = generate_range_axes(c_values_range_params,
+                                                            dimension_params, exploit_symmetry)
+        c_min_real_num = c_real_axis[top_left_x]
+        c_max_real_num = c_real_axis[bottom_right_x]
+        c_min_imaginary_num = c_imaginary_axis[top_left_y]
+        c_max_imaginary_num = c_imaginary_axis[bottom_right_y]
 
-        z_values_range_params = fractal_iterable.get_z_values_range_params()
         new_z_values_range_params = ComplexRangeParams(z_min_real_num, z_max_real_num,
                                                        z_min_imaginary_num, z_max_imaginary_num,
                                                        z_values_range_params.spacing_func)
 
-        c_values_range_params = fractal_iterable.get_c_values_range_params()
         new_c_values_range_params = ComplexRangeParams(c_min_real_num, c_max_real_num,
                                                        c_min_imaginary_num, c_max_imaginary_num,
                                                        c_values_range_params.spacing_func)
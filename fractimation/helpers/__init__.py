@@ -3,7 +3,14 @@ Fractimation Helpers Subpackage contains various generic miscellaneous modules a
 ease development.
 
 Public Modules :
+  * color_tools - Contains methods related to converting images into colors ahead of display
+  * escape_map_tools - Contains methods related to escape maps
+  * formula_compiler - Contains methods related to compiling formula expressions
   * fractal_algorithm - Contains methods related to fractal algorithm calculations
+  * histogram_tools - Contains methods related to accumulating density histograms
   * list_tools - Contains methods related to manipulating lists
+  * morton_tools - Contains methods related to Morton (Z-order) pixel ordering
+  * polar_tools - Contains methods related to polar grids & log-polar resampling
   * render - Contains methods related to Matplotlib Rendering
+  * symmetry_tools - Contains methods related to detecting & exploiting fractal symmetry
 """
@@ -0,0 +1,164 @@
+"""
+Functions related to converting fractal images into colors ahead of display; Matplotlib is only
+  imported when a color map is looked up
+
+Public Methods :
+  * get_color_map - Returns the Matplotlib Colormap for a color map name
+  * get_lut_size - Returns the number of colors needed to display a range of values
+  * build_color_lut - Returns a uint8 RGBA lookup table sampled from a color map
+  * get_equalized_positions - Returns the histogram equalized color map position of each escape
+      frame
+  * build_equalized_color_lut - Returns a uint8 RGBA lookup table of histogram equalized colors
+  * build_listed_color_map - Returns a Matplotlib Colormap containing the colors of a lookup table
+  * colorize_image - Returns a uint8 RGBA image using a fixed normalization
+  * find_changed_region - Returns the bounding rows & columns of the pixels which differ between
+      two images
+"""
+
+import numpy
+
+_FLOAT_LUT_SIZE = 256
+_MAX_LUT_SIZE = 65536
+
+def get_color_map(color_map):
+    """
+    Returns the Matplotlib Colormap for color_map
+
+    Parameters :
+      * color_map - A color map name or a Matplotlib Colormap
+    """
+    if not isinstance(color_map, str):
+        return color_map
+
+    import matplotlib
+
+    color_maps = getattr(matplotlib, "colormaps", None)
+    if color_maps is not None:
+        return color_maps[color_map]
+
+    from matplotlib import cm
+    return cm.get_cmap(color_map)
+
+def get_lut_size(min_value, max_value, integer_values):
+    """
+    Returns the number of colors needed to display a value range without losing precision
+
+    Parameters :
+      * min_value - Minimum value of the range
+      * max_value - Maximum value of the range
+      * integer_values - Whether the displayed values are integers
+    """
+    if not integer_values:
+        return _FLOAT_LUT_SIZE
+
+    return int(min(max(max_value - min_value + 1, 1), _MAX_LUT_SIZE))
+
+def build_color_lut(color_map, lut_size):
+    """
+    Returns a uint8 array of shape (lut_size, 4) containing colors evenly sampled from a color map
+
+    Parameters :
+      * color_map - A color map name or a Matplotlib Colormap
+      * lut_size - Number of colors in the lookup table
+    """
+    color_map = get_color_map(color_map)
+    return color_map(numpy.linspace(0.0, 1.0, lut_size), bytes=True)
+
+def get_equalized_positions(escape_counts):
+    """
+    Returns a float array of the color map position (between 0 & 1) of every value from 0 to
+      len(escape_counts); escaped values are spaced by the running cumulative distribution of
+      escapes, so each color covers a similar number of pixels.  Values which have not escaped are
+      placed at 0 (initial_value) & 1 (recolored pixels).  Costs time proportional to the number
+      of frames rather than pixels.
+
+    Parameters :
+      * escape_counts - The number of pixels which escaped on each frame up to the frame being
+          displayed (frame 0 first)
+    """
+    escape_counts = numpy.asarray(escape_counts, dtype=float)
+    cumulative_counts = numpy.cumsum(escape_counts)
+
+    positions = numpy.zeros(escape_counts.size + 1)
+    positions[-1] = 1.0
+    escape_count = cumulative_counts[-1]
+    if escape_count > 0:
+        # Each escape frame is placed at the middle of its share of the distribution
+        positions[1:-1] = (cumulative_counts[1:] - escape_counts[1:] / 2) / escape_count
+
+    return positions
+
+def build_equalized_color_lut(color_map, escape_counts, min_value=0):
+    """
+    Returns a uint8 array of shape (len(escape_counts) + 1 - min_value, 4) containing the
+      histogram equalized color of every value from min_value to len(escape_counts); values below
+      0 share the color of 0
+
+    Parameters :
+      * color_map - A color map name or a Matplotlib Colormap
+      * escape_counts - The number of pixels which escaped on each frame up to the frame being
+          displayed (frame 0 first)
+      * min_value (optional) - The first value of the lookup table
+    """
+    positions = get_equalized_positions(escape_counts)
+    if min_value < 0:
+        positions = numpy.concatenate([numpy.zeros(-min_value), positions])
+
+    color_map = get_color_map(color_map)
+    return color_map(positions, bytes=True)
+
+def build_listed_color_map(color_lut):
+    """
+    Returns a Matplotlib ListedColormap containing the colors of a uint8 RGBA lookup table
+
+    Parameters :
+      * color_lut - Lookup table returned by build_color_lut or build_equalized_color_lut
+    """
+    from matplotlib.colors import ListedColormap
+
+    return ListedColormap(numpy.asarray(color_lut) / 255.0)
+
+def colorize_image(image, color_lut, min_value, max_value):
+    """
+    Returns a uint8 RGBA array of image's shape plus a trailing dimension of 4; values are
+      normalized between min_value & max_value (clipping values outside) instead of per image so
+      every frame of an animation shares the same colors
+
+    Parameters :
+      * image - Array of values to colorize
+      * color_lut - Lookup table returned by build_color_lut
+      * min_value - Value displayed with the first color of the lookup table
+      * max_value - Value displayed with the last color of the lookup table
+    """
+    lut_size = len(color_lut)
+    value_span = max_value - min_value
+    if value_span <= 0:
+        lut_indexes = numpy.zeros(numpy.shape(image), dtype=numpy.intp)
+    else:
+        lut_indexes = numpy.subtract(image, min_value, dtype=float)
+        lut_indexes *= (lut_size - 1) / value_span
+        numpy.rint(lut_indexes, out=lut_indexes)
+        numpy.clip(lut_indexes, 0, lut_size - 1, out=lut_indexes)
+        lut_indexes = lut_indexes.astype(numpy.intp)
+
+    return numpy.take(color_lut, lut_indexes, axis=0)
+
+def find_changed_region(previous_image, image):
+    """
+    Returns [first_row, last_row, first_column, last_column] bounding the pixels which differ
+      between two images of the same shape, or None if the images are identical
+
+    Parameters :
+      * previous_image - The image before the change
+      * image - The image after the change
+    """
+    changed_pixels = previous_image != image
+    if changed_pixels.ndim > 2:
+        changed_pixels = numpy.any(changed_pixels, axis=tuple(range(2, changed_pixels.ndim)))
+
+    changed_rows = numpy.flatnonzero(numpy.any(changed_pixels, axis=1))
+    if changed_rows.size < 1:
+        return None
+
+    changed_columns = numpy.flatnonzero(numpy.any(changed_pixels, axis=0))
+    return [changed_rows[0], changed_rows[-1], changed_columns[0], changed_columns[-1]]
@@ -0,0 +1,88 @@
+"""
+Functions related to Escape Maps (arrays of the iteration each pixel escaped on)
+
+Public Methods :
+  * build_escape_frame - Returns the image of a single frame reconstructed from an escape map
+  * compute_escape_map - Runs a fractal iterator to completion and returns its escape map
+  * find_edge_pixels - Returns a mask of pixels whose escape iteration differs from a neighbor
+"""
+
+import numpy
+
+from .list_tools import update_indexes_with_value
+
+def build_escape_frame(escape_map, frame_num, initial_value, recolor_image=False):
+    """
+    Returns the image CachedImageRenderer produced for frame_num given the escape map of a later
+      frame; pixels which escaped after frame_num are reset to initial_value
+
+    Parameters :
+      * escape_map - Array containing the iteration each pixel escaped on (initial_value for pixels
+          which have not escaped)
+      * frame_num - The frame to reconstruct
+      * initial_value - The value of pixels which have not escaped
+      * recolor_image (optional) - Whether pixels which have not escaped are recolored to
+          frame_num + 1 (frame 0 is never recolored)
+    """
+    frame_image = numpy.where(escape_map > frame_num, initial_value, escape_map)
+    if recolor_image and frame_num > 0:
+        frame_image = update_indexes_with_value(frame_image, initial_value, frame_num + 1)
+
+    return frame_image
+
+def compute_escape_map(fractal_iterator, sample_count, max_iterations, initial_value=0,
+                       is_cancelled=None):
+    """
+    Runs a FractalFormulaIterator using escape index output and returns
+      [escape_map, iteration_count] where escape_map is a flat array containing the frame each
+      sample escaped on (iteration + 1, as recorded by CachedImageRenderer) and iteration_count is
+      the number of iterations which were run
+
+    Parameters :
+      * fractal_iterator - A FractalFormulaIterator which has not been iterated yet
+      * sample_count - The number of z & c values the iterator was created with
+      * max_iterations - The maximum number of iterations to run
+      * initial_value (optional) - The value of samples which never escaped
+      * is_cancelled (optional) - Function checked before every iteration; None is returned
+          instead of the escape map once it returns True (ie. for previews which became stale)
+    """
+    fractal_iterator.enable_escape_index_output()
+    escape_map = numpy.full(sample_count, initial_value, dtype=int)
+
+    iteration_count = 0
+    while iteration_count < max_iterations:
+        if is_cancelled is not None and is_cancelled():
+            return None
+
+        try:
+            iteration_data = fractal_iterator.__next__()
+        except StopIteration:
+            break
+
+        if iteration_data is None:
+            break
+
+        iteration_count += 1
+        escape_map[iteration_data.escaped_pixel_indexes] = iteration_count
+
+    return [escape_map, iteration_count]
+
+def find_edge_pixels(escape_map):
+    """
+    Returns a boolean array of escape_map's shape marking pixels whose value differs from at least
+      one horizontal or vertical neighbor; both pixels on either side of a difference are marked
+
+    Parameters :
+      * escape_map - A 2 dimensional escape map
+    """
+    edge_pixels = numpy.zeros(numpy.shape(escape_map), dtype=bool)
+
+    x_differences = escape_map[1:, :] != escape_map[:-1, :]
+    edge_pixels[1:, :] |= x_differences
+    edge_pixels[:-1, :] |= x_differences
+
+    y_differences = escape_map[:, 1:] != escape_map[:, :-1]
+    edge_pixels[:, 1:] |= y_differences
+    edge_pixels[:, :-1] |= y_differences
+
+    return edge_pixels
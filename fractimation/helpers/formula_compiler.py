@@ -0,0 +1,350 @@
+"""
+Functions related to compiling Formula Expressions (ie. "(abs(re(z)) + 1j*abs(im(z)))**2 + c") into
+  functions evaluating a single fractal iteration over arrays of z & c values
+
+Expressions may only contain the names z & c, numeric constants, the operators + - * / ** and the
+  functions abs, re, im, conj, exp, log, sqrt, sin, cos, tan, sinh, cosh & tanh.  Expressions are
+  validated against this whitelist & never passed to eval.
+
+Public Methods :
+  * parse_formula - Returns the validated syntax tree of a formula expression
+  * compile_formula - Returns a function evaluating a formula expression over arrays
+"""
+
+import ast
+import cmath
+import operator
+import sys
+
+import numpy
+
+_INPUT_NAMES = ["z", "c"]
+_MAX_FORMULA_NODES = 256
+_MAX_EXPANDED_POWER = 8
+
+_BINARY_OPERATORS = {
+    ast.Add: [numpy.add, operator.add, "+"],
+    ast.Sub: [numpy.subtract, operator.sub, "-"],
+    ast.Mult: [numpy.multiply, operator.mul, "*"],
+    ast.Div: [numpy.divide, operator.truediv, "/"],
+    ast.Pow: [numpy.power, operator.pow, "**"],
+}
+_UNARY_OPERATORS = {
+    ast.USub: [numpy.negative, operator.neg, "-"],
+    ast.UAdd: [numpy.positive, operator.pos, "+"],
+}
+
+def _real_part(values, out):
+    numpy.copyto(out, numpy.real(values))
+
+def _imaginary_part(values, out):
+    numpy.copyto(out, numpy.imag(values))
+
+# Each function maps to [array function, constant function, kernel source template]
+_FUNCTIONS = {
+    "abs": [numpy.absolute, abs, "abs({})"],
+    "re": [_real_part, lambda value: complex(value).real, "complex({}).real"],
+    "im": [_imaginary_part, lambda value: complex(value).imag, "complex({}).imag"],
+    "conj": [numpy.conjugate, lambda value: complex(value).conjugate(),
+             "complex({}).conjugate()"],
+    "exp": [numpy.exp, cmath.exp, "cmath.exp({})"],
+    "log": [numpy.log, cmath.log, "cmath.log({})"],
+    "sqrt": [numpy.sqrt, cmath.sqrt, "cmath.sqrt({})"],
+    "sin": [numpy.sin, cmath.sin, "cmath.sin({})"],
+    "cos": [numpy.cos, cmath.cos, "cmath.cos({})"],
+    "tan": [numpy.tan, cmath.tan, "cmath.tan({})"],
+    "sinh": [numpy.sinh, cmath.sinh, "cmath.sinh({})"],
+    "cosh": [numpy.cosh, cmath.cosh, "cmath.cosh({})"],
+    "tanh": [numpy.tanh, cmath.tanh, "cmath.tanh({})"],
+}
+
+# Compiled kernels are shared by every iterator evaluating the same expression
+_jit_kernels = dict()
+
+def _get_number(node):
+    """
+    Returns the value of a numeric constant node or None for any other node
+
+    Parameters :
+      * node - The ast node to inspect
+    """
+    # Python 3.6 & 3.7 parse numbers into ast.Num nodes, later versions into ast.Constant nodes
+    if sys.version_info < (3, 8):
+        if isinstance(node, ast.Num):
+            return node.n
+        return None
+
+    if (isinstance(node, ast.Constant) and isinstance(node.value, (int, float, complex)) and
+            not isinstance(node.value, bool)):
+        return node.value
+    return None
+
+def _validate_node(node, function_names):
+    """
+    Raises a ValueError if a syntax tree node is not allowed in formula expressions
+
+    Parameters :
+      * node - The ast node to validate
+      * function_names - Ids of the Name nodes which are the functions of Call nodes
+    """
+    if isinstance(node, ast.Expression):
+        return
+    if isinstance(node, ast.Name) and node.id in _INPUT_NAMES and isinstance(node.ctx, ast.Load):
+        return
+    if isinstance(node, ast.Name) and id(node) in function_names and node.id in _FUNCTIONS:
+        return
+    if isinstance(node, ast.Load):
+        return
+    if _get_number(node) is not None:
+        return
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        return
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+        return
+    if type(node) in _BINARY_OPERATORS or type(node) in _UNARY_OPERATORS:
+        return
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and
+            node.func.id in _FUNCTIONS and len(node.args) == 1 and not node.keywords):
+        return
+
+    if isinstance(node, ast.Name):
+        raise ValueError("Name '{}' is not allowed in formula expressions (only {})".format(
+            node.id, " & ".join(_INPUT_NAMES)))
+    raise ValueError("{} is not allowed in formula expressions".format(type(node).__name__))
+
+def parse_formula(expression):
+    """
+    Returns the ast.Expression of a formula expression after validating it against the whitelist
+      of names, constants, operators & functions
+
+    Parameters :
+      * expression - Formula of the next z value in terms of z & c (ie. "conj(z)**2 + c")
+    """
+    try:
+        syntax_tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as syntax_error:
+        raise ValueError("Invalid formula expression '{}' : {}".format(expression,
+                                                                      syntax_error.msg))
+
+    syntax_nodes = list(ast.walk(syntax_tree))
+    if len(syntax_nodes) > _MAX_FORMULA_NODES:
+        raise ValueError("Formula expressions are limited to {} nodes".format(_MAX_FORMULA_NODES))
+
+    function_names = set(id(syntax_node.func) for syntax_node in syntax_nodes
+                         if isinstance(syntax_node, ast.Call))
+    for syntax_node in syntax_nodes:
+        _validate_node(syntax_node, function_names)
+
+    return syntax_tree
+
+class _FormulaProgram(object):
+    """
+    Sequence of NumPy operations writing into a small set of reusable registers; operands are
+      ["input", index], ["constant", value] or ["register", index]
+    """
+
+    steps = None
+    register_count = None
+    free_registers = None
+
+    def __init__(self):
+        self.steps = list()
+        self.register_count = 0
+        self.free_registers = list()
+
+    def allocate_register(self, operands):
+        # Results are written in place over a register operand whenever one is available
+        for operand in operands:
+            if operand[0] == "register":
+                return operand[1]
+
+        if self.free_registers:
+            return self.free_registers.pop()
+
+        self.register_count += 1
+        return self.register_count - 1
+
+    def release_registers(self, operands, result_register):
+        for operand in operands:
+            if operand[0] == "register" and operand[1] != result_register and \
+                    operand[1] not in self.free_registers:
+                self.free_registers.append(operand[1])
+
+    def add_step(self, function, operands):
+        result_register = self.allocate_register(operands)
+        self.steps.append([function, operands, result_register])
+        self.release_registers(operands, result_register)
+        return ["register", result_register]
+
+    def add_power_step(self, base_operand, exponent):
+        # Small integer powers are expanded into multiplications, which are much faster than
+        #   numpy.power for complex values
+        if exponent == 2:
+            return self.add_step(numpy.square, [base_operand])
+
+        # The base is multiplied in repeatedly, so the result needs a register of its own
+        if self.free_registers:
+            result_register = self.free_registers.pop()
+        else:
+            self.register_count += 1
+            result_register = self.register_count - 1
+
+        result_operand = ["register", result_register]
+        self.steps.append([numpy.square, [base_operand], result_register])
+        for exponent_counter in range(2, exponent):
+            self.steps.append([numpy.multiply, [result_operand, base_operand], result_register])
+
+        self.release_registers([base_operand], result_register)
+        return result_operand
+
+    def emit(self, node):
+        """
+        Adds the steps evaluating a syntax tree node & returns the operand holding its value;
+          subtrees without inputs are folded into constants
+
+        Parameters :
+          * node - The validated ast node to emit
+        """
+        if isinstance(node, ast.Expression):
+            return self.emit(node.body)
+        if _get_number(node) is not None:
+            return ["constant", _get_number(node)]
+        if isinstance(node, ast.Name):
+            return ["input", _INPUT_NAMES.index(node.id)]
+
+        if isinstance(node, ast.UnaryOp):
+            operands = [self.emit(node.operand)]
+            array_function, constant_function, source_operator = _UNARY_OPERATORS[type(node.op)]
+        elif isinstance(node, ast.BinOp):
+            operands = [self.emit(node.left), self.emit(node.right)]
+            array_function, constant_function, source_operator = _BINARY_OPERATORS[type(node.op)]
+        else:
+            operands = [self.emit(node.args[0])]
+            array_function, constant_function, kernel_source = _FUNCTIONS[node.func.id]
+
+        if all(operand[0] == "constant" for operand in operands):
+            # Constants are folded as complex values so integer powers cannot grow without bound
+            try:
+                return ["constant", constant_function(*[complex(operand[1])
+                                                        for operand in operands])]
+            except (ArithmeticError, ValueError) as fold_error:
+                raise ValueError("Constant part of formula expression cannot be evaluated : "
+                                 "{}".format(fold_error))
+
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            exponent_operand = operands[1]
+            if (exponent_operand[0] == "constant" and
+                    float(numpy.real(exponent_operand[1])) in range(2, _MAX_EXPANDED_POWER + 1) and
+                    numpy.imag(exponent_operand[1]) == 0):
+                return self.add_power_step(operands[0], int(numpy.real(exponent_operand[1])))
+
+        return self.add_step(array_function, operands)
+
+def _build_program_function(syntax_tree):
+    """
+    Returns a function (z_values, c_values) -> z_values_new evaluating a validated syntax tree
+      with in-place NumPy operations
+
+    Parameters :
+      * syntax_tree - The ast.Expression returned by parse_formula
+    """
+    formula_program = _FormulaProgram()
+    result_operand = formula_program.emit(syntax_tree)
+    steps = formula_program.steps
+    register_count = formula_program.register_count
+
+    def evaluate_formula(z_values, c_values):
+        inputs = [z_values, c_values]
+        registers = [numpy.empty(numpy.shape(z_values), dtype=complex)
+                     for register_counter in range(0, register_count)]
+
+        def resolve(operand):
+            if operand[0] == "register":
+                return registers[operand[1]]
+            if operand[0] == "input":
+                return inputs[operand[1]]
+            return operand[1]
+
+        for step_function, step_operands, result_register in steps:
+            step_function(*[resolve(operand) for operand in step_operands],
+                          out=registers[result_register])
+
+        result_values = resolve(result_operand)
+        if result_operand[0] != "register":
+            # Formulas which reduce to an input or a constant still return a new array
+            result_values = numpy.add(numpy.zeros(numpy.shape(z_values), dtype=complex),
+                                      result_values)
+        return result_values
+
+    return evaluate_formula
+
+def _generate_kernel_source(node):
+    """
+    Returns the Python source of a validated syntax tree node using scalar complex operations
+
+    Parameters :
+      * node - The validated ast node to convert
+    """
+    if isinstance(node, ast.Expression):
+        return _generate_kernel_source(node.body)
+    if _get_number(node) is not None:
+        return repr(_get_number(node))
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.UnaryOp):
+        return "({}{})".format(_UNARY_OPERATORS[type(node.op)][2],
+                               _generate_kernel_source(node.operand))
+    if isinstance(node, ast.BinOp):
+        return "({} {} {})".format(_generate_kernel_source(node.left),
+                                   _BINARY_OPERATORS[type(node.op)][2],
+                                   _generate_kernel_source(node.right))
+
+    return _FUNCTIONS[node.func.id][2].format(_generate_kernel_source(node.args[0]))
+
+def _build_jit_function(syntax_tree):
+    """
+    Returns a Numba compiled ufunc (z_values, c_values) -> z_values_new evaluating a validated
+      syntax tree, or None if Numba is not installed
+
+    Parameters :
+      * syntax_tree - The ast.Expression returned by parse_formula
+    """
+    kernel_key = ast.dump(syntax_tree)
+    if kernel_key in _jit_kernels:
+        return _jit_kernels[kernel_key]
+
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    # The source is generated from the validated syntax tree, so it only contains whitelisted
+    #   names, constants, operators & cmath functions
+    kernel_source = "def formula_kernel(z, c):\n    return {}\n".format(
+        _generate_kernel_source(syntax_tree))
+    kernel_namespace = {"cmath": cmath}
+    exec(compile(kernel_source, "<formula>", "exec"), kernel_namespace)
+
+    jit_function = numba.vectorize(["complex128(complex128, complex128)"])(
+        kernel_namespace["formula_kernel"])
+    _jit_kernels[kernel_key] = jit_function
+    return jit_function
+
+def compile_formula(expression, use_jit=True):
+    """
+    Returns a function (z_values, c_values) -> z_values_new evaluating a formula expression over
+      arrays of complex values; the function is a Numba ufunc when use_jit is set & Numba is
+      installed, otherwise a fused sequence of in-place NumPy operations
+
+    Parameters :
+      * expression - Formula of the next z value in terms of z & c (ie. "conj(z)**2 + c")
+      * use_jit (optional) - Whether to compile the formula with Numba when it is available
+    """
+    syntax_tree = parse_formula(expression)
+
+    if use_jit:
+        jit_function = _build_jit_function(syntax_tree)
+        if jit_function is not None:
+            return jit_function
+
+    return _build_program_function(syntax_tree)
@@ -1,13 +1,48 @@
+import numpy
+
 from ..data_models.complex_range import ComplexRange
+from .symmetry_tools import symmetrize_axis
+
+def generate_range_axes(complex_range_params, dimension_params, symmetrize=False):
+    """
+    Returns the [real_axis, imaginary_axis] values of the pixel columns & rows of a view
 
-def generate_complex_range(complex_range_params, dimension_params):
+    Parameters :
+      * complex_range_params - ComplexRangeParams of the view
+      * dimension_params - DimensionParams of the view
+      * symmetrize (optional) - Whether values mirroring each other within a few units of floating
+          point precision are snapped to exact negations (needed by iterables exploiting symmetry);
+          by default the axes are exactly what spacing_func returns
+    """
     spacing_func = complex_range_params.spacing_func
-    
-    real_range = spacing_func(complex_range_params.min_real_number,
-                              complex_range_params.max_real_number,
-                              dimension_params.width)[dimension_params.x_indexes]
-    imaginary_range = spacing_func(complex_range_params.min_imaginary_number,
-                                   complex_range_params.max_imaginary_number,
-                                   dimension_params.height)[dimension_params.y_indexes]
+
+    real_axis = spacing_func(complex_range_params.min_real_number,
+                             complex_range_params.max_real_number,
+                             dimension_params.width)
+    imaginary_axis = spacing_func(complex_range_params.min_imaginary_number,
+                                  complex_range_params.max_imaginary_number,
+                                  dimension_params.height)
+
+    if symmetrize:
+        return [symmetrize_axis(real_axis), symmetrize_axis(imaginary_axis)]
+
+    return [real_axis, imaginary_axis]
+
+def generate_complex_range(complex_range_params, dimension_params, symmetrize=False):
+    real_axis, imaginary_axis = generate_range_axes(complex_range_params, dimension_params,
+                                                    symmetrize)
+
+    real_range = real_axis[dimension_params.x_indexes]
+    imaginary_range = imaginary_axis[dimension_params.y_indexes]
+
+    return ComplexRange(real_range, imaginary_range)
+
+def generate_complex_range_tile(complex_range_params, dimension_params, x_start, x_stop, y_start,
+                                y_stop, symmetrize=False):
+    real_axis, imaginary_axis = generate_range_axes(complex_range_params, dimension_params,
+                                                    symmetrize)
+
+    real_range, imaginary_range = numpy.meshgrid(real_axis[x_start:x_stop],
+                                                 imaginary_axis[y_start:y_stop], indexing="ij")
 
     return ComplexRange(real_range, imaginary_range)
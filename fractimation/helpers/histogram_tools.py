@@ -0,0 +1,62 @@
+"""
+Functions related to Density Histograms
+
+Public Methods :
+  * get_flat_pixel_indexes - Returns the flat pixel index of each point within a complex range
+  * accumulate_histogram - Adds the points within a complex range to a density histogram
+"""
+
+import numpy
+
+def get_flat_pixel_indexes(real_values, imaginary_values, complex_range_params, width, height):
+    """
+    Returns the flat (row-major over width, height) pixel index of the pixel nearest to each point
+      which lands inside the range along with a mask of those points; pixels are assumed to be
+      linearly spaced between the minimum & maximum values of the range
+
+    Parameters :
+      * real_values - Array of the real parts (x coordinates) of the points
+      * imaginary_values - Array of the imaginary parts (y coordinates) of the points
+      * complex_range_params - ComplexRangeParams describing the area covered by the pixels
+      * width - Number of pixels along the real axis
+      * height - Number of pixels along the imaginary axis
+    """
+    real_step = ((complex_range_params.max_real_number - complex_range_params.min_real_number) /
+                 max(width - 1, 1))
+    imaginary_step = ((complex_range_params.max_imaginary_number -
+                       complex_range_params.min_imaginary_number) / max(height - 1, 1))
+    if real_step == 0 or imaginary_step == 0:
+        return [numpy.empty(0, dtype=numpy.intp), numpy.zeros(numpy.shape(real_values), dtype=bool)]
+
+    x_indexes = numpy.rint((real_values - complex_range_params.min_real_number) / real_step)
+    y_indexes = numpy.rint((imaginary_values - complex_range_params.min_imaginary_number) /
+                           imaginary_step)
+
+    valid_points = (x_indexes >= 0) & (x_indexes < width) & (y_indexes >= 0) & (y_indexes < height)
+    flat_indexes = x_indexes[valid_points].astype(numpy.intp) * height
+    flat_indexes += y_indexes[valid_points].astype(numpy.intp)
+    return [flat_indexes, valid_points]
+
+def accumulate_histogram(histogram, real_values, imaginary_values, complex_range_params, width,
+                         height, weights=None):
+    """
+    Adds a hit for every point inside the range to a flat histogram in place; memory use is
+      independent of the total number of points accumulated
+
+    Parameters :
+      * histogram - Flat array of width * height hit counts to update
+      * real_values - Array of the real parts (x coordinates) of the points
+      * imaginary_values - Array of the imaginary parts (y coordinates) of the points
+      * complex_range_params - ComplexRangeParams describing the area covered by the histogram
+      * width - Number of pixels along the real axis of the histogram
+      * height - Number of pixels along the imaginary axis of the histogram
+      * weights (optional) - Array of the weight of each point (default 1 per point)
+    """
+    flat_indexes, valid_points = get_flat_pixel_indexes(real_values, imaginary_values,
+                                                        complex_range_params, width, height)
+    if weights is not None:
+        weights = weights[valid_points]
+
+    hit_counts = numpy.bincount(flat_indexes, weights, minlength=histogram.size)
+    histogram += hit_counts.astype(histogram.dtype, copy=False)
+    return histogram
@@ -0,0 +1,57 @@
+"""
+Functions related to Morton (Z-order) Pixel Ordering; pixels which are close in the image stay
+  close in Morton order, so any contiguous run of the order covers a compact area of the image
+
+Public Methods :
+  * get_morton_codes - Returns the Morton code of each pixel coordinate
+  * get_morton_raster_indexes - Returns the raster flat index of every pixel in Morton order
+"""
+
+import numpy
+
+_MAX_COORDINATE_BITS = 32
+
+# Masks which spread the low 32 bits of a value into the even bits of a 64 bit value
+_SPREAD_STEPS = [(16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF), (4, 0x0F0F0F0F0F0F0F0F),
+                 (2, 0x3333333333333333), (1, 0x5555555555555555)]
+
+def _spread_bits(values):
+    spread_values = numpy.asarray(values, dtype=numpy.uint64) & numpy.uint64(0xFFFFFFFF)
+    for shift, mask in _SPREAD_STEPS:
+        spread_values = (spread_values | (spread_values << numpy.uint64(shift))) & \
+            numpy.uint64(mask)
+
+    return spread_values
+
+def get_morton_codes(x_indexes, y_indexes):
+    """
+    Returns a uint64 array containing the Morton code (the bits of x & y interleaved, x in the
+      lowest bit) of each pixel coordinate
+
+    Parameters :
+      * x_indexes - Array of x pixel coordinates below 2 ** 32
+      * y_indexes - Array of y pixel coordinates below 2 ** 32
+    """
+    return _spread_bits(x_indexes) | (_spread_bits(y_indexes) << numpy.uint64(1))
+
+def get_morton_raster_indexes(width, height):
+    """
+    Returns an array containing the raster flat index (x * height + y) of every pixel of an image,
+      sorted by Morton code; images whose dimensions are not powers of 2 keep the order of the
+      enclosing power of 2 square with the missing pixels skipped
+
+    Parameters :
+      * width - Width of the image
+      * height - Height of the image
+    """
+    if max(width, height) > 2 ** _MAX_COORDINATE_BITS:
+        raise ValueError("Morton order supports dimensions up to 2 ** 32 pixels")
+
+    index_dtype = numpy.int32
+    if width * height > numpy.iinfo(numpy.int32).max:
+        index_dtype = numpy.int64
+
+    raster_indexes = numpy.arange(width * height, dtype=index_dtype)
+    x_indexes, y_indexes = numpy.divmod(raster_indexes, height)
+    morton_codes = get_morton_codes(x_indexes, y_indexes)
+    return raster_indexes[numpy.argsort(morton_codes, kind="stable")]
@@ -0,0 +1,98 @@
+"""
+Functions related to Polar Grids of complex numbers & resampling them into Cartesian images
+
+Public Methods :
+  * generate_polar_axes - Returns the angle & radius axes of a polar grid
+  * generate_polar_complex_range - Returns a ComplexRange containing a band of a polar grid
+  * sample_log_polar_image - Returns a Cartesian image resampled from a log-polar image
+"""
+
+import math
+
+import numpy
+
+from ..data_models.complex_range import ComplexRange
+
+def generate_polar_axes(polar_range_params, angle_count, radius_count):
+    """
+    Returns [angle_axis, radius_axis] of a polar grid; angles cover a full turn without repeating
+      the first angle
+
+    Parameters :
+      * polar_range_params - PolarRangeParams of the grid
+      * angle_count - Number of angles of the grid
+      * radius_count - Number of radii of the grid
+    """
+    angle_axis = numpy.linspace(0, 2 * math.pi, angle_count, endpoint=False)
+    radius_axis = polar_range_params.spacing_func(polar_range_params.min_radius,
+                                                  polar_range_params.max_radius, radius_count)
+
+    return [angle_axis, radius_axis]
+
+def generate_polar_complex_range(polar_range_params, angle_count, radius_count, radius_start=0,
+                                 radius_stop=None):
+    """
+    Returns a ComplexRange of shape (angle_count, radius_stop - radius_start) containing the
+      complex values of a band of radii of a polar grid
+
+    Parameters :
+      * polar_range_params - PolarRangeParams of the grid
+      * angle_count - Number of angles of the grid
+      * radius_count - Number of radii of the grid
+      * radius_start (optional) - Index of the first radius of the band
+      * radius_stop (optional) - Index after the last radius of the band (default is the last
+          radius)
+    """
+    angle_axis, radius_axis = generate_polar_axes(polar_range_params, angle_count, radius_count)
+    angle_range, radius_range = numpy.meshgrid(angle_axis, radius_axis[radius_start:radius_stop],
+                                               indexing="ij")
+
+    real_range = polar_range_params.center_real_number + radius_range * numpy.cos(angle_range)
+    imaginary_range = (polar_range_params.center_imaginary_number +
+                       radius_range * numpy.sin(angle_range))
+    return ComplexRange(real_range, imaginary_range)
+
+def sample_log_polar_image(polar_image, polar_range_params, real_axis, imaginary_axis):
+    """
+    Returns a float array of shape (real_axis size, imaginary_axis size) containing the bilinearly
+      interpolated values of a log-polar image (angles wrap around & radii outside the grid are
+      clamped to the innermost or outermost ring); radii are located on the radius axis generated
+      by the spacing_func of the grid & interpolated logarithmically between rings, so grids with
+      any increasing, positive radii are supported
+
+    Parameters :
+      * polar_image - Array of shape (angle_count, radius_count) sampled on the grid generated by
+          generate_polar_axes
+      * polar_range_params - PolarRangeParams of the polar image
+      * real_axis - Real value of each column of the Cartesian image
+      * imaginary_axis - Imaginary value of each row of the Cartesian image
+    """
+    angle_count, radius_count = numpy.shape(polar_image)
+    real_offsets = numpy.subtract(real_axis, polar_range_params.center_real_number)[:, None]
+    imaginary_offsets = numpy.subtract(imaginary_axis,
+                                       polar_range_params.center_imaginary_number)[None, :]
+
+    angles = numpy.arctan2(imaginary_offsets, real_offsets)
+    angle_positions = numpy.mod(angles, 2 * math.pi) * (angle_count / (2 * math.pi))
+
+    radii = numpy.maximum(numpy.hypot(real_offsets, imaginary_offsets),
+                          polar_range_params.min_radius)
+    radius_axis = generate_polar_axes(polar_range_params, angle_count, radius_count)[1]
+    radius_positions = numpy.interp(numpy.log(radii), numpy.log(radius_axis),
+                                    numpy.arange(radius_count, dtype=float))
+
+    angle_indexes = numpy.floor(angle_positions).astype(numpy.intp)
+    angle_weights = angle_positions - angle_indexes
+    angle_indexes %= angle_count
+    next_angle_indexes = (angle_indexes + 1) % angle_count
+
+    radius_indexes = numpy.minimum(numpy.floor(radius_positions).astype(numpy.intp),
+                                   radius_count - 2 if radius_count > 1 else 0)
+    radius_weights = radius_positions - radius_indexes
+    next_radius_indexes = numpy.minimum(radius_indexes + 1, radius_count - 1)
+
+    inner_values = ((1 - angle_weights) * polar_image[angle_indexes, radius_indexes] +
+                    angle_weights * polar_image[next_angle_indexes, radius_indexes])
+    outer_values = ((1 - angle_weights) * polar_image[angle_indexes, next_radius_indexes] +
+                    angle_weights * polar_image[next_angle_indexes, next_radius_indexes])
+    return (1 - radius_weights) * inner_values + radius_weights * outer_values
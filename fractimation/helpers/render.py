@@ -1,5 +1,6 @@
 """
-Functions related to Matplotlib Rendering
+Functions related to Matplotlib Rendering; Matplotlib is only imported when a builder is called
+  so importing this module stays cheap for processes which never render
 
 Public Methods :
   * build_triangle - Returns a Matplotlib Triangle Patch
@@ -7,13 +8,10 @@ Public Methods :
   * build_square - Returns a Matplotlib Square Patch
   * build_wedge - Returns a Matplotlib Wedge Patch
   * build_patch_collection - Returns a Matplotlib Patch Collection
+  * build_poly_collection - Returns a Matplotlib Poly Collection built from a vertex array
+  * build_line_collection - Returns a Matplotlib Line Collection built from a vertex array
 """
 
-from matplotlib.patches import Polygon
-from matplotlib.patches import Rectangle
-from matplotlib.patches import Wedge
-from matplotlib.collections import PatchCollection
-
 def build_triangle(vertices, line_width, fill=False):
     """
     Returns a Matplotlib Triangle Patch from the provided vertices
@@ -25,6 +23,8 @@ def build_triangle(vertices, line_width, fill=False):
       * line_width - The line width of the edges
       * fill (optional) - Whether or not to fill the triangle
     """
+    from matplotlib.patches import Polygon
+
     new_patch = Polygon(vertices, fill=fill, lineWidth=line_width)
     return new_patch
 
@@ -40,6 +40,8 @@ def build_rectangle(x_coord, y_coord, width, height, line_width, fill=False):
       * line_width - The line width of the edges
       * fill (optional) - Whether or not to fill the rectangle
     """
+    from matplotlib.patches import Rectangle
+
     new_patch = Rectangle((x_coord, y_coord), width, height, fill=fill, linewidth=line_width)
     return new_patch
 
@@ -69,6 +71,8 @@ def build_wedge(x_coord, y_coord, radius, theta1, theta2, wedge_width, fill=Fals
       * theta2 - The angle of the wedge at the end point
       * fill (optional) - Whether or not to fill the wedge
     """
+    from matplotlib.patches import Wedge
+
     new_patch = Wedge([x_coord, y_coord], radius, theta1, theta2, wedge_width, fill=fill)
     return new_patch
 
@@ -80,6 +84,44 @@ def build_patch_collection(patches, visible=False):
       * patches - Array of patches to include in the Patch Collection
       * visible (optional) - Whether or not the Patch Collection is visible
     """
+    from matplotlib.collections import PatchCollection
+
     patch_collection = PatchCollection(patches, True)
     patch_collection.set_visible(visible)
     return patch_collection
+
+def build_poly_collection(vertices, line_width, fill=False, visible=False):
+    """
+    Returns a Matplotlib Poly Collection containing one polygon per shape in vertices
+
+    Parameters :
+      * vertices - A float array of shape (shape_count, vertex_count, 2) describing the vertices of
+          each polygon
+      * line_width - The line width of the edges
+      * fill (optional) - Whether or not to fill the polygons
+      * visible (optional) - Whether or not the Poly Collection is visible
+    """
+    from matplotlib.collections import PolyCollection
+
+    poly_collection = PolyCollection(vertices, closed=True, linewidths=line_width)
+    if not fill:
+        poly_collection.set_facecolor("none")
+        poly_collection.set_edgecolor("black")
+    poly_collection.set_visible(visible)
+    return poly_collection
+
+def build_line_collection(vertices, line_width, visible=False):
+    """
+    Returns a Matplotlib Line Collection containing one polyline per shape in vertices
+
+    Parameters :
+      * vertices - A float array of shape (shape_count, vertex_count, 2) describing the vertices of
+          each polyline
+      * line_width - The line width of the lines
+      * visible (optional) - Whether or not the Line Collection is visible
+    """
+    from matplotlib.collections import LineCollection
+
+    line_collection = LineCollection(vertices, linewidths=line_width, colors="black")
+    line_collection.set_visible(visible)
+    return line_collection
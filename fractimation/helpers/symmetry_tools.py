@@ -0,0 +1,222 @@
+"""
+Functions related to Fractal Symmetry
+
+Public Methods :
+  * find_mirror_indexes - Returns the index of the negated value of each value in an axis
+  * symmetrize_axis - Snaps nearly mirrored values in an axis to exact negations of each other
+  * get_symmetry_source_indexes - Returns the pixel each pixel of a complex polynomial render can
+      copy its escape behavior from
+"""
+
+import numpy
+
+_MIRROR_TOLERANCE_ULPS = 4
+_NO_MIRROR_INDEX = -1
+_MAX_ORBIT_PASSES = 4
+
+def find_mirror_indexes(axis_values, tolerance=0):
+    """
+    Returns an array containing, for each value in axis_values, the index of the value in
+      axis_values which is its negation (or -1 if no such value exists)
+
+    Parameters :
+      * axis_values - A 1 dimensional array of real numbers
+      * tolerance (optional) - Maximum absolute difference allowed between a value and the negation
+          of its mirror (default 0 requires an exact match)
+    """
+    sort_order = numpy.argsort(axis_values, kind="mergesort")
+    sorted_values = axis_values[sort_order]
+    negated_values = -axis_values
+
+    upper_positions = numpy.searchsorted(sorted_values, negated_values)
+    upper_positions = numpy.clip(upper_positions, 0, len(sorted_values) - 1)
+    lower_positions = numpy.clip(upper_positions - 1, 0, len(sorted_values) - 1)
+
+    upper_distance = numpy.abs(sorted_values[upper_positions] - negated_values)
+    lower_distance = numpy.abs(sorted_values[lower_positions] - negated_values)
+    nearest_positions = numpy.where(lower_distance < upper_distance, lower_positions,
+                                    upper_positions)
+    nearest_distance = numpy.minimum(lower_distance, upper_distance)
+
+    mirror_indexes = sort_order[nearest_positions]
+    mirror_indexes[nearest_distance > tolerance] = _NO_MIRROR_INDEX
+    return mirror_indexes
+
+def symmetrize_axis(axis_values):
+    """
+    Returns a copy of axis_values where values which mirror each other within a few units of
+      floating point precision are snapped to exact negations of each other.  Pixel grids produced
+      by spacing functions like numpy.linspace are rarely bit-for-bit symmetric around 0, which
+      would otherwise prevent exact symmetric rendering.
+
+    Parameters :
+      * axis_values - A 1 dimensional array of real numbers
+    """
+    axis_values = numpy.array(axis_values, dtype=float)
+    if axis_values.size < 1:
+        return axis_values
+
+    tolerance = _MIRROR_TOLERANCE_ULPS * numpy.spacing(numpy.max(numpy.abs(axis_values)))
+    mirror_indexes = find_mirror_indexes(axis_values, tolerance)
+
+    axis_indexes = numpy.arange(axis_values.size)
+    self_mirrors = mirror_indexes == axis_indexes
+    axis_values[self_mirrors] = 0.0
+
+    # The lower index of each mirrored pair is the value which is kept
+    snapped_indexes = (mirror_indexes > axis_indexes) & ~self_mirrors
+    axis_values[mirror_indexes[snapped_indexes]] = -axis_values[snapped_indexes]
+    return axis_values
+
+def _get_axis_mirror_indexes(axes):
+    """
+    Returns the combined mirror indexes of axes which must all be mirrored at the same time,
+      None if the axes impose no constraint or False if the axes cannot be mirrored together
+
+    Parameters :
+      * axes - An array of 1 dimensional axis arrays of the same size
+    """
+    combined_indexes = None
+    for axis_values in axes:
+        if numpy.all(axis_values == 0):
+            continue
+
+        mirror_indexes = find_mirror_indexes(axis_values)
+        if combined_indexes is None:
+            combined_indexes = mirror_indexes
+        else:
+            combined_indexes = numpy.where(combined_indexes == mirror_indexes, combined_indexes,
+                                           _NO_MIRROR_INDEX)
+
+    return combined_indexes
+
+def _is_constant(values):
+    """
+    Returns whether or not all of the values in an array are identical
+
+    Parameters :
+      * values - Array of values to check
+    """
+    return values.size < 1 or numpy.all(values == values.flat[0])
+
+def _build_pixel_partners(x_mirror_indexes, y_mirror_indexes, shape):
+    """
+    Returns the flat index of the partner of each pixel given the mirror indexes of both axes
+
+    Parameters :
+      * x_mirror_indexes - Mirror indexes for the first axis (None to keep the same index)
+      * y_mirror_indexes - Mirror indexes for the second axis (None to keep the same index)
+      * shape - The shape of the pixel grid
+    """
+    x_indexes, y_indexes = numpy.indices(shape)
+    if x_mirror_indexes is not None:
+        x_indexes = x_mirror_indexes[x_indexes]
+    if y_mirror_indexes is not None:
+        y_indexes = y_mirror_indexes[y_indexes]
+
+    valid_partners = (x_indexes != _NO_MIRROR_INDEX) & (y_indexes != _NO_MIRROR_INDEX)
+    partner_indexes = numpy.full(shape, _NO_MIRROR_INDEX, dtype=numpy.intp)
+    partner_indexes[valid_partners] = numpy.ravel_multi_index(
+        (x_indexes[valid_partners], y_indexes[valid_partners]), shape)
+    return partner_indexes.ravel()
+
+def _verify_pixel_partners(partner_indexes, z_values_range, c_values_range, z_sign, c_sign,
+                           z_imaginary_sign, c_imaginary_sign):
+    """
+    Removes partners whose complex values are not the expected exact transformation of the
+      original pixel's complex values
+
+    Parameters :
+      * partner_indexes - Flat partner index of each pixel (-1 for none)
+      * z_values_range - ComplexRange of the z values
+      * c_values_range - ComplexRange of the c values
+      * z_sign - Expected sign of the partner's real z value relative to the pixel's real z value
+      * c_sign - Expected sign of the partner's real c value relative to the pixel's real c value
+      * z_imaginary_sign - Expected sign of the partner's imaginary z value
+      * c_imaginary_sign - Expected sign of the partner's imaginary c value
+    """
+    valid_partners = numpy.flatnonzero(partner_indexes != _NO_MIRROR_INDEX)
+    partners = partner_indexes[valid_partners]
+
+    expected_values = [(z_values_range.real_number_values, z_sign),
+                       (z_values_range.imaginary_number_values, z_imaginary_sign),
+                       (c_values_range.real_number_values, c_sign),
+                       (c_values_range.imaginary_number_values, c_imaginary_sign)]
+    matches = numpy.ones(valid_partners.size, dtype=bool)
+    for values, sign in expected_values:
+        flat_values = values.ravel()
+        matches &= flat_values[partners] == sign * flat_values[valid_partners]
+
+    partner_indexes[valid_partners[~matches]] = _NO_MIRROR_INDEX
+    return partner_indexes
+
+def get_symmetry_source_indexes(z_values_range, c_values_range, coefficient_array):
+    """
+    Returns an array containing the flat index of the pixel which each pixel can copy its escape
+      behavior from, or None if the render contains no exploitable symmetry.  Pixels which must be
+      computed are their own source.
+
+    Supported Symmetries :
+      * Conjugate (mirror around the real axis) - Polynomials with real coefficients where the z &
+          c values of mirrored pixels are exact conjugates (ie. Multibrot)
+      * Point (rotation by 180 degrees around the origin) - Polynomials whose z exponents are all
+          even where c is constant and the z values of mirrored pixels are exact negations
+          (ie. Multijulia with an even power)
+
+    Parameters :
+      * z_values_range - ComplexRange of the z values; must be a separable 2 dimensional grid
+      * c_values_range - ComplexRange of the c values; must be a separable 2 dimensional grid
+      * coefficient_array - An array describing a Polynomial Formula in exponential order
+    """
+    z_real_values = z_values_range.real_number_values
+    if numpy.ndim(z_real_values) != 2 or numpy.shape(c_values_range.real_number_values) != \
+            numpy.shape(z_real_values):
+        return None
+
+    shape = z_real_values.shape
+    z_real_axis = z_values_range.real_number_values[:, 0]
+    z_imaginary_axis = z_values_range.imaginary_number_values[0, :]
+    c_real_axis = c_values_range.real_number_values[:, 0]
+    c_imaginary_axis = c_values_range.imaginary_number_values[0, :]
+
+    coefficient_array = numpy.asarray(coefficient_array)
+    pixel_partners = []
+
+    if not numpy.iscomplexobj(coefficient_array) or numpy.all(coefficient_array.imag == 0):
+        y_mirror_indexes = _get_axis_mirror_indexes([z_imaginary_axis, c_imaginary_axis])
+        if y_mirror_indexes is not None:
+            partner_indexes = _build_pixel_partners(None, y_mirror_indexes, shape)
+            pixel_partners.append(_verify_pixel_partners(partner_indexes, z_values_range,
+                                                         c_values_range, 1, 1, -1, -1))
+
+    odd_coefficients = coefficient_array[1::2]
+    if (numpy.all(odd_coefficients == 0) and _is_constant(c_real_axis) and
+            _is_constant(c_imaginary_axis)):
+        x_mirror_indexes = _get_axis_mirror_indexes([z_real_axis])
+        y_mirror_indexes = _get_axis_mirror_indexes([z_imaginary_axis])
+        if x_mirror_indexes is not None or y_mirror_indexes is not None:
+            partner_indexes = _build_pixel_partners(x_mirror_indexes, y_mirror_indexes, shape)
+            pixel_partners.append(_verify_pixel_partners(partner_indexes, z_values_range,
+                                                         c_values_range, -1, 1, -1, 1))
+
+    if not pixel_partners:
+        return None
+
+    # Each pixel copies from the lowest pixel index within its symmetry orbit
+    source_indexes = numpy.arange(z_real_values.size)
+    for pass_counter in range(0, _MAX_ORBIT_PASSES):
+        previous_indexes = numpy.copy(source_indexes)
+        for partner_indexes in pixel_partners:
+            valid_partners = partner_indexes != _NO_MIRROR_INDEX
+            source_indexes[valid_partners] = numpy.minimum(
+                source_indexes[valid_partners],
+                source_indexes[partner_indexes[valid_partners]])
+        if numpy.array_equal(previous_indexes, source_indexes):
+            break
+
+    # Sources of sources are resolved so every pixel points directly at a computed pixel
+    source_indexes = source_indexes[source_indexes]
+    if numpy.all(source_indexes == numpy.arange(source_indexes.size)):
+        return None
+
+    return source_indexes
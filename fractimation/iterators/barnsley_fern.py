@@ -0,0 +1,33 @@
+from .chaos_game import ChaosGame
+from ..data_models.ifs_params import IfsParams
+from ..data_models.complex_range_params import ComplexRangeParams
+
+_DEFAULT_BATCH_SIZE = 100000
+_DEFAULT_STEPS_PER_ITERATION = 10
+_FRACTAL_NAME = "Barnsley Fern"
+_TRANSFORM_MATRICES = [[[0.0, 0.0], [0.0, 0.16]],
+                       [[0.85, 0.04], [-0.04, 0.85]],
+                       [[0.2, -0.26], [0.23, 0.22]],
+                       [[-0.15, 0.28], [0.26, 0.24]]]
+_TRANSFORM_OFFSETS = [[0.0, 0.0], [0.0, 1.6], [0.0, 1.6], [0.0, 0.44]]
+_PROBABILITIES = [0.01, 0.85, 0.07, 0.07]
+
+# The imaginary range runs from top to bottom so the fern is upright with an upper image origin
+_DEFAULT_VIEW_RANGE_PARAMS = ComplexRangeParams(-2.75, 2.75, 10.5, -0.5)
+
+class BarnsleyFern(ChaosGame):
+
+    def __init__(self, dimension_params, view_range_params=None,
+                 batch_size=_DEFAULT_BATCH_SIZE,
+                 steps_per_iteration=_DEFAULT_STEPS_PER_ITERATION, seed=None,
+                 max_iterations=None):
+        if view_range_params is None:
+            view_range_params = _DEFAULT_VIEW_RANGE_PARAMS
+
+        ifs_params = IfsParams(_TRANSFORM_MATRICES, _TRANSFORM_OFFSETS, _PROBABILITIES)
+
+        super().__init__(view_range_params, dimension_params, ifs_params, batch_size,
+                         steps_per_iteration, seed, max_iterations)
+
+    def get_fractal_name(self):
+        return _FRACTAL_NAME
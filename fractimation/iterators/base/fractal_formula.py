@@ -1,9 +1,21 @@
 from abc import ABC, abstractclassmethod
+from collections import deque
 from collections.abc import Iterable, Iterator
 
 import numpy
 
+from ...data_models.complex_polynomial_iteration_data import ComplexPolynomialIterationData
+from ...data_models.escape_index_iteration_data import EscapeIndexIterationData
 from ...helpers.formula_tools import generate_complex_range
+from ...helpers.list_tools import remove_indexes
+
+# Attributes which describe the progress of an iterator; everything else is derived from the
+#   iterable which created the iterator
+_STATE_ATTRIBUTES = ["_next_iteration", "_z_values", "_c_values", "_pixel_shape",
+                     "_source_indexes", "_source_positions", "_unique_pixel_indexes",
+                     "_survivor_source_indexes", "_survivor_pixel_indexes", "_escape_index_output",
+                     "_pixel_indexes", "_iteration_budget", "_pixel_count",
+                     "_remaining_pixel_count"]
 
 class FractalFormulaIterable(Iterable, ABC):
     
@@ -16,6 +28,11 @@ class FractalFormulaIterable(Iterable, ABC):
     _z_values_range = None
     _c_values_range = None
 
+    _escape_index_output = False
+    _escape_value_output = False
+    _iteration_budget_params = None
+    _exploit_symmetry = False
+
     def __init__(self, z_values_range_params, c_values_range_params, dimension_params,
                  formula_params, max_iterations=None):
         self.initialize(z_values_range_params, c_values_range_params, dimension_params,
@@ -23,8 +40,15 @@ class FractalFormulaIterable(Iterable, ABC):
 
     def initialize(self, z_values_range_params, c_values_range_params, dimension_params,
                    formula_params, max_iterations=None):
-        self._z_values_range = generate_complex_range(z_values_range_params, dimension_params)
-        self._c_values_range = generate_complex_range(c_values_range_params, dimension_params)
+        # Without index grids the ranges are only generated in bands (ie. by OutOfCoreRenderer)
+        if dimension_params.x_indexes is not None:
+            self._z_values_range = generate_complex_range(z_values_range_params, dimension_params,
+                                                          self._exploit_symmetry)
+            self._c_values_range = generate_complex_range(c_values_range_params, dimension_params,
+                                                          self._exploit_symmetry)
+        else:
+            self._z_values_range = None
+            self._c_values_range = None
 
         self._z_values_range_params = z_values_range_params
         self._c_values_range_params = c_values_range_params
@@ -32,9 +56,20 @@ class FractalFormulaIterable(Iterable, ABC):
         self._formula_params = formula_params
         self._max_iterations = max_iterations
 
+    def __getstate__(self):
+        # Generated ranges can be rebuilt from the range parameters, so they are left out when the
+        #   iterable is pickled (ie. when sending it to tile render workers)
+        state = self.__dict__.copy()
+        state.pop("_z_values_range", None)
+        state.pop("_c_values_range", None)
+        return state
+
     def get_max_iterations(self):
         return self._max_iterations
 
+    def set_max_iterations(self, max_iterations):
+        self._max_iterations = max_iterations
+
     def get_z_values_range_params(self):
         return self._z_values_range_params
 
@@ -53,6 +88,78 @@ class FractalFormulaIterable(Iterable, ABC):
     def get_formula_params(self):
         return self._formula_params
 
+    def get_exploit_symmetry(self):
+        return self._exploit_symmetry
+
+    def get_escape_index_output(self):
+        return self._escape_index_output
+
+    def get_escape_value_output(self):
+        return self._escape_value_output
+
+    def set_escape_index_output(self, escape_index_output, escape_value_output=False):
+        """
+        Selects the lean output mode for iterators created after this call
+
+        Parameters :
+          * escape_index_output - Whether iterators yield EscapeIndexIterationData containing only
+              the flat pixel indexes which escaped instead of ComplexPolynomialIterationData
+          * escape_value_output (optional) - Whether the escape magnitudes of escaped pixels are
+              included in the EscapeIndexIterationData
+        """
+        self._escape_index_output = escape_index_output
+        self._escape_value_output = escape_index_output and escape_value_output
+
+    def get_iteration_budget_params(self):
+        return self._iteration_budget_params
+
+    def set_iteration_budget_params(self, iteration_budget_params):
+        """
+        Selects the adaptive iteration budget for iterators created after this call
+
+        Parameters :
+          * iteration_budget_params - IterationBudgetParams used to pick the initial budget from the
+              zoom depth of the view and to extend or stop iterating based on the escape rate
+              (None iterates until max_iterations)
+        """
+        self._iteration_budget_params = iteration_budget_params
+
+    def get_view_range_params(self):
+        """
+        Returns the ComplexRangeParams which span the pixels of the view (the c values unless
+          they are a single constant value)
+        """
+        c_values_range_params = self._c_values_range_params
+        if (c_values_range_params.min_real_number == c_values_range_params.max_real_number and
+                c_values_range_params.min_imaginary_number ==
+                c_values_range_params.max_imaginary_number):
+            return self._z_values_range_params
+
+        return c_values_range_params
+
+    def create_iterator(self, z_values_range, c_values_range):
+        """
+        Returns an iterator evaluating the formula over arbitrary ranges of z & c values (ie. sub
+          pixel samples) using the output mode & iteration budget of this iterable
+
+        Parameters :
+          * z_values_range - ComplexRange of the z values
+          * c_values_range - ComplexRange of the c values in the same shape as z_values_range
+        """
+        raise NotImplementedError()
+
+    def _configure_iterator(self, fractal_iterator):
+        if self._escape_index_output:
+            fractal_iterator.enable_escape_index_output(self._escape_value_output)
+
+        iteration_budget_params = self._iteration_budget_params
+        if iteration_budget_params is not None:
+            initial_budget = iteration_budget_params.get_initial_budget(
+                self.get_view_range_params())
+            fractal_iterator.enable_adaptive_budget(iteration_budget_params, initial_budget)
+
+        return fractal_iterator
+
     @abstractclassmethod
     def get_fractal_name(self):
         raise NotImplementedError()
@@ -68,7 +175,25 @@ class FractalFormulaIterator(Iterator, ABC):
     _z_values = None
     _c_values = None
 
-    def __init__(self, z_values_range, c_values_range, max_iterations=None):
+    _pixel_shape = None
+    _source_indexes = None
+    _source_positions = None
+    _unique_pixel_indexes = None
+    _survivor_source_indexes = None
+    _survivor_pixel_indexes = None
+
+    _escape_index_output = False
+    _pixel_indexes = None
+    _escaped_index_buffer = None
+    _escape_value_buffer = None
+
+    _iteration_budget_params = None
+    _iteration_budget = None
+    _pixel_count = None
+    _remaining_pixel_count = None
+    _escape_counts = None
+
+    def __init__(self, z_values_range, c_values_range, max_iterations=None, source_indexes=None):
         z_values = numpy.multiply(numpy.complex(0, 1), z_values_range.imaginary_number_values)
         z_values = numpy.add(z_values, z_values_range.real_number_values)
 
@@ -80,13 +205,240 @@ class FractalFormulaIterator(Iterator, ABC):
         self._z_values = z_values
         self._c_values = c_values
 
+        if source_indexes is not None:
+            self._initialize_symmetry(source_indexes)
+
+    def _initialize_symmetry(self, source_indexes):
+        self._pixel_shape = self._z_values.shape
+        self._source_indexes = source_indexes
+
+        pixel_indexes = numpy.arange(source_indexes.size)
+        unique_pixel_indexes = numpy.flatnonzero(source_indexes == pixel_indexes)
+        self._unique_pixel_indexes = unique_pixel_indexes
+        self._survivor_source_indexes = source_indexes
+        self._source_positions = numpy.zeros(source_indexes.size, dtype=numpy.intp)
+
+        self._z_values = self._z_values.ravel()[unique_pixel_indexes]
+        self._c_values = self._c_values.ravel()[unique_pixel_indexes]
+
+    def enable_escape_index_output(self, escape_value_output=False):
+        """
+        Switches the iterator to yield EscapeIndexIterationData; must be called before the first
+          iteration
+
+        Parameters :
+          * escape_value_output (optional) - Whether to include the escape magnitudes
+        """
+        if self._source_indexes is None:
+            pixel_count = self._z_values.size
+        else:
+            pixel_count = self._source_indexes.size
+
+        index_dtype = numpy.int32
+        if pixel_count > numpy.iinfo(numpy.int32).max:
+            index_dtype = numpy.int64
+
+        pixel_indexes = numpy.arange(pixel_count, dtype=index_dtype)
+        if self._source_indexes is None:
+            self._pixel_indexes = pixel_indexes
+        else:
+            self._survivor_pixel_indexes = pixel_indexes
+
+        self._escape_index_output = True
+        self._allocate_escape_buffers(pixel_count, index_dtype, escape_value_output)
+
+    def _allocate_escape_buffers(self, pixel_count, index_dtype, escape_value_output):
+        self._escaped_index_buffer = numpy.empty(pixel_count, dtype=index_dtype)
+        if escape_value_output:
+            self._escape_value_buffer = numpy.empty(pixel_count, dtype=float)
+
+    def enable_adaptive_budget(self, iteration_budget_params, initial_budget):
+        """
+        Stops the iterator once its iteration budget is used up unless pixels escaped at a
+          meaningful rate over the trailing window, in which case the budget is extended; must be
+          called before the first iteration
+
+        Parameters :
+          * iteration_budget_params - IterationBudgetParams controlling the budget
+          * initial_budget - Number of iterations before the escape rate is first checked
+        """
+        self._iteration_budget_params = iteration_budget_params
+        self._iteration_budget = initial_budget
+        self._pixel_count = self._get_remaining_pixel_count()
+        self._remaining_pixel_count = self._pixel_count
+        self._escape_counts = deque(maxlen=iteration_budget_params.window_size)
+
+    def get_iteration_budget(self):
+        return self._iteration_budget
+
+    def get_max_iterations(self):
+        return self._max_iterations
+
+    def set_max_iterations(self, max_iterations):
+        self._max_iterations = max_iterations
+
+    def get_state(self):
+        """
+        Returns a dictionary of the arrays & values needed to resume iterating from the current
+          iteration (attributes which are None are left out)
+        """
+        state = dict()
+        for attribute_name in _STATE_ATTRIBUTES:
+            attribute_value = getattr(self, attribute_name)
+            if attribute_value is not None:
+                state[attribute_name.lstrip("_")] = attribute_value
+
+        if self._escape_counts is not None:
+            state["escape_counts"] = numpy.array(self._escape_counts, dtype=int)
+        if self._escaped_index_buffer is not None:
+            state["escape_buffer_size"] = self._escaped_index_buffer.size
+            state["escape_value_output"] = self._escape_value_buffer is not None
+
+        return state
+
+    def restore_state(self, state):
+        """
+        Resumes iterating from a state returned by get_state; the iterator must have been created
+          by an iterable with the same parameters & output mode as the iterator which produced the
+          state
+
+        Parameters :
+          * state - Dictionary returned by get_state
+        """
+        for attribute_name in _STATE_ATTRIBUTES:
+            setattr(self, attribute_name, state.get(attribute_name.lstrip("_")))
+
+        if self._pixel_shape is not None:
+            self._pixel_shape = tuple(self._pixel_shape)
+
+        if self._iteration_budget_params is not None:
+            self._escape_counts = deque(state.get("escape_counts", []),
+                                        maxlen=self._iteration_budget_params.window_size)
+
+        if "escape_buffer_size" in state:
+            pixel_indexes = self._pixel_indexes
+            if pixel_indexes is None:
+                pixel_indexes = self._survivor_pixel_indexes
+            self._allocate_escape_buffers(state["escape_buffer_size"], pixel_indexes.dtype,
+                                          state["escape_value_output"])
+
     def get_z_values(self):
         return self._z_values
 
     def get_c_values(self):
         return self._c_values
 
+    def _complete_iteration(cls, z_values_new, iteration_values, exploded_indexes,
+                            escape_values=None):
+        remaining_indexes = ~exploded_indexes
+
+        if cls._source_indexes is not None:
+            iteration_data = cls._expand_symmetry(iteration_values, exploded_indexes,
+                                                  remaining_indexes, escape_values)
+        elif cls._escape_index_output:
+            iteration_data = cls._build_escape_index_data(cls._pixel_indexes, exploded_indexes,
+                                                          escape_values)
+            cls._pixel_indexes = cls._pixel_indexes[remaining_indexes.ravel()]
+        else:
+            iteration_data = ComplexPolynomialIterationData(iteration_values, exploded_indexes,
+                                                            remaining_indexes)
+
+        reduced_arrays = remove_indexes([z_values_new, cls._c_values], remaining_indexes)
+        cls._z_values, cls._c_values = reduced_arrays
+
+        if cls._escape_counts is not None:
+            remaining_pixel_count = cls._get_remaining_pixel_count()
+            cls._escape_counts.append(cls._remaining_pixel_count - remaining_pixel_count)
+            cls._remaining_pixel_count = remaining_pixel_count
+
+        cls._next_iteration += 1
+        return iteration_data
+
+    def _get_remaining_pixel_count(cls):
+        if cls._source_indexes is not None:
+            return cls._survivor_source_indexes.size
+
+        return cls._z_values.size
+
+    def _check_iteration_budget(cls):
+        # Nothing is left to change once every pixel has escaped
+        if cls._remaining_pixel_count < 1:
+            raise StopIteration
+
+        if cls._next_iteration < cls._iteration_budget:
+            return
+
+        iteration_budget_params = cls._iteration_budget_params
+        escape_counts = cls._escape_counts
+        escape_rate = 0.0
+        if len(escape_counts) > 0:
+            escape_rate = sum(escape_counts) / (len(escape_counts) * cls._pixel_count)
+
+        if (escape_rate < iteration_budget_params.min_escape_rate or
+                cls._iteration_budget >= iteration_budget_params.max_iterations):
+            raise StopIteration
+
+        cls._iteration_budget = min(cls._iteration_budget +
+                                    iteration_budget_params.extension_iterations,
+                                    iteration_budget_params.max_iterations)
+
+    def _build_escape_index_data(cls, pixel_indexes, exploded_indexes, escape_values,
+                                 value_positions=None):
+        exploded_indexes = exploded_indexes.ravel()
+        escaped_count = numpy.count_nonzero(exploded_indexes)
+
+        escaped_pixel_indexes = cls._escaped_index_buffer[:escaped_count]
+        numpy.compress(exploded_indexes, pixel_indexes, out=escaped_pixel_indexes)
+
+        escaped_values = None
+        if cls._escape_value_buffer is not None and escape_values is not None:
+            escaped_values = cls._escape_value_buffer[:escaped_count]
+            escape_values = escape_values.ravel()
+            if value_positions is None:
+                numpy.compress(exploded_indexes, escape_values, out=escaped_values)
+            else:
+                escaped_positions = value_positions[exploded_indexes]
+                numpy.take(escape_values, escaped_positions, out=escaped_values)
+
+        return EscapeIndexIterationData(escaped_pixel_indexes, escaped_values)
+
+    def _expand_symmetry(cls, iteration_values, exploded_indexes, remaining_indexes,
+                         escape_values):
+        # Map every surviving pixel to the position of its source pixel in the computed arrays
+        source_positions = cls._source_positions
+        source_positions[cls._unique_pixel_indexes] = numpy.arange(cls._unique_pixel_indexes.size)
+        survivor_positions = source_positions[cls._survivor_source_indexes]
+
+        full_exploded_indexes = exploded_indexes.ravel()[survivor_positions]
+        full_remaining_indexes = ~full_exploded_indexes
+
+        if cls._escape_index_output:
+            iteration_data = cls._build_escape_index_data(cls._survivor_pixel_indexes,
+                                                          full_exploded_indexes, escape_values,
+                                                          survivor_positions)
+            cls._survivor_pixel_indexes = cls._survivor_pixel_indexes[full_remaining_indexes]
+        else:
+            full_iteration_values = iteration_values.ravel()[survivor_positions]
+
+            # The first iteration is reported in the shape of the original pixel grid
+            if cls._next_iteration == 0:
+                full_iteration_values = full_iteration_values.reshape(cls._pixel_shape)
+                full_exploded_indexes = full_exploded_indexes.reshape(cls._pixel_shape)
+                full_remaining_indexes = full_remaining_indexes.reshape(cls._pixel_shape)
+
+            iteration_data = ComplexPolynomialIterationData(full_iteration_values,
+                                                            full_exploded_indexes,
+                                                            full_remaining_indexes)
+
+        cls._unique_pixel_indexes = cls._unique_pixel_indexes[remaining_indexes]
+        cls._survivor_source_indexes = cls._survivor_source_indexes[
+            full_remaining_indexes.ravel()]
+        return iteration_data
+
     def __next__(cls):
         max_iterations = cls._max_iterations
         if max_iterations is not None and cls._next_iteration >= max_iterations:
             raise StopIteration
+
+        if cls._iteration_budget_params is not None:
+            cls._check_iteration_budget()
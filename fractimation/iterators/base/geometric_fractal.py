@@ -0,0 +1,45 @@
+from abc import ABC, abstractclassmethod
+from collections.abc import Iterable, Iterator
+
+class GeometricFractalIterable(Iterable, ABC):
+
+    _max_iterations = None
+
+    def __init__(self, max_iterations=None):
+        self.initialize(max_iterations)
+
+    def initialize(self, max_iterations=None):
+        self._max_iterations = max_iterations
+
+    def get_max_iterations(self):
+        return self._max_iterations
+
+    @abstractclassmethod
+    def get_fractal_name(self):
+        raise NotImplementedError()
+
+    @abstractclassmethod
+    def get_cumulative(self):
+        """
+        Returns whether each iteration adds to the shapes of the previous iterations (True) or
+          replaces them (False)
+        """
+        raise NotImplementedError()
+
+    @abstractclassmethod
+    def __iter__(cls):
+        raise NotImplementedError()
+
+class GeometricFractalIterator(Iterator, ABC):
+
+    _max_iterations = None
+    _next_iteration = None
+
+    def __init__(self, max_iterations=None):
+        self._max_iterations = max_iterations
+        self._next_iteration = 0
+
+    def __next__(cls):
+        max_iterations = cls._max_iterations
+        if max_iterations is not None and cls._next_iteration >= max_iterations:
+            raise StopIteration
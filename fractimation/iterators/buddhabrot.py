@@ -0,0 +1,376 @@
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
+
+from .multibrot import Multibrot
+from ..data_models.complex_range_params import ComplexRangeParams
+from ..data_models.density_iteration_data import DensityIterationData
+from ..helpers.fractal_algorithm import evaluate_polynomial_1d
+from ..helpers.histogram_tools import get_flat_pixel_indexes
+
+_MANDELBROT_POWER = 2
+_FRACTAL_NAME = "Buddhabrot"
+_DEFAULT_ORBIT_ITERATIONS = 1000
+_DEFAULT_MIN_ORBIT_ITERATIONS = 20
+_DEFAULT_BATCH_SIZE = 200000
+_DEFAULT_SAMPLE_RANGE_PARAMS = ComplexRangeParams(-2.0, 2.0, -2.0, 2.0)
+
+_IMPORTANCE_MAP_RESOLUTION = 256
+_IMPORTANCE_FLOOR = 0.02
+_ORBIT_BUFFER_SIZE = 4000000
+
+def _is_mandelbrot_interior(c_values):
+    """
+    Returns a mask of the c values inside the main cardioid or the period 2 bulb of the Mandelbrot
+      Set; these values never escape so their orbits never need to be computed
+
+    Parameters :
+      * c_values - Array of c values to test
+    """
+    real_values = c_values.real
+    imaginary_squared = c_values.imag**2
+
+    shifted_real = real_values - 0.25
+    cardioid_q = shifted_real**2 + imaginary_squared
+    in_cardioid = cardioid_q * (cardioid_q + shifted_real) <= imaginary_squared * 0.25
+    in_bulb = (real_values + 1.0)**2 + imaginary_squared <= 0.0625
+    return in_cardioid | in_bulb
+
+def _is_mandelbrot_formula(coefficient_array):
+    """
+    Returns whether or not the coefficient array describes the Mandelbrot Formula (z = z^2 + c)
+
+    Parameters :
+      * coefficient_array - An array describing a Polynomial Formula in exponential order
+    """
+    return numpy.array_equal(coefficient_array, [1, 0, 1])
+
+def compute_escape_iterations(coefficient_array, escape_value, c_values, orbit_iterations):
+    """
+    Returns an array containing the iteration each c value escaped on (0 if it did not escape
+      within orbit_iterations) starting from z = 0
+
+    Parameters :
+      * coefficient_array - An array describing a Polynomial Formula in exponential order
+      * escape_value - Threshold value which determines when a z value has escaped
+      * c_values - Array of c values
+      * orbit_iterations - Maximum number of iterations to evaluate
+    """
+    escape_iterations = numpy.zeros(len(c_values), dtype=numpy.int32)
+    remaining_indexes = numpy.arange(len(c_values))
+    if _is_mandelbrot_formula(coefficient_array):
+        remaining_indexes = remaining_indexes[~_is_mandelbrot_interior(c_values)]
+
+    c_values = c_values[remaining_indexes]
+    z_values = numpy.zeros(len(c_values), dtype=complex)
+    for iteration_counter in range(1, orbit_iterations + 1):
+        if len(z_values) < 1:
+            break
+
+        z_values = evaluate_polynomial_1d(coefficient_array, z_values, c_values)
+        exploded_indexes = numpy.abs(z_values) > escape_value
+        escape_iterations[remaining_indexes[exploded_indexes]] = iteration_counter
+
+        remaining = ~exploded_indexes
+        remaining_indexes = remaining_indexes[remaining]
+        z_values = z_values[remaining]
+        c_values = c_values[remaining]
+
+    return escape_iterations
+
+def build_importance_map(coefficient_array, escape_value, sample_range_params, orbit_iterations,
+                         min_orbit_iterations, resolution=_IMPORTANCE_MAP_RESOLUTION):
+    """
+    Returns an array of shape (resolution, resolution) containing the relative sampling weight of
+      each cell of the sample range.  Cells containing long escaping orbits or lying on the
+      boundary between escaping & bounded cells get full weight; every other cell keeps a small
+      weight so that the weighted estimate stays unbiased.
+
+    Parameters :
+      * coefficient_array - An array describing a Polynomial Formula in exponential order
+      * escape_value - Threshold value which determines when a z value has escaped
+      * sample_range_params - ComplexRangeParams describing the area c values are sampled from
+      * orbit_iterations - Maximum number of iterations to evaluate
+      * min_orbit_iterations - Minimum number of iterations of an orbit which is accumulated
+      * resolution (optional) - Number of cells along each axis of the map
+    """
+    real_values = numpy.linspace(sample_range_params.min_real_number,
+                                 sample_range_params.max_real_number, resolution + 1)
+    imaginary_values = numpy.linspace(sample_range_params.min_imaginary_number,
+                                      sample_range_params.max_imaginary_number, resolution + 1)
+    real_centers = (real_values[:-1] + real_values[1:]) / 2.0
+    imaginary_centers = (imaginary_values[:-1] + imaginary_values[1:]) / 2.0
+    c_values = real_centers[:, numpy.newaxis] + 1j * imaginary_centers[numpy.newaxis, :]
+
+    escape_iterations = compute_escape_iterations(coefficient_array, escape_value,
+                                                  c_values.ravel(), orbit_iterations)
+    escape_iterations = escape_iterations.reshape(resolution, resolution)
+
+    bounded_cells = escape_iterations == 0
+    boundary_cells = numpy.zeros_like(bounded_cells)
+    boundary_cells[1:, :] |= bounded_cells[1:, :] != bounded_cells[:-1, :]
+    boundary_cells[:-1, :] |= bounded_cells[1:, :] != bounded_cells[:-1, :]
+    boundary_cells[:, 1:] |= bounded_cells[:, 1:] != bounded_cells[:, :-1]
+    boundary_cells[:, :-1] |= bounded_cells[:, 1:] != bounded_cells[:, :-1]
+
+    important_cells = boundary_cells | (escape_iterations >= min_orbit_iterations)
+    return numpy.where(important_cells, 1.0, _IMPORTANCE_FLOOR)
+
+def _sample_c_values(random_generator, sample_count, sample_range_params, importance_map):
+    """
+    Returns randomly sampled c values along with the weight of each sample relative to uniform
+      sampling of the sample range
+
+    Parameters :
+      * random_generator - numpy.random.Generator used for sampling
+      * sample_count - Number of c values to sample
+      * sample_range_params - ComplexRangeParams describing the area c values are sampled from
+      * importance_map - Array of relative sampling weights per cell (None for uniform sampling)
+    """
+    min_real = sample_range_params.min_real_number
+    real_width = sample_range_params.max_real_number - min_real
+    min_imaginary = sample_range_params.min_imaginary_number
+    imaginary_height = sample_range_params.max_imaginary_number - min_imaginary
+
+    if importance_map is None:
+        real_values = min_real + random_generator.random(sample_count) * real_width
+        imaginary_values = min_imaginary + random_generator.random(sample_count) * imaginary_height
+        return [real_values + 1j * imaginary_values, None]
+
+    cell_probabilities = importance_map.ravel() / numpy.sum(importance_map)
+    cells = random_generator.choice(cell_probabilities.size, sample_count, p=cell_probabilities)
+    cell_x_indexes, cell_y_indexes = numpy.divmod(cells, importance_map.shape[1])
+
+    real_values = (cell_x_indexes + random_generator.random(sample_count))
+    real_values = min_real + real_values * (real_width / importance_map.shape[0])
+    imaginary_values = (cell_y_indexes + random_generator.random(sample_count))
+    imaginary_values = min_imaginary + imaginary_values * (imaginary_height /
+                                                           importance_map.shape[1])
+
+    sample_weights = 1.0 / (cell_probabilities[cells] * cell_probabilities.size)
+    return [real_values + 1j * imaginary_values, sample_weights]
+
+def accumulate_orbit_histogram(coefficient_array, escape_value, sample_range_params,
+                               view_range_params, width, height, sample_count, orbit_iterations,
+                               min_orbit_iterations, importance_map=None, seed=None):
+    """
+    Samples c values, finds the escaping ones and replays only their orbits into a flat density
+      histogram which is returned.  Memory use is bounded by sample_count and the orbit buffer
+      size regardless of orbit lengths, which allows the function to run in worker processes whose
+      histograms are merged by summing them.
+
+    Parameters :
+      * coefficient_array - An array describing a Polynomial Formula in exponential order
+      * escape_value - Threshold value which determines when a z value has escaped
+      * sample_range_params - ComplexRangeParams describing the area c values are sampled from
+      * view_range_params - ComplexRangeParams describing the area covered by the histogram
+      * width - Number of pixels along the real axis of the histogram
+      * height - Number of pixels along the imaginary axis of the histogram
+      * sample_count - Number of c values to sample
+      * orbit_iterations - Maximum number of iterations of an orbit
+      * min_orbit_iterations - Minimum number of iterations of an orbit which is accumulated
+      * importance_map (optional) - Array of relative sampling weights per cell of the sample range
+      * seed (optional) - Seed for the numpy.random.Generator
+    """
+    random_generator = numpy.random.default_rng(seed)
+    c_values, sample_weights = _sample_c_values(random_generator, sample_count,
+                                                sample_range_params, importance_map)
+    histogram = numpy.zeros(width * height, dtype=float)
+
+    # Only orbits which escape are replayed; longest orbits first so active orbits form a prefix
+    escape_iterations = compute_escape_iterations(coefficient_array, escape_value, c_values,
+                                                  orbit_iterations)
+    replayed_indexes = numpy.flatnonzero(escape_iterations >= max(min_orbit_iterations, 1))
+    replayed_indexes = replayed_indexes[numpy.argsort(-escape_iterations[replayed_indexes],
+                                                      kind="mergesort")]
+    if len(replayed_indexes) < 1:
+        return histogram
+
+    escape_iterations = escape_iterations[replayed_indexes]
+    c_values = c_values[replayed_indexes]
+    if sample_weights is not None:
+        sample_weights = sample_weights[replayed_indexes]
+
+    buffered_indexes = []
+    buffered_weights = []
+    buffered_count = 0
+    z_values = numpy.zeros(len(c_values), dtype=complex)
+    active_counts = numpy.searchsorted(-escape_iterations, -numpy.arange(escape_iterations[0]),
+                                       side="left")
+    for iteration_counter in range(0, escape_iterations[0]):
+        active_count = active_counts[iteration_counter]
+        z_values = evaluate_polynomial_1d(coefficient_array, z_values[:active_count],
+                                          c_values[:active_count])
+
+        flat_indexes, valid_points = get_flat_pixel_indexes(z_values.real, z_values.imag,
+                                                            view_range_params, width, height)
+        buffered_indexes.append(flat_indexes)
+        if sample_weights is not None:
+            buffered_weights.append(sample_weights[:active_count][valid_points])
+        buffered_count += len(flat_indexes)
+
+        if buffered_count >= _ORBIT_BUFFER_SIZE or iteration_counter == escape_iterations[0] - 1:
+            weights = None
+            if sample_weights is not None:
+                weights = numpy.concatenate(buffered_weights)
+            histogram += numpy.bincount(numpy.concatenate(buffered_indexes), weights,
+                                        minlength=histogram.size)
+            buffered_indexes = []
+            buffered_weights = []
+            buffered_count = 0
+
+    return histogram
+
+class Buddhabrot(Multibrot):
+    """
+    Orbit density rendering of the Multibrot formula; the c values range describes the area
+      covered by the density histogram and each iteration accumulates another batch of samples
+    """
+
+    _sample_range_params = None
+    _orbit_iterations = None
+    _min_orbit_iterations = None
+    _batch_size = None
+    _importance_sampling = None
+    _worker_count = None
+    _seed = None
+
+    def __init__(self, view_range_params, dimension_params, escape_value,
+                 power=_MANDELBROT_POWER, orbit_iterations=_DEFAULT_ORBIT_ITERATIONS,
+                 min_orbit_iterations=_DEFAULT_MIN_ORBIT_ITERATIONS,
+                 batch_size=_DEFAULT_BATCH_SIZE, sample_range_params=None,
+                 importance_sampling=True, worker_count=1, seed=None, max_iterations=None):
+        if sample_range_params is None:
+            sample_range_params = _DEFAULT_SAMPLE_RANGE_PARAMS
+
+        self._sample_range_params = sample_range_params
+        self._orbit_iterations = orbit_iterations
+        self._min_orbit_iterations = min_orbit_iterations
+        self._batch_size = batch_size
+        self._importance_sampling = importance_sampling
+        self._worker_count = worker_count
+        self._seed = seed
+
+        super().__init__(view_range_params, dimension_params, escape_value, power,
+                         max_iterations=max_iterations, exploit_symmetry=False)
+
+    def get_sample_range_params(self):
+        return self._sample_range_params
+
+    def get_orbit_iterations(self):
+        return self._orbit_iterations
+
+    def get_batch_size(self):
+        return self._batch_size
+
+    def get_worker_count(self):
+        return self._worker_count
+
+    def get_fractal_name(self):
+        return _FRACTAL_NAME
+
+    def create_iterator(self, z_values_range, c_values_range):
+        # Densities accumulate orbits across the whole view, so pixels cannot be sampled on their
+        #   own (ie. supersampled, tiled or foveated) like Multibrot escape times
+        raise NotImplementedError()
+
+    def __iter__(cls):
+        return BuddhabrotIterator(cls._c_values_range_params, cls._dimension_params,
+                                  cls._formula_params, cls._sample_range_params,
+                                  cls._orbit_iterations, cls._min_orbit_iterations,
+                                  cls._batch_size, cls._importance_sampling, cls._worker_count,
+                                  cls._seed, cls._max_iterations)
+
+class BuddhabrotIterator(Iterator):
+
+    _max_iterations = None
+    _next_iteration = None
+
+    _view_range_params = None
+    _dimension_params = None
+    _formula_params = None
+    _sample_range_params = None
+    _orbit_iterations = None
+    _min_orbit_iterations = None
+    _batch_size = None
+    _worker_count = None
+
+    _importance_map = None
+    _seed_sequence = None
+    _executor = None
+    _histogram = None
+    _sample_count = None
+
+    def __init__(self, view_range_params, dimension_params, formula_params, sample_range_params,
+                 orbit_iterations, min_orbit_iterations, batch_size, importance_sampling=True,
+                 worker_count=1, seed=None, max_iterations=None):
+        self._max_iterations = max_iterations
+        self._next_iteration = 0
+
+        self._view_range_params = view_range_params
+        self._dimension_params = dimension_params
+        self._formula_params = formula_params
+        self._sample_range_params = sample_range_params
+        self._orbit_iterations = orbit_iterations
+        self._min_orbit_iterations = min_orbit_iterations
+        self._batch_size = batch_size
+        self._worker_count = worker_count
+
+        if importance_sampling:
+            self._importance_map = build_importance_map(formula_params.coefficient_array,
+                                                        formula_params.escape_value,
+                                                        sample_range_params, orbit_iterations,
+                                                        min_orbit_iterations)
+
+        self._seed_sequence = numpy.random.SeedSequence(seed)
+        self._histogram = numpy.zeros(dimension_params.width * dimension_params.height,
+                                      dtype=float)
+        self._sample_count = 0
+
+    def get_histogram(self):
+        return self._histogram.reshape(self._dimension_params.width,
+                                       self._dimension_params.height)
+
+    def close(self):
+        """
+        Shuts down the worker processes used for parallel sampling
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __next__(cls):
+        max_iterations = cls._max_iterations
+        if max_iterations is not None and cls._next_iteration >= max_iterations:
+            cls.close()
+            raise StopIteration
+
+        # Every batch gets an independent random stream so results do not depend on scheduling
+        worker_count = max(cls._worker_count, 1)
+        worker_seeds = cls._seed_sequence.spawn(worker_count)
+        worker_sample_count = -(-cls._batch_size // worker_count)
+
+        formula_params = cls._formula_params
+        dimension_params = cls._dimension_params
+        worker_args = [formula_params.coefficient_array, formula_params.escape_value,
+                       cls._sample_range_params, cls._view_range_params, dimension_params.width,
+                       dimension_params.height, worker_sample_count, cls._orbit_iterations,
+                       cls._min_orbit_iterations, cls._importance_map]
+
+        if worker_count == 1:
+            histograms = [accumulate_orbit_histogram(*worker_args, seed=worker_seeds[0])]
+        else:
+            if cls._executor is None:
+                cls._executor = ProcessPoolExecutor(worker_count)
+            futures = [cls._executor.submit(accumulate_orbit_histogram, *worker_args,
+                                            seed=worker_seed)
+                       for worker_seed in worker_seeds]
+            histograms = [future.result() for future in futures]
+
+        for histogram in histograms:
+            cls._histogram += histogram
+        cls._sample_count += worker_sample_count * worker_count
+
+        cls._next_iteration += 1
+        return DensityIterationData(cls.get_histogram(), cls._sample_count)
@@ -0,0 +1,114 @@
+from collections.abc import Iterator
+
+import numpy
+
+from .base.fractal_formula import FractalFormulaIterable
+from ..data_models.density_iteration_data import DensityIterationData
+from ..helpers.histogram_tools import accumulate_histogram
+
+_FRACTAL_NAME = "Chaos Game"
+_DEFAULT_BATCH_SIZE = 100000
+_DEFAULT_STEPS_PER_ITERATION = 10
+_BURN_IN_STEPS = 20
+
+class ChaosGame(FractalFormulaIterable):
+    """
+    Iterated Function System fractal rendered with the Chaos Game; the z values range describes the
+      area covered by the density histogram and the formula params are IfsParams
+    """
+
+    _batch_size = None
+    _steps_per_iteration = None
+    _seed = None
+
+    def __init__(self, view_range_params, dimension_params, ifs_params,
+                 batch_size=_DEFAULT_BATCH_SIZE, steps_per_iteration=_DEFAULT_STEPS_PER_ITERATION,
+                 seed=None, max_iterations=None):
+        self._batch_size = batch_size
+        self._steps_per_iteration = steps_per_iteration
+        self._seed = seed
+
+        super().__init__(view_range_params, view_range_params, dimension_params, ifs_params,
+                         max_iterations)
+
+    def get_batch_size(self):
+        return self._batch_size
+
+    def get_steps_per_iteration(self):
+        return self._steps_per_iteration
+
+    def get_fractal_name(self):
+        return _FRACTAL_NAME
+
+    def __iter__(cls):
+        return ChaosGameIterator(cls._z_values_range_params, cls._dimension_params,
+                                 cls._formula_params, cls._batch_size, cls._steps_per_iteration,
+                                 cls._seed, cls._max_iterations)
+
+class ChaosGameIterator(Iterator):
+
+    _max_iterations = None
+    _next_iteration = None
+
+    _view_range_params = None
+    _dimension_params = None
+    _ifs_params = None
+    _steps_per_iteration = None
+
+    _random_generator = None
+    _cumulative_probabilities = None
+    _points = None
+    _histogram = None
+    _sample_count = None
+
+    def __init__(self, view_range_params, dimension_params, ifs_params, batch_size,
+                 steps_per_iteration, seed=None, max_iterations=None):
+        self._max_iterations = max_iterations
+        self._next_iteration = 0
+
+        self._view_range_params = view_range_params
+        self._dimension_params = dimension_params
+        self._ifs_params = ifs_params
+        self._steps_per_iteration = steps_per_iteration
+
+        self._random_generator = numpy.random.default_rng(seed)
+        self._cumulative_probabilities = numpy.cumsum(ifs_params.probabilities)
+        self._points = self._random_generator.random((batch_size, 2))
+        self._histogram = numpy.zeros(dimension_params.width * dimension_params.height,
+                                      dtype=numpy.int64)
+        self._sample_count = 0
+
+        # Points only land on the attractor after a number of transforms have been applied
+        for step_counter in range(0, _BURN_IN_STEPS):
+            self._apply_transforms()
+
+    def get_histogram(self):
+        return self._histogram.reshape(self._dimension_params.width,
+                                       self._dimension_params.height)
+
+    def _apply_transforms(self):
+        random_values = self._random_generator.random(len(self._points))
+        transform_indexes = numpy.searchsorted(self._cumulative_probabilities, random_values,
+                                               side="right")
+        numpy.minimum(transform_indexes, len(self._cumulative_probabilities) - 1,
+                      out=transform_indexes)
+
+        matrices = self._ifs_params.transform_matrices[transform_indexes]
+        offsets = self._ifs_params.transform_offsets[transform_indexes]
+        self._points = numpy.einsum("nij,nj->ni", matrices, self._points) + offsets
+
+    def __next__(cls):
+        max_iterations = cls._max_iterations
+        if max_iterations is not None and cls._next_iteration >= max_iterations:
+            raise StopIteration
+
+        dimension_params = cls._dimension_params
+        for step_counter in range(0, cls._steps_per_iteration):
+            cls._apply_transforms()
+            accumulate_histogram(cls._histogram, cls._points[:, 0], cls._points[:, 1],
+                                 cls._view_range_params, dimension_params.width,
+                                 dimension_params.height)
+            cls._sample_count += len(cls._points)
+
+        cls._next_iteration += 1
+        return DensityIterationData(cls.get_histogram(), cls._sample_count)
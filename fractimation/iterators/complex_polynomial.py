@@ -2,28 +2,44 @@ import numpy
 
 from .base.fractal_formula import FractalFormulaIterable, FractalFormulaIterator
 
-from ..data_models.complex_polynomial_iteration_data import ComplexPolynomialIterationData
-
 from ..helpers.fractal_algorithm import evaluate_polynomial_1d
-from ..helpers.list_tools import remove_indexes
+from ..helpers.symmetry_tools import get_symmetry_source_indexes
 
 _FRACTAL_NAME = "Generic Complex Polynomial"
 
 class ComplexPolynomialIterable(FractalFormulaIterable):
 
+    def __init__(self, z_values_range_params, c_values_range_params, dimension_params,
+                 formula_params, max_iterations=None, exploit_symmetry=True):
+        self._exploit_symmetry = exploit_symmetry
+
+        super().__init__(z_values_range_params, c_values_range_params, dimension_params,
+                         formula_params, max_iterations)
+
     def get_fractal_name(self):
         return _FRACTAL_NAME
 
+    def create_iterator(self, z_values_range, c_values_range):
+        source_indexes = None
+        if self._exploit_symmetry:
+            source_indexes = get_symmetry_source_indexes(z_values_range, c_values_range,
+                                                         self._formula_params.coefficient_array)
+
+        fractal_iterator = ComplexPolynomialIterator(z_values_range, c_values_range,
+                                                     self._formula_params, self._max_iterations,
+                                                     source_indexes)
+        return self._configure_iterator(fractal_iterator)
+
     def __iter__(cls):
-        return ComplexPolynomialIterator(cls._z_values_range, cls._c_values_range,
-                                         cls._formula_params, cls._max_iterations)
+        return cls.create_iterator(cls._z_values_range, cls._c_values_range)
 
 class ComplexPolynomialIterator(FractalFormulaIterator):
 
     _formula_params = None
 
-    def __init__(self, z_values_range, c_values_range, formula_params, max_iterations = None):
-        super().__init__(z_values_range, c_values_range, max_iterations)
+    def __init__(self, z_values_range, c_values_range, formula_params, max_iterations = None,
+                 source_indexes=None):
+        super().__init__(z_values_range, c_values_range, max_iterations, source_indexes)
 
         self._formula_params = formula_params
 
@@ -38,10 +54,7 @@ class ComplexPolynomialIterator(FractalFormulaIterator):
                                               cls._z_values,
                                               cls._c_values)
 
-        exploded_indexes = numpy.abs(z_values_new) > formula_params.escape_value
-        remaining_indexes = ~exploded_indexes
-        reduced_arrays = remove_indexes([z_values_new, cls._c_values], remaining_indexes)
-        cls._z_values, cls._c_values = reduced_arrays
-        
-        cls._next_iteration += 1
-        return ComplexPolynomialIterationData(z_values_new, exploded_indexes, remaining_indexes)
+        escape_values = numpy.abs(z_values_new)
+        exploded_indexes = escape_values > formula_params.escape_value
+        return cls._complete_iteration(z_values_new, z_values_new, exploded_indexes,
+                                       escape_values)
@@ -0,0 +1,64 @@
+import numpy
+
+from .base.fractal_formula import FractalFormulaIterable, FractalFormulaIterator
+
+from ..helpers.formula_compiler import compile_formula, parse_formula
+
+_FRACTAL_NAME = "Expression Formula"
+
+class ExpressionFormulaIterable(FractalFormulaIterable):
+    """
+    Escape Time Fractal whose formula is an expression of z & c (see ExpressionFormulaParams);
+      the expression is validated when the iterable is created & compiled once per iterator
+    """
+
+    _use_jit = None
+
+    def __init__(self, z_values_range_params, c_values_range_params, dimension_params,
+                 formula_params, max_iterations=None, use_jit=True):
+        # Invalid expressions are reported before any ranges are generated
+        parse_formula(formula_params.expression)
+        self._use_jit = use_jit
+
+        super().__init__(z_values_range_params, c_values_range_params, dimension_params,
+                         formula_params, max_iterations)
+
+    def get_use_jit(self):
+        return self._use_jit
+
+    def get_fractal_name(self):
+        return _FRACTAL_NAME
+
+    def create_iterator(self, z_values_range, c_values_range):
+        fractal_iterator = ExpressionFormulaIterator(z_values_range, c_values_range,
+                                                     self._formula_params, self._max_iterations,
+                                                     self._use_jit)
+        return self._configure_iterator(fractal_iterator)
+
+    def __iter__(cls):
+        return cls.create_iterator(cls._z_values_range, cls._c_values_range)
+
+class ExpressionFormulaIterator(FractalFormulaIterator):
+
+    _formula_params = None
+    _formula_function = None
+
+    def __init__(self, z_values_range, c_values_range, formula_params, max_iterations=None,
+                 use_jit=True):
+        super().__init__(z_values_range, c_values_range, max_iterations)
+
+        self._formula_params = formula_params
+        self._formula_function = compile_formula(formula_params.expression, use_jit)
+
+    def __next__(cls):
+        super().__next__()
+
+        if len(cls._z_values) < 1:
+            return None
+
+        z_values_new = cls._formula_function(cls._z_values, cls._c_values)
+
+        escape_values = numpy.abs(z_values_new)
+        exploded_indexes = escape_values > cls._formula_params.escape_value
+        return cls._complete_iteration(z_values_new, z_values_new, exploded_indexes,
+                                       escape_values)
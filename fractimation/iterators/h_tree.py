@@ -0,0 +1,65 @@
+import numpy
+
+from .base.geometric_fractal import GeometricFractalIterable, GeometricFractalIterator
+from ..data_models.geometric_iteration_data import GeometricIterationData
+
+_FRACTAL_NAME = "H-Tree"
+_DEFAULT_CENTER = [0.5, 0.5]
+_DEFAULT_LENGTH = 0.5
+_LENGTH_RATIO = 2**-0.5
+
+class HTree(GeometricFractalIterable):
+
+    _center = None
+    _length = None
+
+    def __init__(self, center=None, length=_DEFAULT_LENGTH, max_iterations=None):
+        if center is None:
+            center = _DEFAULT_CENTER
+
+        self._center = numpy.array(center, dtype=float)
+        self._length = length
+
+        super().__init__(max_iterations)
+
+    def get_center(self):
+        return self._center
+
+    def get_length(self):
+        return self._length
+
+    def get_fractal_name(self):
+        return _FRACTAL_NAME
+
+    def get_cumulative(self):
+        return True
+
+    def __iter__(cls):
+        return HTreeIterator(cls._center, cls._length, cls._max_iterations)
+
+class HTreeIterator(GeometricFractalIterator):
+
+    _centers = None
+    _length = None
+
+    def __init__(self, center, length, max_iterations=None):
+        super().__init__(max_iterations)
+
+        self._centers = numpy.array([center], dtype=float)
+        self._length = length
+
+    def __next__(cls):
+        super().__next__()
+
+        # Segments alternate between horizontal & vertical on each iteration
+        half_offset = numpy.zeros(2)
+        half_offset[cls._next_iteration % 2] = cls._length / 2.0
+
+        segments = numpy.stack([cls._centers - half_offset, cls._centers + half_offset], axis=1)
+
+        # The endpoints of this iteration's segments are the centers of the next iteration's
+        cls._centers = segments.reshape(-1, 2)
+        cls._length *= _LENGTH_RATIO
+
+        cls._next_iteration += 1
+        return GeometricIterationData(segments, False)
@@ -0,0 +1,235 @@
+from collections.abc import Iterator
+
+import numpy
+
+from .base.fractal_formula import FractalFormulaIterable
+from ..data_models.complex_range_params import ComplexRangeParams
+from ..data_models.density_iteration_data import DensityIterationData
+from ..data_models.formula_params import FormulaParams
+from ..helpers.histogram_tools import get_flat_pixel_indexes
+
+_MANDELBROT_POWER = 2
+_FRACTAL_NAME = "Inverse Iteration Julia"
+_DEFAULT_BATCH_SIZE = 100000
+_DEFAULT_STEPS_PER_ITERATION = 10
+_DEFAULT_MAX_PIXEL_HITS = 4
+_BURN_IN_STEPS = 30
+_BURN_IN_POINT_COUNT = 1000
+_OUTSIDE_GRID_SIZE = 512
+
+def _get_julia_radius(c_value):
+    """
+    Returns the radius of a disk around the origin containing the Julia Set of z^n + c (n >= 2);
+      beyond it every orbit grows, so preimages never leave it
+
+    Parameters :
+      * c_value - The constant c value
+    """
+    return max(abs(c_value), 2.0)
+
+def _prune_points(points, flat_indexes, hit_counts, max_pixel_hits):
+    """
+    Returns the points whose pixel has been hit fewer than max_pixel_hits times, counting earlier
+      points of the same batch; hit_counts is updated in place
+
+    Parameters :
+      * points - Array of complex points
+      * flat_indexes - Array of the flat pixel index of each point
+      * hit_counts - Flat array of the hit count of each pixel
+      * max_pixel_hits - Number of points each pixel accepts
+    """
+    # Points of the same pixel are ranked so only the remaining quota of each pixel is kept
+    sort_order = numpy.argsort(flat_indexes, kind="stable")
+    sorted_indexes = flat_indexes[sort_order]
+    group_starts = numpy.searchsorted(sorted_indexes, sorted_indexes, side="left")
+    pixel_ranks = numpy.arange(sorted_indexes.size) - group_starts
+    kept = pixel_ranks < max_pixel_hits - hit_counts[sorted_indexes]
+
+    unique_indexes, index_counts = numpy.unique(sorted_indexes[kept], return_counts=True)
+    hit_counts[unique_indexes] += index_counts
+    return points[sort_order[kept]]
+
+class InverseIterationJulia(FractalFormulaIterable):
+    """
+    Julia Set of z^n + c rendered with the Modified Inverse Iteration Method; the z values range
+      describes the area covered by the density histogram & the c values range holds the constant
+      c value (its minimum).  Instead of iterating every pixel of the plane forwards, points on the
+      Julia Set are iterated backwards (z -> (z - c)^(1/n), following all n branches) & a point is
+      only followed further while its pixel has been hit fewer than max_pixel_hits times, so the
+      work is proportional to the length of the boundary rather than the area of the view.
+      Points outside the view are pruned on a coarse grid so preimages re-entering a zoomed view
+      are still found.
+
+    Each iteration plots up to steps_per_iteration batches of points; once every branch has been
+      pruned the iterator returns None.
+    """
+
+    _c_value = None
+    _batch_size = None
+    _steps_per_iteration = None
+    _max_pixel_hits = None
+    _seed = None
+
+    def __init__(self, z_values_range_params, dimension_params, c_values_range_params=None,
+                 power=_MANDELBROT_POWER, batch_size=_DEFAULT_BATCH_SIZE,
+                 steps_per_iteration=_DEFAULT_STEPS_PER_ITERATION,
+                 max_pixel_hits=_DEFAULT_MAX_PIXEL_HITS, seed=None, max_iterations=None):
+        if c_values_range_params is None:
+            c_values_range_params = ComplexRangeParams(0, 0, 0, 0)
+
+        self._c_value = complex(c_values_range_params.min_real_number,
+                                c_values_range_params.min_imaginary_number)
+        self._batch_size = batch_size
+        self._steps_per_iteration = steps_per_iteration
+        self._max_pixel_hits = max_pixel_hits
+        self._seed = seed
+
+        coefficient_array = numpy.zeros(power + 1, dtype=int)
+        coefficient_array[0] = 1
+        coefficient_array[-1] = 1
+
+        formula_params = FormulaParams(coefficient_array, _get_julia_radius(self._c_value))
+
+        super().__init__(z_values_range_params, c_values_range_params, dimension_params,
+                         formula_params, max_iterations)
+
+    def get_c_value(self):
+        return self._c_value
+
+    def get_batch_size(self):
+        return self._batch_size
+
+    def get_steps_per_iteration(self):
+        return self._steps_per_iteration
+
+    def get_max_pixel_hits(self):
+        return self._max_pixel_hits
+
+    def get_fractal_name(self):
+        return _FRACTAL_NAME
+
+    def __iter__(cls):
+        power = len(cls._formula_params.coefficient_array) - 1
+        return InverseIterationJuliaIterator(cls._z_values_range_params, cls._dimension_params,
+                                             cls._c_value, power, cls._batch_size,
+                                             cls._steps_per_iteration, cls._max_pixel_hits,
+                                             cls._seed, cls._max_iterations)
+
+class InverseIterationJuliaIterator(Iterator):
+
+    _max_iterations = None
+    _next_iteration = None
+
+    _view_range_params = None
+    _dimension_params = None
+    _c_value = None
+    _roots_of_unity = None
+    _batch_size = None
+    _steps_per_iteration = None
+    _max_pixel_hits = None
+
+    _outside_range_params = None
+    _outside_hit_counts = None
+    _pending_points = None
+    _histogram = None
+    _sample_count = None
+
+    def __init__(self, view_range_params, dimension_params, c_value, power, batch_size,
+                 steps_per_iteration, max_pixel_hits, seed=None, max_iterations=None):
+        self._max_iterations = max_iterations
+        self._next_iteration = 0
+
+        self._view_range_params = view_range_params
+        self._dimension_params = dimension_params
+        self._c_value = c_value
+        self._roots_of_unity = numpy.exp(2j * numpy.pi * numpy.arange(power) / power)
+        self._batch_size = batch_size
+        self._steps_per_iteration = steps_per_iteration
+        self._max_pixel_hits = max_pixel_hits
+
+        julia_radius = _get_julia_radius(c_value)
+        self._outside_range_params = ComplexRangeParams(-julia_radius, julia_radius,
+                                                        -julia_radius, julia_radius)
+        self._outside_hit_counts = numpy.zeros(_OUTSIDE_GRID_SIZE * _OUTSIDE_GRID_SIZE,
+                                               dtype=numpy.int64)
+        self._histogram = numpy.zeros(dimension_params.width * dimension_params.height,
+                                      dtype=numpy.int64)
+        self._sample_count = 0
+
+        # Backward orbits along random branches are attracted to the Julia Set from any start
+        random_generator = numpy.random.default_rng(seed)
+        points = julia_radius * (random_generator.random(_BURN_IN_POINT_COUNT) *
+                                 numpy.exp(2j * numpy.pi *
+                                           random_generator.random(_BURN_IN_POINT_COUNT)))
+        for step_counter in range(0, _BURN_IN_STEPS):
+            branches = random_generator.integers(0, power, _BURN_IN_POINT_COUNT)
+            points = self._get_principal_roots(points) * self._roots_of_unity[branches]
+
+        self._pending_points = [points]
+
+    def get_histogram(self):
+        return self._histogram.reshape(self._dimension_params.width,
+                                       self._dimension_params.height)
+
+    def _get_principal_roots(self, points):
+        return numpy.power(points - self._c_value, 1.0 / self._roots_of_unity.size)
+
+    def _pop_points(self):
+        """
+        Returns up to batch_size of the most recently pushed points (depth first keeps the pending
+          stack small) or None once no points are pending
+        """
+        pending_points = self._pending_points
+        if not pending_points:
+            return None
+
+        points = pending_points.pop()
+        if points.size > self._batch_size:
+            pending_points.append(points[:-self._batch_size])
+            points = points[-self._batch_size:]
+
+        return points
+
+    def _plot_points(self, points):
+        dimension_params = self._dimension_params
+        view_indexes, in_view = get_flat_pixel_indexes(points.real, points.imag,
+                                                       self._view_range_params,
+                                                       dimension_params.width,
+                                                       dimension_params.height)
+        view_points = _prune_points(points[in_view], view_indexes, self._histogram,
+                                    self._max_pixel_hits)
+
+        # Points outside the view are only followed while they add to the coarse outside grid;
+        #   points outside the Julia radius are dropped
+        outside_points = points[~in_view]
+        outside_indexes, in_grid = get_flat_pixel_indexes(outside_points.real,
+                                                          outside_points.imag,
+                                                          self._outside_range_params,
+                                                          _OUTSIDE_GRID_SIZE, _OUTSIDE_GRID_SIZE)
+        outside_points = _prune_points(outside_points[in_grid], outside_indexes,
+                                       self._outside_hit_counts, self._max_pixel_hits)
+
+        self._sample_count += view_points.size
+        kept_points = numpy.concatenate([view_points, outside_points])
+        if kept_points.size > 0:
+            child_points = (self._get_principal_roots(kept_points)[:, None] *
+                            self._roots_of_unity[None, :])
+            self._pending_points.append(child_points.ravel())
+
+    def __next__(cls):
+        max_iterations = cls._max_iterations
+        if max_iterations is not None and cls._next_iteration >= max_iterations:
+            raise StopIteration
+
+        if not cls._pending_points:
+            return None
+
+        for step_counter in range(0, cls._steps_per_iteration):
+            points = cls._pop_points()
+            if points is None:
+                break
+
+            cls._plot_points(points)
+
+        cls._next_iteration += 1
+        return DensityIterationData(cls.get_histogram(), cls._sample_count)
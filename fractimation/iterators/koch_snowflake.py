@@ -0,0 +1,61 @@
+import numpy
+
+from .base.geometric_fractal import GeometricFractalIterable, GeometricFractalIterator
+from ..data_models.geometric_iteration_data import GeometricIterationData
+
+_FRACTAL_NAME = "Koch Snowflake"
+_DEFAULT_VERTICES = [[0.1, 0.25], [0.9, 0.25], [0.5, 0.25 + 0.4 * 3**0.5]]
+_PEAK_HEIGHT = 3**0.5 / 6.0
+
+class KochSnowflake(GeometricFractalIterable):
+
+    _vertices = None
+
+    def __init__(self, vertices=None, max_iterations=None):
+        if vertices is None:
+            vertices = _DEFAULT_VERTICES
+
+        self._vertices = numpy.array(vertices, dtype=float)
+
+        super().__init__(max_iterations)
+
+    def get_vertices(self):
+        return self._vertices
+
+    def get_fractal_name(self):
+        return _FRACTAL_NAME
+
+    def get_cumulative(self):
+        return False
+
+    def __iter__(cls):
+        return KochSnowflakeIterator(cls._vertices, cls._max_iterations)
+
+class KochSnowflakeIterator(GeometricFractalIterator):
+
+    _points = None
+
+    def __init__(self, vertices, max_iterations=None):
+        super().__init__(max_iterations)
+
+        self._points = numpy.array(vertices, dtype=float)
+
+    def __next__(cls):
+        super().__next__()
+
+        if cls._next_iteration > 0:
+            start_points = cls._points
+            end_points = numpy.roll(start_points, -1, axis=0)
+            segments = end_points - start_points
+
+            # Peaks point away from the interior of a counter-clockwise curve
+            normals = numpy.stack([segments[:, 1], -segments[:, 0]], axis=1)
+            first_thirds = start_points + segments / 3.0
+            peaks = start_points + segments / 2.0 + normals * _PEAK_HEIGHT
+            second_thirds = start_points + segments * 2.0 / 3.0
+
+            new_points = numpy.stack([start_points, first_thirds, peaks, second_thirds], axis=1)
+            cls._points = new_points.reshape(-1, 2)
+
+        cls._next_iteration += 1
+        return GeometricIterationData(cls._points[numpy.newaxis, :, :], True)
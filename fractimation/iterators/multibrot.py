@@ -10,7 +10,8 @@ _FRACTAL_NAME = "Multibrot"
 class Multibrot(ComplexPolynomialIterable):
 
     def __init__(self, c_values_range_params, dimension_params, escape_value,
-                 power=_MANDELBROT_POWER, z_values_range_params=None, max_iterations=None):
+                 power=_MANDELBROT_POWER, z_values_range_params=None, max_iterations=None,
+                 exploit_symmetry=True):
         if z_values_range_params is None:
             z_values_range_params = ComplexRangeParams(0, 0, 0, 0)
 
@@ -21,7 +22,7 @@ class Multibrot(ComplexPolynomialIterable):
         formula_params = FormulaParams(coefficient_array, escape_value)
 
         super().__init__(z_values_range_params, c_values_range_params, dimension_params,
-                         formula_params, max_iterations)
+                         formula_params, max_iterations, exploit_symmetry)
 
     def get_fractal_name(self):
         return _FRACTAL_NAME
@@ -10,7 +10,8 @@ _FRACTAL_NAME = "Multijulia"
 class Multijulia(ComplexPolynomialIterable):
 
     def __init__(self, z_values_range_params, dimension_params, escape_value,
-                 power=_MANDELBROT_POWER, c_values_range_params=None, max_iterations=None):
+                 power=_MANDELBROT_POWER, c_values_range_params=None, max_iterations=None,
+                 exploit_symmetry=True):
         if c_values_range_params is None:
             c_values_range_params = ComplexRangeParams(0, 0, 0, 0)
 
@@ -21,7 +22,7 @@ class Multijulia(ComplexPolynomialIterable):
         formula_params = FormulaParams(coefficient_array, escape_value)
 
         super().__init__(z_values_range_params, c_values_range_params, dimension_params,
-                         formula_params, max_iterations)
+                         formula_params, max_iterations, exploit_symmetry)
 
     def get_fractal_name(self):
         return _FRACTAL_NAME
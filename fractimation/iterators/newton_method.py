@@ -4,9 +4,7 @@ from numpy.polynomial.polynomial import polyder
 from .base.fractal_formula import FractalFormulaIterable, FractalFormulaIterator
 from ..data_models.formula_params import FormulaParams
 from ..data_models.complex_range_params import ComplexRangeParams
-from ..data_models.complex_polynomial_iteration_data import ComplexPolynomialIterationData
 from ..helpers.fractal_algorithm import newton_method_algorithm
-from ..helpers.list_tools import remove_indexes
 
 _FRACTAL_NAME = "Newton Method"
 
@@ -21,9 +19,14 @@ class NewtonMethod(FractalFormulaIterable):
 
         self._coefficient_array_deriv = polyder(self._formula_params.coefficient_array)
 
+    def create_iterator(self, z_values_range, c_values_range):
+        fractal_iterator = NewtonMethodIterator(z_values_range, c_values_range,
+                                                self._formula_params, self._coefficient_array_deriv,
+                                                self._max_iterations)
+        return self._configure_iterator(fractal_iterator)
+
     def __iter__(cls):
-        return NewtonMethodIterator(cls._z_values_range, cls._c_values_range, cls._formula_params,
-                                    cls._coefficient_array_deriv, cls._max_iterations)
+        return cls.create_iterator(cls._z_values_range, cls._c_values_range)
 
     def get_fractal_name(self):
         return _FRACTAL_NAME
@@ -54,10 +57,7 @@ class NewtonMethodIterator(FractalFormulaIterator):
         iteration_diff = newton_method_result[0]
         z_values_new = newton_method_result[1]
 
-        exploded_indexes = numpy.abs(iteration_diff) < formula_params.escape_value
-        remaining_indexes = ~exploded_indexes
-        reduced_arrays = remove_indexes([z_values_new, cls._c_values], remaining_indexes)
-        cls._z_values, cls._c_values = reduced_arrays
-        
-        cls._next_iteration += 1
-        return ComplexPolynomialIterationData(iteration_diff, exploded_indexes, remaining_indexes)
+        escape_values = numpy.abs(iteration_diff)
+        exploded_indexes = escape_values < formula_params.escape_value
+        return cls._complete_iteration(z_values_new, iteration_diff, exploded_indexes,
+                                       escape_values)
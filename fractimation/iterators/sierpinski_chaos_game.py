@@ -0,0 +1,36 @@
+import numpy
+
+from .chaos_game import ChaosGame
+from ..data_models.ifs_params import IfsParams
+from ..data_models.complex_range_params import ComplexRangeParams
+
+_DEFAULT_BATCH_SIZE = 100000
+_DEFAULT_STEPS_PER_ITERATION = 10
+_FRACTAL_NAME = "Sierpinski Chaos Game"
+_DEFAULT_VERTICES = [[0.0, 0.0], [1.0, 0.0], [0.5, 3**0.5 / 2.0]]
+_CONTRACTION_RATIO = 0.5
+_DEFAULT_VIEW_RANGE_PARAMS = ComplexRangeParams(-0.05, 1.05, 0.92, -0.05)
+
+class SierpinskiChaosGame(ChaosGame):
+
+    def __init__(self, dimension_params, vertices=None, view_range_params=None,
+                 batch_size=_DEFAULT_BATCH_SIZE,
+                 steps_per_iteration=_DEFAULT_STEPS_PER_ITERATION, seed=None,
+                 max_iterations=None):
+        if vertices is None:
+            vertices = _DEFAULT_VERTICES
+        if view_range_params is None:
+            view_range_params = _DEFAULT_VIEW_RANGE_PARAMS
+
+        # Each transform moves a point halfway towards one of the vertices
+        vertices = numpy.array(vertices, dtype=float)
+        transform_matrices = numpy.tile(numpy.identity(2) * _CONTRACTION_RATIO,
+                                        (len(vertices), 1, 1))
+        transform_offsets = vertices * (1 - _CONTRACTION_RATIO)
+        ifs_params = IfsParams(transform_matrices, transform_offsets)
+
+        super().__init__(view_range_params, dimension_params, ifs_params, batch_size,
+                         steps_per_iteration, seed, max_iterations)
+
+    def get_fractal_name(self):
+        return _FRACTAL_NAME
@@ -0,0 +1,54 @@
+import numpy
+
+from .base.geometric_fractal import GeometricFractalIterable, GeometricFractalIterator
+from ..data_models.geometric_iteration_data import GeometricIterationData
+
+_FRACTAL_NAME = "Sierpinski Triangle"
+_DEFAULT_VERTICES = [[0.0, 0.0], [1.0, 0.0], [0.5, 3**0.5 / 2.0]]
+
+class SierpinskiTriangle(GeometricFractalIterable):
+
+    _vertices = None
+
+    def __init__(self, vertices=None, max_iterations=None):
+        if vertices is None:
+            vertices = _DEFAULT_VERTICES
+
+        self._vertices = numpy.array(vertices, dtype=float)
+
+        super().__init__(max_iterations)
+
+    def get_vertices(self):
+        return self._vertices
+
+    def get_fractal_name(self):
+        return _FRACTAL_NAME
+
+    def get_cumulative(self):
+        return False
+
+    def __iter__(cls):
+        return SierpinskiTriangleIterator(cls._vertices, cls._max_iterations)
+
+class SierpinskiTriangleIterator(GeometricFractalIterator):
+
+    _triangles = None
+
+    def __init__(self, vertices, max_iterations=None):
+        super().__init__(max_iterations)
+
+        self._triangles = numpy.array([vertices], dtype=float)
+
+    def __next__(cls):
+        super().__next__()
+
+        if cls._next_iteration > 0:
+            # Row i of the midpoint matrix is the corner triangle of vertex i (the midpoint of a
+            #   vertex with itself being the vertex)
+            triangles = cls._triangles
+            midpoints = (triangles[:, :, numpy.newaxis, :] +
+                         triangles[:, numpy.newaxis, :, :]) / 2.0
+            cls._triangles = midpoints.reshape(-1, 3, 2)
+
+        cls._next_iteration += 1
+        return GeometricIterationData(cls._triangles, True)
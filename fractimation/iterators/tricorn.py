@@ -0,0 +1,21 @@
+from .expression_formula import ExpressionFormulaIterable
+from ..data_models.expression_formula_params import ExpressionFormulaParams
+from ..data_models.complex_range_params import ComplexRangeParams
+
+_TRICORN_EXPRESSION = "conj(z)**2 + c"
+_FRACTAL_NAME = "Tricorn"
+
+class Tricorn(ExpressionFormulaIterable):
+
+    def __init__(self, c_values_range_params, dimension_params, escape_value,
+                 z_values_range_params=None, max_iterations=None, use_jit=True):
+        if z_values_range_params is None:
+            z_values_range_params = ComplexRangeParams(0, 0, 0, 0)
+
+        formula_params = ExpressionFormulaParams(_TRICORN_EXPRESSION, escape_value)
+
+        super().__init__(z_values_range_params, c_values_range_params, dimension_params,
+                         formula_params, max_iterations, use_jit)
+
+    def get_fractal_name(self):
+        return _FRACTAL_NAME
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+import threading
 
 from .fractimation_renderer import FractimationRenderer
 
@@ -7,17 +8,47 @@ class CachedRenderer(FractimationRenderer, ABC):
 
     _fractal_iterator = None
     _render_cache = None
+    _iterations_complete = False
+    _render_lock = None
+    _frame_producer = None
 
     def __init__(self, render_axes):
         super().__init__(render_axes)
 
         self._render_cache = list()
+        # Guards the iterator & render cache against background frame producers
+        self._render_lock = threading.RLock()
 
     def initialize(self, fractal_iterable):
-        super().initialize(fractal_iterable)
+        with self._render_lock:
+            super().initialize(fractal_iterable)
 
-        self._fractal_iterator = self._fractal_iterable.__iter__()
-        self._render_cache.clear()
+            self._fractal_iterator = self._fractal_iterable.__iter__()
+            self._render_cache.clear()
+            self._iterations_complete = False
+
+    def get_iterations_complete(self):
+        return self._iterations_complete
+
+    def get_cached_frame_count(self):
+        return len(self._render_cache)
+
+    def get_render_lock(self):
+        return self._render_lock
+
+    def get_frame_producer(self):
+        return self._frame_producer
+
+    def set_frame_producer(self, frame_producer):
+        """
+        Attaches a background frame producer (ie. LookaheadFrameProducer); while attached,
+          missing frames are requested from the producer instead of being rendered on the calling
+          thread
+
+        Parameters :
+          * frame_producer - The producer to notify of requested frames (None to detach)
+        """
+        self._frame_producer = frame_producer
 
     def preheat_render_cache(self, max_iterations):
         if max_iterations <= len(self._render_cache):
@@ -26,8 +57,14 @@ class CachedRenderer(FractimationRenderer, ABC):
         fractal_name = self._fractal_iterable.get_fractal_name()
         print("Preheating {} Render Cache to {} iterations...".format(fractal_name, max_iterations))
         for iteration_counter in range(len(self._render_cache), max_iterations):
+            # Iterators with an adaptive budget may stop before max_iterations
+            if self._iterations_complete:
+                print("Iterations completed after {} frames".format(len(self._render_cache)))
+                break
+
             print("Iteration {} processing...".format(iteration_counter))
-            self.render_to_cache()
+            with self._render_lock:
+                self.render_to_cache()
 
         print("Completed preheating {} Render Cache!".format(fractal_name))
 
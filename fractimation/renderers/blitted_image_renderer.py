@@ -0,0 +1,245 @@
+"""
+Fractimation specific Blitted Image Renderer
+
+Public Classes :
+  * BlittedImageRenderer - Image Renderer which plays back pre-colorized frames using blitting
+"""
+
+import numpy
+
+from .cached_image_renderer import CachedImageRenderer
+from ..helpers.color_tools import build_color_lut, colorize_image, find_changed_region
+from ..helpers.color_tools import get_lut_size
+
+_BLIT_PADDING = 1
+_BACKGROUND_PADDING = 3
+
+class BlittedImageRenderer(CachedImageRenderer):
+    """
+    Image Renderer for high frame rate playback of cached animations.  Frames are converted into
+      uint8 RGBA images once with a normalization shared by every frame, so displaying a frame
+      skips Matplotlib's normalization & color mapping, and only the screen region which changed
+      since the displayed frame is blitted.  RGBA frames use 4 bytes per pixel per cached frame.
+
+    Public Methods :
+      * precolorize_frames - Converts every cached frame into an RGBA image
+      * get_color_range - Returns the values mapped to the first & last colors of the color map
+    """
+
+    _fixed_color_range = None
+    _color_range = None
+    _color_lut = None
+    _color_frames = None
+    _changed_regions = None
+    _displayed_frame = None
+    _background = None
+
+    def __init__(self, image_axes, fractal_iterable, dimension_params, image_params=None,
+                 persistent_cache=None, color_range=None):
+        """
+        Constructor
+
+        Parameters :
+          * image_axes - The Matplotlib Axes to display the image in
+          * fractal_iterable - The FractalFormulaIterable to render
+          * dimension_params - The DimensionParams of the image
+          * image_params (optional) - The ImageParams of the image
+          * persistent_cache (optional) - A PersistentRenderCache shared across processes
+          * color_range (optional) - [min_value, max_value] mapped to the first & last colors of
+              the color map (default is the value range of the cached frames, widened as frames
+              with new values are cached)
+        """
+        self._fixed_color_range = color_range
+        self._color_frames = list()
+        self._changed_regions = list()
+
+        super().__init__(image_axes, fractal_iterable, dimension_params, image_params,
+                         persistent_cache)
+
+        # Spines overlap the edges of the image so they are kept out of the blitting background
+        #   and drawn over the image instead
+        figure_canvas = image_axes.figure.canvas
+        if figure_canvas.supports_blit:
+            for spine in image_axes.spines.values():
+                spine.set_animated(True)
+            figure_canvas.mpl_connect("draw_event", self._handle_draw_event)
+
+    def initialize(self, fractal_iterable):
+        super().initialize(fractal_iterable)
+
+        self._color_range = self._fixed_color_range
+        self._color_lut = None
+        self._color_frames.clear()
+        self._changed_regions.clear()
+        self._displayed_frame = None
+
+    def get_color_range(self):
+        return self._color_range
+
+    def preheat_render_cache(self, max_iterations):
+        super().preheat_render_cache(max_iterations)
+        self.precolorize_frames()
+
+    def precolorize_frames(self):
+        """
+        Converts every cached frame which has not been colorized into an RGBA image
+        """
+        self._colorize_frames(len(self._render_cache))
+
+    def render_to_canvas(self, frame_num, canvas):
+        frame_num = self._get_available_frame_num(frame_num)
+        self.get_frame_image(frame_num)
+        self._colorize_frames(frame_num + 1)
+
+        changed_region = self._get_changed_region(self._displayed_frame, frame_num)
+        self._displayed_frame = frame_num
+        self._image_canvas.set_data(self._color_frames[frame_num])
+        if changed_region is None:
+            return
+
+        figure_canvas = self._render_axes.figure.canvas
+        if self._background is None:
+            figure_canvas.draw_idle()
+            return
+
+        figure_canvas.restore_region(self._background)
+        self._render_axes.draw_artist(self._image_canvas)
+        self._draw_spines()
+        figure_canvas.blit(self._get_region_bbox(changed_region))
+
+    def _truncate_render_cache(self, frame_count):
+        super()._truncate_render_cache(frame_count)
+
+        del self._color_frames[frame_count:]
+        del self._changed_regions[frame_count:]
+        if self._displayed_frame is not None and self._displayed_frame >= frame_count:
+            self._displayed_frame = None
+
+    def _update_colors(self):
+        if self._fixed_color_range is None:
+            # Escape & density frames only accumulate, so the first & last cached frames bound
+            #   every frame
+            first_image = self._get_frame_image(0)
+            last_image = self._get_frame_image(len(self._render_cache) - 1)
+            min_value = min(numpy.min(first_image), numpy.min(last_image))
+            max_value = max(numpy.max(first_image), numpy.max(last_image))
+
+            color_range = self._color_range
+            if color_range is None:
+                self._color_range = [min_value, max_value]
+            elif min_value < color_range[0] or max_value > color_range[1]:
+                # Frames colorized before the range outgrew it are colorized again
+                self._color_range = self._get_grown_color_range(min_value, max_value)
+                self._color_lut = None
+                self._color_frames.clear()
+                self._changed_regions.clear()
+                self._displayed_frame = None
+
+        if self._color_lut is not None:
+            return
+
+        min_value, max_value = self._color_range
+        integer_values = numpy.issubdtype(self._get_frame_image(0).dtype, numpy.integer)
+        lut_size = get_lut_size(min_value, max_value, integer_values)
+        self._color_lut = build_color_lut(self._image_params.color_map, lut_size)
+
+    def _get_grown_color_range(self, min_value, max_value):
+        """
+        Returns the color range replacing one which the cached frames outgrew (ie. playback started
+          before the render cache was preheated); the range is doubled so frames are colorized
+          again only a few times, without exceeding the largest value of escape frames
+        """
+        min_value = min(min_value, self._color_range[0])
+        max_value = max(max_value, self._color_range[1])
+        grown_max_value = max_value + max(max_value - min_value, 1)
+
+        max_iterations = self._fractal_iterable.get_max_iterations()
+        if not self._density_frames and max_iterations is not None:
+            # Recolored pixels of the last frame get the largest escape value
+            grown_max_value = min(grown_max_value, max(max_value, max_iterations + 1))
+
+        return [min_value, grown_max_value]
+
+    def _colorize_frames(self, frame_count):
+        if len(self._color_frames) >= frame_count:
+            return
+
+        self._update_colors()
+        for frame_num in range(len(self._color_frames), frame_count):
+            color_frame = self._colorize_frame(frame_num)
+
+            changed_region = None
+            if frame_num > 0:
+                changed_region = find_changed_region(self._color_frames[-1], color_frame)
+                if changed_region is None:
+                    # Unchanged frames share the previous frame's RGBA image
+                    color_frame = self._color_frames[-1]
+
+            self._color_frames.append(color_frame)
+            self._changed_regions.append(changed_region)
+
+    def _colorize_frame(self, frame_num):
+        frame_image = self._get_frame_image(frame_num)
+        if self._image_params.equalize_histogram and not self._density_frames:
+            # Equalized colors change every frame, so each frame gets its own lookup table
+            min_value, color_lut = self._get_equalized_color_lut(frame_num)
+            return colorize_image(frame_image, color_lut, min_value, frame_num + 1)
+
+        min_value, max_value = self._color_range
+        return colorize_image(frame_image, self._color_lut, min_value, max_value)
+
+    def _get_changed_region(self, previous_frame, frame_num):
+        """
+        Returns the bounding rows & columns of every pixel which changes between two frames, the
+          whole image if there is no previous frame or None if nothing changes
+        """
+        if previous_frame is None:
+            frame_shape = self._color_frames[frame_num].shape
+            return [0, frame_shape[0] - 1, 0, frame_shape[1] - 1]
+
+        first_frame = min(previous_frame, frame_num) + 1
+        last_frame = max(previous_frame, frame_num) + 1
+        changed_regions = [changed_region for changed_region in
+                           self._changed_regions[first_frame:last_frame]
+                           if changed_region is not None]
+        if not changed_regions:
+            return None
+
+        changed_regions = numpy.array(changed_regions)
+        return [numpy.min(changed_regions[:, 0]), numpy.max(changed_regions[:, 1]),
+                numpy.min(changed_regions[:, 2]), numpy.max(changed_regions[:, 3])]
+
+    def _get_region_bbox(self, changed_region):
+        from matplotlib.transforms import Bbox
+
+        first_row, last_row, first_column, last_column = changed_region
+
+        # Pixel centers sit on integer data coordinates so every pixel extends half a unit
+        render_axes = self._render_axes
+        corners = render_axes.transData.transform([[first_column - 0.5, first_row - 0.5],
+                                                   [last_column + 0.5, last_row + 0.5]])
+        min_corner = numpy.floor(numpy.min(corners, axis=0)) - _BLIT_PADDING
+        max_corner = numpy.ceil(numpy.max(corners, axis=0)) + _BLIT_PADDING
+        region_bbox = Bbox([min_corner, max_corner])
+
+        background_bbox = render_axes.bbox.padded(_BACKGROUND_PADDING)
+        visible_bbox = Bbox.intersection(region_bbox, background_bbox)
+        if visible_bbox is None:
+            return background_bbox
+
+        return visible_bbox
+
+    def _draw_spines(self):
+        render_axes = self._render_axes
+        for spine in render_axes.spines.values():
+            render_axes.draw_artist(spine)
+
+    def _handle_draw_event(self, draw_event):
+        # Full redraws (ie. resizing or zooming) invalidate the blitting background; draws made
+        #   while saving already include the spines
+        if draw_event.canvas.is_saving():
+            return
+
+        background_bbox = self._render_axes.bbox.padded(_BACKGROUND_PADDING)
+        self._background = draw_event.canvas.copy_from_bbox(background_bbox)
+        self._draw_spines()
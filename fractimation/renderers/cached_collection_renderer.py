@@ -0,0 +1,104 @@
+from .base.cached_renderer import CachedRenderer
+from ..helpers.render import build_poly_collection, build_line_collection
+
+_DEFAULT_LINE_WIDTH = 0.5
+_AXES_LIMITS = (0.0, 1.0)
+
+class CachedCollectionRenderer(CachedRenderer):
+    """
+    Renderer for Geometric Fractals which draws each iteration as a single Matplotlib Collection
+      built directly from the iteration's vertex array
+    """
+
+    _line_width = None
+    _fill = None
+    _cumulative = None
+    _visible_frame = None
+
+    def __init__(self, render_axes, fractal_iterable, line_width=_DEFAULT_LINE_WIDTH, fill=False):
+        super().__init__(render_axes)
+
+        self._line_width = line_width
+        self._fill = fill
+
+        self._render_axes.set_xlim(_AXES_LIMITS)
+        self._render_axes.set_ylim(_AXES_LIMITS)
+        self._render_axes.set_aspect("equal")
+
+        self.initialize(fractal_iterable)
+
+    def initialize(self, fractal_iterable):
+        for frame_collection in self._render_cache:
+            if frame_collection is not None:
+                frame_collection.remove()
+
+        super().initialize(fractal_iterable)
+
+        self._cumulative = fractal_iterable.get_cumulative()
+        self._visible_frame = None
+        self.render_to_cache()
+
+    def render_to_canvas(self, frame_num, canvas):
+        if frame_num >= len(self._render_cache):
+            for frame_counter in range(len(self._render_cache), frame_num + 1):
+                self.render_to_cache()
+
+        # Only collections whose visibility changes since the last rendered frame are touched
+        previous_frame = self._visible_frame
+        if not self._cumulative:
+            # Frames before the first collection (ie. iterators which start with no shapes) show
+            #   nothing
+            if previous_frame is not None:
+                previous_collection = self._get_frame_collection(previous_frame)
+                if previous_collection is not None:
+                    previous_collection.set_visible(False)
+
+            frame_collection = self._get_frame_collection(frame_num)
+            if frame_collection is not None:
+                frame_collection.set_visible(True)
+        else:
+            if previous_frame is None:
+                changed_frames = range(0, len(self._render_cache))
+            else:
+                changed_frames = range(min(previous_frame, frame_num),
+                                       max(previous_frame, frame_num) + 1)
+
+            for frame_counter in changed_frames:
+                frame_collection = self._render_cache[frame_counter]
+                if frame_collection is not None:
+                    frame_collection.set_visible(frame_counter <= frame_num)
+
+        self._visible_frame = frame_num
+
+    def render_to_cache(self):
+        try:
+            iteration_data = self._fractal_iterator.__next__()
+        except StopIteration:
+            iteration_data = None
+            self._iterations_complete = True
+
+        # Frames without new shapes are cached as None and display the last available collection
+        if iteration_data is None:
+            self._render_cache.append(None)
+            return
+
+        if iteration_data.closed:
+            frame_collection = build_poly_collection(iteration_data.vertices, self._line_width,
+                                                     self._fill)
+        else:
+            frame_collection = build_line_collection(iteration_data.vertices, self._line_width)
+
+        self._render_axes.add_collection(frame_collection)
+        self._render_cache.append(frame_collection)
+
+    def _get_frame_collection(self, frame_num):
+        """
+        Returns the collection displayed for a frame (the last one cached up to the frame) or None
+          if no collection was cached up to the frame
+        """
+        for frame_counter in range(frame_num, -1, -1):
+            frame_collection = self._render_cache[frame_counter]
+            if frame_collection is not None:
+                return frame_collection
+
+        return None
@@ -1,12 +1,25 @@
+import os
+import tempfile
+
 import numpy
 
 from .base.cached_renderer import CachedRenderer
 from ..data_models.image_params import ImageParams
+from ..data_models.escape_index_iteration_data import EscapeIndexIterationData
+from ..data_models.density_iteration_data import DensityIterationData
+from ..helpers.color_tools import build_equalized_color_lut, build_listed_color_map
+from ..helpers.escape_map_tools import build_escape_frame
 from ..helpers.list_tools import update_indexes_with_value, remove_indexes
+from ..functionality.persistent_render_cache import build_render_cache_key
 
 _IMAGE_ORIGIN = "upper"
 
 class CachedImageRenderer(CachedRenderer):
+    """
+    Renderer for Escape Time & Density Fractals which caches one image per iteration; image_axes
+      may be None to render into the cache only (ie. worker processes or command line jobs without
+      a display)
+    """
 
     _dimension_params = None
     _image_params = None
@@ -14,7 +27,14 @@ class CachedImageRenderer(CachedRenderer):
     _image_array = None
     _image_canvas = None
 
-    def __init__(self, image_axes, fractal_iterable, dimension_params, image_params=None):
+    _persistent_cache = None
+    _loaded_escape_map = None
+    _loaded_escape_map_resumable = False
+    _density_frames = False
+    _escape_counts = None
+
+    def __init__(self, image_axes, fractal_iterable, dimension_params, image_params=None,
+                 persistent_cache=None):
         super().__init__(image_axes)
 
         if image_params is None:
@@ -22,61 +42,349 @@ class CachedImageRenderer(CachedRenderer):
 
         self._dimension_params = dimension_params
         self._image_params = image_params
+        self._persistent_cache = persistent_cache
 
-        temp_image = numpy.zeros([self._dimension_params.width, self._dimension_params.height],
-                                  dtype=int)
-        self._image_canvas = self._render_axes.imshow(temp_image.T, cmap=self._image_params.color_map)
+        if self._render_axes is not None:
+            temp_image = numpy.zeros([self._dimension_params.width,
+                                      self._dimension_params.height], dtype=int)
+            self._image_canvas = self._render_axes.imshow(temp_image.T,
+                                                          cmap=self._image_params.color_map)
 
         self.initialize(fractal_iterable)
 
     def initialize(self, fractal_iterable):
-        super().initialize(fractal_iterable)
+        with self._render_lock:
+            super().initialize(fractal_iterable)
 
-        image_array = numpy.zeros([self._dimension_params.width, self._dimension_params.height],
-                                  dtype=int)
-        image_array = numpy.add(image_array, self._image_params.initial_value)
-        self._image_array = image_array
+            self._loaded_escape_map = None
+            self._loaded_escape_map_resumable = False
+            self._density_frames = False
+            self._escape_counts = [0]
+
+            image_array = numpy.zeros([self._dimension_params.width,
+                                       self._dimension_params.height], dtype=int)
+            image_array = numpy.add(image_array, self._image_params.initial_value)
+            self._image_array = image_array
+
+            initial_image = numpy.copy(self._image_array)
+            rotated_image = initial_image.T
+            self._render_cache.append(rotated_image)
+            self._display_image(rotated_image, 0)
 
-        initial_image = numpy.copy(self._image_array)
-        rotated_image = initial_image.T
-        self._render_cache.append(rotated_image)
-        self._image_canvas.set_data(rotated_image)
-        self._image_canvas.autoscale()
-        
     def render_to_canvas(self, frame_num, canvas):
+        frame_num = self._get_available_frame_num(frame_num)
+        frame_image = self.get_frame_image(frame_num)
+        self._display_image(frame_image, frame_num)
+
+    def get_frame_image(self, frame_num):
+        """
+        Returns the cached image of a frame, rendering it first if required
+
+        Parameters :
+          * frame_num - The frame to return
+        """
         if frame_num >= len(self._render_cache):
-            for frame_counter in range(len(self._render_cache), frame_num + 1):
-                self.render_to_cache()
+            with self._render_lock:
+                for frame_counter in range(len(self._render_cache), frame_num + 1):
+                    self.render_to_cache()
 
-        frame_image = self._render_cache[frame_num]
-        self._image_canvas.set_data(frame_image)
-        self._image_canvas.autoscale()
+        return self._get_frame_image(frame_num)
+
+    def get_image_params(self):
+        return self._image_params
+
+    def get_escape_map(self):
+        """
+        Returns the array of shape (width, height) containing the frame each pixel escaped on
+          (initial_value for pixels which have not escaped) of every frame rendered so far, or None
+          for density frames
+        """
+        if self._density_frames:
+            return None
+        if self._loaded_escape_map is not None and not self._loaded_escape_map_resumable:
+            return self._loaded_escape_map
+
+        return self._image_array
+
+    def get_escape_counts(self):
+        """
+        Returns the list of the number of pixels which escaped on each cached frame (frame 0
+          first), maintained as frames are rendered so histogram equalized colors never require a
+          pass over the image
+        """
+        return self._escape_counts
+
+    def get_cache_byte_count(self):
+        # Frames repeated after the iterations complete share one image
+        frame_images = {id(frame_image): frame_image for frame_image in self._render_cache
+                        if frame_image is not None}
+        return sum(frame_image.nbytes for frame_image in frame_images.values())
+
+    def evict_frame(self, frame_num):
+        """
+        Drops the cached image of a frame to free memory (ie. for a RenderScheduler memory budget)
+          & returns the number of bytes released; evicted frames are rebuilt from the escape map
+          when displayed again, so density frames are never evicted
+
+        Parameters :
+          * frame_num - The frame to evict
+        """
+        with self._render_lock:
+            frame_image = self._render_cache[frame_num]
+            if frame_image is None or self._density_frames:
+                return 0
+
+            self._render_cache[frame_num] = None
+
+            # Frames repeated after the iterations complete share one image, which is only freed
+            #   once every frame sharing it is evicted
+            if any(cached_image is frame_image for cached_image in self._render_cache):
+                return 0
+            return frame_image.nbytes
+
+    def preheat_render_cache(self, max_iterations):
+        persistent_cache = self._persistent_cache
+        if persistent_cache is None or len(self._render_cache) > 1:
+            super().preheat_render_cache(max_iterations)
+            return
+
+        cache_key = build_render_cache_key(self._fractal_iterable, max_iterations,
+                                           self._image_params)
+        escape_map = persistent_cache.load(cache_key)
+        if escape_map is not None:
+            self._load_escape_map(escape_map, max_iterations)
+            return
+
+        super().preheat_render_cache(max_iterations)
+        if not self._density_frames and (len(self._render_cache) == max_iterations or
+                                         self._iterations_complete):
+            persistent_cache.store(cache_key, self._image_array)
+
+    def extend_iterations(self, iteration_count):
+        """
+        Renders iteration_count more frames by continuing from the current iterator state, raising
+          the max_iterations of the fractal iterable if required
+
+        Parameters :
+          * iteration_count - The number of frames to add
+        """
+        with self._render_lock:
+            if self._loaded_escape_map is not None and not self._loaded_escape_map_resumable:
+                self._discard_loaded_escape_map()
+
+            # Frames repeated after the iterator stopped are dropped first, so they are not
+            #   counted as frames & the frames rendered next are numbered after the last
+            #   iteration (every iterator counts its iterations)
+            next_iteration = getattr(self._fractal_iterator, "_next_iteration", None)
+            if next_iteration is not None:
+                self._truncate_render_cache(next_iteration + 1)
+
+            # The first frame is the initial image, so frame_count frames need one iteration less
+            frame_count = len(self._render_cache) + iteration_count
+            max_iterations = self._fractal_iterable.get_max_iterations()
+            if max_iterations is not None and max_iterations < frame_count - 1:
+                self._fractal_iterable.set_max_iterations(frame_count - 1)
+                self._fractal_iterator.set_max_iterations(frame_count - 1)
+
+            self._iterations_complete = False
+
+        self.preheat_render_cache(frame_count)
+
+    def save_checkpoint(self, checkpoint_path):
+        """
+        Saves the iterator state, escape map & frame count to a .npz file so the render can be
+          continued later (ie. after a crash or in another process) using load_checkpoint; the
+          file is replaced atomically so an interrupted save never corrupts a previous checkpoint
+
+        Parameters :
+          * checkpoint_path - Path of the checkpoint file
+        """
+        fractal_iterator = self._fractal_iterator
+        if self._density_frames or not hasattr(fractal_iterator, "get_state"):
+            raise NotImplementedError("Checkpoints require a Fractal Formula iterator")
+
+        checkpoint = {"iterator_" + name: value
+                      for name, value in fractal_iterator.get_state().items()}
+        checkpoint["render_key"] = build_render_cache_key(self._fractal_iterable, 0,
+                                                          self._image_params)
+        checkpoint["frame_count"] = len(self._render_cache)
+        checkpoint["iterations_complete"] = self._iterations_complete
+        checkpoint["image_array"] = self._image_array
+
+        # Pixel coordinates are only compacted when iterators report exploded index masks
+        if not self._fractal_iterable.get_escape_index_output():
+            checkpoint["x_indexes"] = self._dimension_params.x_indexes
+            checkpoint["y_indexes"] = self._dimension_params.y_indexes
+
+        checkpoint_directory = os.path.dirname(os.path.abspath(checkpoint_path))
+        temp_descriptor, temp_path = tempfile.mkstemp(dir=checkpoint_directory)
+        try:
+            with os.fdopen(temp_descriptor, "wb") as checkpoint_file:
+                numpy.savez(checkpoint_file, **checkpoint)
+            os.replace(temp_path, checkpoint_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def load_checkpoint(self, checkpoint_path):
+        """
+        Restores a render saved with save_checkpoint; the renderer must render a fractal iterable
+          with the same parameters as the renderer which saved the checkpoint
+
+        Parameters :
+          * checkpoint_path - Path of the checkpoint file
+        """
+        with numpy.load(checkpoint_path) as checkpoint_file:
+            checkpoint = {name: checkpoint_file[name] for name in checkpoint_file.files}
+
+        # Scalars are stored as 0 dimensional arrays
+        for name, value in checkpoint.items():
+            if value.ndim == 0:
+                checkpoint[name] = value.item()
+
+        render_key = build_render_cache_key(self._fractal_iterable, 0, self._image_params)
+        if checkpoint["render_key"] != render_key:
+            raise ValueError("Checkpoint {} belongs to a different render".format(checkpoint_path))
+
+        iterator_state = {name[len("iterator_"):]: value for name, value in checkpoint.items()
+                          if name.startswith("iterator_")}
+        with self._render_lock:
+            self.initialize(self._fractal_iterable)
+            self._fractal_iterator.restore_state(iterator_state)
+
+            self._image_array = checkpoint["image_array"]
+            if "x_indexes" in checkpoint:
+                self._dimension_params.x_indexes = checkpoint["x_indexes"]
+                self._dimension_params.y_indexes = checkpoint["y_indexes"]
+
+            # Frames before the checkpoint are rebuilt from a copy of the escape map when displayed
+            self._iterations_complete = checkpoint["iterations_complete"]
+            self._load_escape_map(numpy.copy(self._image_array), checkpoint["frame_count"])
+            self._loaded_escape_map_resumable = True
 
     def render_to_cache(self):
-        iteration_data = self._fractal_iterator.__next__()
+        if self._loaded_escape_map is not None and not self._loaded_escape_map_resumable:
+            self._discard_loaded_escape_map()
+
+        try:
+            iteration_data = self._fractal_iterator.__next__()
+        except StopIteration:
+            iteration_data = None
+            self._iterations_complete = True
+
         frame_num = len(self._render_cache)
 
         if iteration_data is None:
             last_image = self._render_cache[-1]
             self._render_cache.append(last_image)
+            self._escape_counts.append(0)
+        elif isinstance(iteration_data, DensityIterationData):
+            # Densities span several orders of magnitude so they are displayed logarithmically
+            density_image = numpy.log1p(iteration_data.histogram)
+            self._density_frames = True
+            self._render_cache.append(density_image.T)
+            self._escape_counts.append(0)
+        elif isinstance(iteration_data, EscapeIndexIterationData):
+            escaped_pixel_indexes = iteration_data.escaped_pixel_indexes
+            raster_indexes = self._dimension_params.get_raster_indexes()
+            if raster_indexes is not None:
+                # Morton ordered iterators report positions in the order rather than pixels
+                escaped_pixel_indexes = raster_indexes[escaped_pixel_indexes]
+            numpy.put(self._image_array, escaped_pixel_indexes, frame_num)
+            self._escape_counts.append(escaped_pixel_indexes.size)
+            self._cache_image(frame_num)
         else:
             dimension_params = self._dimension_params
             exploded_indexes = iteration_data.exploded_indexes
             exploded_x_indexes = dimension_params.x_indexes[exploded_indexes]
             exploded_y_indexes = dimension_params.y_indexes[exploded_indexes]
             self._image_array[exploded_x_indexes, exploded_y_indexes] = frame_num
-
-            if self._image_params.recolor_image:
-                final_image = update_indexes_with_value(self._image_array,
-                                                        self._image_params.initial_value,
-                                                        frame_num + 1)
-            else:
-                final_image = numpy.copy(self._image_array)
-            rotated_image = final_image.T
-            self._render_cache.append(rotated_image)
+            self._escape_counts.append(exploded_x_indexes.size)
+            self._cache_image(frame_num)
 
             reducable_arrays = [dimension_params.x_indexes, dimension_params.y_indexes]
             remaining_indexes = iteration_data.remaining_indexes
             reduced_arrays = remove_indexes(reducable_arrays, remaining_indexes)
             dimension_params.x_indexes = reduced_arrays[0]
             dimension_params.y_indexes = reduced_arrays[1]
+
+    def _get_available_frame_num(self, frame_num):
+        # With a frame producer attached, playback shows the nearest cached frame while the
+        #   producer catches up instead of rendering the missing frames on the UI thread
+        frame_producer = self._frame_producer
+        if frame_producer is None:
+            return frame_num
+
+        frame_producer.request_frame(frame_num)
+        return min(frame_num, len(self._render_cache) - 1)
+
+    def _cache_image(self, frame_num):
+        if self._image_params.recolor_image:
+            final_image = update_indexes_with_value(self._image_array,
+                                                    self._image_params.initial_value,
+                                                    frame_num + 1)
+        else:
+            final_image = numpy.copy(self._image_array)
+        rotated_image = final_image.T
+        self._render_cache.append(rotated_image)
+
+    def _display_image(self, frame_image, frame_num):
+        if self._image_canvas is None:
+            return
+
+        self._image_canvas.set_data(frame_image)
+        if not self._image_params.equalize_histogram or self._density_frames:
+            self._image_canvas.autoscale()
+            return
+
+        # Every integer value of the frame gets its own color of the equalized color map
+        min_value, color_lut = self._get_equalized_color_lut(frame_num)
+        self._image_canvas.set_cmap(build_listed_color_map(color_lut))
+        self._image_canvas.set_clim(min_value - 0.5, frame_num + 1.5)
+
+    def _get_equalized_color_lut(self, frame_num):
+        """
+        Returns [min_value, color_lut] where color_lut contains the histogram equalized color of
+          every value of a frame from min_value to frame_num + 1
+
+        Parameters :
+          * frame_num - The frame being colored
+        """
+        min_value = min(self._image_params.initial_value, 0)
+        color_lut = build_equalized_color_lut(self._image_params.color_map,
+                                              self._escape_counts[:frame_num + 1], min_value)
+        return [min_value, color_lut]
+
+    def _get_frame_image(self, frame_num):
+        frame_image = self._render_cache[frame_num]
+        if frame_image is None:
+            # Frames of a loaded escape map & evicted frames are rebuilt from the escape map
+            frame_image = build_escape_frame(self.get_escape_map(), frame_num,
+                                             self._image_params.initial_value,
+                                             self._image_params.recolor_image).T
+            self._render_cache[frame_num] = frame_image
+
+        return frame_image
+
+    def _truncate_render_cache(self, frame_count):
+        del self._render_cache[frame_count:]
+        del self._escape_counts[frame_count:]
+
+    def _load_escape_map(self, escape_map, frame_count):
+        # Frames are rebuilt from the memory mapped escape map the first time they are displayed
+        self._loaded_escape_map = escape_map
+        self._render_cache.extend([None] * (frame_count - len(self._render_cache)))
+
+        # One pass over the loaded escape map restores the escape counts of its frames
+        escape_values = escape_map[(escape_map != self._image_params.initial_value) &
+                                   (escape_map > 0)]
+        escape_counts = numpy.bincount(escape_values.ravel(), minlength=frame_count)
+        self._escape_counts = escape_counts[:frame_count].tolist()
+
+    def _discard_loaded_escape_map(self):
+        # The iterator state behind a loaded escape map is not persisted, so continuing past the
+        #   loaded frames recomputes them from the first iteration
+        frame_count = len(self._render_cache)
+        self.initialize(self._fractal_iterable)
+        for frame_counter in range(1, frame_count):
+            self.render_to_cache()
@@ -0,0 +1,230 @@
+"""
+Fractimation specific Exponential Zoom Renderer
+
+Public Classes :
+  * ExponentialZoomRenderer - Renders zoom videos by resampling a single log-polar strip
+"""
+
+import copy
+import math
+
+import numpy
+
+from .base.fractimation_renderer import FractimationRenderer
+from ..data_models.complex_range import ComplexRange
+from ..data_models.image_params import ImageParams
+from ..data_models.polar_range_params import PolarRangeParams
+from ..helpers.escape_map_tools import compute_escape_map
+from ..helpers.formula_tools import generate_range_axes
+from ..helpers.polar_tools import generate_polar_complex_range, sample_log_polar_image
+
+_DEFAULT_STRIP_RESOLUTION = 1.0
+_DEFAULT_BATCH_SIZE = 1000000
+_NOT_ESCAPED_VALUE = 0
+
+def _is_single_value(complex_range_params):
+    return (complex_range_params.min_real_number == complex_range_params.max_real_number and
+            complex_range_params.min_imaginary_number ==
+            complex_range_params.max_imaginary_number)
+
+def _build_constant_range(complex_range_params, shape):
+    return ComplexRange(numpy.full(shape, complex_range_params.min_real_number, dtype=float),
+                        numpy.full(shape, complex_range_params.min_imaginary_number, dtype=float))
+
+class ExponentialZoomRenderer(FractimationRenderer):
+    """
+    Renderer for zoom videos of Escape Time Fractals.  Instead of iterating every frame, a single
+      "exponential map" strip is iterated once on a log-polar grid around the zoom center which
+      spans the radii of the first frame down to half a pixel of the last frame.  Every frame is
+      resampled from the strip, so the cost of the video is roughly the pixel count of the strip
+      instead of the frame count times the pixel count of a frame.
+
+    The first frame is the view of the fractal iterable; frame_num selects the zoom step instead of
+      the iteration.
+
+    Public Methods :
+      * get_frame_image - Returns the image of a frame
+      * get_frame_count - Returns the number of frames of the zoom
+      * get_strip_image - Returns the escape map of the log-polar strip
+      * get_polar_range_params - Returns the PolarRangeParams of the strip
+    """
+
+    _zoom_factor = None
+    _frame_count = None
+    _max_iterations = None
+    _image_params = None
+    _zoom_center = None
+    _strip_resolution = None
+    _batch_size = None
+
+    _polar_range_params = None
+    _strip_image = None
+    _view_range_params = None
+    _image_canvas = None
+
+    def __init__(self, render_axes, fractal_iterable, zoom_factor, frame_count, max_iterations,
+                 image_params=None, zoom_center=None, strip_resolution=_DEFAULT_STRIP_RESOLUTION,
+                 batch_size=_DEFAULT_BATCH_SIZE):
+        """
+        Constructor
+
+        Parameters :
+          * render_axes - The Matplotlib Axes to display frames in (None to only compute frames)
+          * fractal_iterable - The FractalFormulaIterable whose view is the first frame
+          * zoom_factor - Magnification of the last frame relative to the first frame
+          * frame_count - Number of frames of the zoom
+          * max_iterations - Number of iterations of the strip
+          * image_params (optional) - The ImageParams of the frames
+          * zoom_center (optional) - [real, imaginary] point the zoom converges on (default is the
+              center of the view)
+          * strip_resolution (optional) - Scale of the number of strip samples relative to the
+              density needed to match the frame resolution
+          * batch_size (optional) - Maximum number of strip samples iterated at once
+        """
+        super().__init__(render_axes)
+
+        if image_params is None:
+            image_params = ImageParams()
+
+        self._zoom_factor = zoom_factor
+        self._frame_count = frame_count
+        self._max_iterations = max_iterations
+        self._image_params = image_params
+        self._zoom_center = zoom_center
+        self._strip_resolution = strip_resolution
+        self._batch_size = batch_size
+
+        self.initialize(fractal_iterable)
+
+    def initialize(self, fractal_iterable):
+        super().initialize(fractal_iterable)
+
+        self._view_range_params = fractal_iterable.get_view_range_params()
+        self._render_strip()
+
+        if self._render_axes is not None:
+            first_image = self.get_frame_image(0)
+            if self._image_canvas is None:
+                self._image_canvas = self._render_axes.imshow(first_image.T,
+                                                              cmap=self._image_params.color_map)
+            else:
+                self._image_canvas.set_data(first_image.T)
+
+            # Every frame shares the value range of the strip so colors stay stable while zooming
+            self._image_canvas.set_clim(numpy.min(self._strip_image),
+                                        numpy.max(self._strip_image))
+
+    def get_frame_count(self):
+        return self._frame_count
+
+    def get_strip_image(self):
+        return self._strip_image
+
+    def get_polar_range_params(self):
+        return self._polar_range_params
+
+    def get_frame_image(self, frame_num):
+        """
+        Returns a float array of shape (width, height) containing a frame resampled from the strip
+
+        Parameters :
+          * frame_num - The zoom step of the frame
+        """
+        frame_scale = self._get_frame_scale(frame_num)
+        center_real, center_imaginary = self._get_zoom_center()
+        dimension_params = self._fractal_iterable.get_dimension_params()
+        real_axis, imaginary_axis = generate_range_axes(self._view_range_params, dimension_params)
+
+        # Frames are the view scaled around the zoom center
+        frame_real_axis = center_real + (real_axis - center_real) * frame_scale
+        frame_imaginary_axis = center_imaginary + (imaginary_axis - center_imaginary) * frame_scale
+        return sample_log_polar_image(self._strip_image, self._polar_range_params,
+                                      frame_real_axis, frame_imaginary_axis)
+
+    def render_to_canvas(self, frame_num, canvas):
+        self._image_canvas.set_data(self.get_frame_image(frame_num).T)
+
+    def _get_zoom_center(self):
+        if self._zoom_center is not None:
+            return self._zoom_center
+
+        view_range_params = self._view_range_params
+        return [(view_range_params.min_real_number + view_range_params.max_real_number) / 2,
+                (view_range_params.min_imaginary_number +
+                 view_range_params.max_imaginary_number) / 2]
+
+    def _get_frame_scale(self, frame_num):
+        if self._frame_count < 2:
+            return 1.0
+
+        return self._zoom_factor ** (-frame_num / (self._frame_count - 1))
+
+    def _render_strip(self):
+        fractal_iterable = self._fractal_iterable
+        view_range_params = self._view_range_params
+        dimension_params = fractal_iterable.get_dimension_params()
+        width, height = dimension_params.width, dimension_params.height
+
+        z_values_range_params = fractal_iterable.get_z_values_range_params()
+        c_values_range_params = fractal_iterable.get_c_values_range_params()
+        view_is_z_values = view_range_params is z_values_range_params
+        constant_range_params = c_values_range_params if view_is_z_values else \
+            z_values_range_params
+        if not _is_single_value(constant_range_params):
+            raise ValueError("Exponential zoom requires either the z or c values to be constant")
+
+        # The strip spans the corners of the first frame down to half a pixel of the last frame
+        center_real, center_imaginary = self._get_zoom_center()
+        max_radius = max(math.hypot(corner_real - center_real, corner_imaginary - center_imaginary)
+                         for corner_real in [view_range_params.min_real_number,
+                                             view_range_params.max_real_number]
+                         for corner_imaginary in [view_range_params.min_imaginary_number,
+                                                  view_range_params.max_imaginary_number])
+        pixel_size = min(abs(view_range_params.max_real_number -
+                             view_range_params.min_real_number) / max(width - 1, 1),
+                         abs(view_range_params.max_imaginary_number -
+                             view_range_params.min_imaginary_number) / max(height - 1, 1))
+        min_radius = pixel_size / self._zoom_factor / 2
+
+        # Square log-polar cells match the frame resolution at the corners of every frame
+        angle_count = int(math.ceil(math.pi * math.hypot(width, height) * self._strip_resolution))
+        radius_step = 2 * math.pi / angle_count
+        radius_count = int(math.ceil(math.log(max_radius / min_radius) / radius_step)) + 1
+
+        polar_range_params = PolarRangeParams(center_real, center_imaginary, min_radius,
+                                              max_radius)
+        interior_value = self._image_params.initial_value
+        if self._image_params.recolor_image:
+            interior_value = self._max_iterations + 1
+
+        # Every band runs max_iterations so an adaptive budget must not stop bands early
+        strip_iterable = copy.copy(fractal_iterable)
+        strip_iterable.set_iteration_budget_params(None)
+
+        strip_image = numpy.empty([angle_count, radius_count], dtype=float)
+        radii_per_batch = max(1, self._batch_size // angle_count)
+        for radius_start in range(0, radius_count, radii_per_batch):
+            radius_stop = min(radius_start + radii_per_batch, radius_count)
+            # Bands are flattened since polar grids have no symmetry the iterators could detect
+            polar_range = generate_polar_complex_range(polar_range_params, angle_count,
+                                                       radius_count, radius_start,
+                                                       radius_stop)
+            polar_range = ComplexRange(polar_range.real_number_values.ravel(),
+                                       polar_range.imaginary_number_values.ravel())
+            constant_range = _build_constant_range(constant_range_params,
+                                                   polar_range.real_number_values.shape)
+            if view_is_z_values:
+                fractal_iterator = strip_iterable.create_iterator(polar_range, constant_range)
+            else:
+                fractal_iterator = strip_iterable.create_iterator(constant_range, polar_range)
+
+            band_escape_map, iteration_count = compute_escape_map(
+                fractal_iterator, polar_range.real_number_values.size, self._max_iterations,
+                _NOT_ESCAPED_VALUE)
+            band_escape_map = numpy.where(band_escape_map == _NOT_ESCAPED_VALUE, interior_value,
+                                          band_escape_map)
+            strip_image[:, radius_start:radius_stop] = band_escape_map.reshape(
+                angle_count, radius_stop - radius_start)
+
+        self._polar_range_params = polar_range_params
+        self._strip_image = strip_image
@@ -2,5 +2,6 @@
 Fractimation UI Subpackage contains modules and classes related to Fractimation's User Interface
 
 Public Modules :
+  * julia_preview_handler - Contains class for showing a live Julia Set preview under the mouse
   * zoom_handler - Contains class for managing the Complex Range Zoom Functionality
 """
@@ -0,0 +1,304 @@
+"""
+Fractimation specific Julia Preview Functionality Class
+
+Public Classes :
+  * JuliaPreviewHandler - Class to show a live Julia Set preview of the c value under the mouse
+"""
+
+import collections
+import copy
+import threading
+
+import numpy
+
+from ..data_models.complex_range import ComplexRange
+from ..data_models.complex_range_params import ComplexRangeParams
+from ..data_models.dimension_params import DimensionParams
+from ..helpers.escape_map_tools import compute_escape_map
+from ..helpers.formula_tools import generate_complex_range, generate_range_axes
+
+_DEFAULT_PREVIEW_SIZE = 96
+_DEFAULT_PREVIEW_ITERATIONS = 32
+_DEFAULT_PREVIEW_RANGE = 1.6
+_DEFAULT_CACHE_SIZE = 256
+_DEFAULT_REFRESH_INTERVAL = 15
+_NOT_ESCAPED_VALUE = 0
+
+class JuliaPreviewHandler(object):
+    """
+    Julia Preview Functionality handler for Fractimation; while the mouse moves over the view of a
+      Multibrot style renderer (a constant z & a range of c values), a low resolution Julia Set of
+      the c value under the pointer is shown in a separate axes.
+
+    Motion events only look up the preview cache, so they stay cheap at mouse move event rates.
+      Cache misses are rendered on a background thread which abandons a preview as soon as the
+      pointer moves to another c value; finished previews are displayed by a canvas timer on the
+      UI thread.  c values are quantized (by default to the pixel size of the view) so nearby
+      pointer positions share cached previews.
+
+    Public Methods :
+      * preview_c_value - Shows the preview of a c value (rendering it in the background if needed)
+      * get_preview_c_value - Returns the quantized c value of the preview being shown
+      * get_preview_image - Returns the escape map of a quantized c value if it is cached
+      * disconnect - Stops handling motion events & stops the background thread
+
+    Private Methods :
+      * _handle_mouse_motion - Method to handle mouse motion events; attached to Matplotlib
+          motion_notify_event
+      * _refresh_preview - Method displaying finished previews; attached to a canvas timer
+    """
+
+    _renderer = None
+    _preview_axes = None
+    _preview_iterations = None
+    _quantization_step = None
+    _cache_size = None
+
+    _preview_z_values_range = None
+    _preview_canvas = None
+    _preview_cache = None
+    _shown_c_value = None
+
+    _condition = None
+    _requested_c_value = None
+    _request_generation = 0
+    _finished_c_value = None
+    _stopped = False
+    _worker_thread = None
+
+    _refresh_timer = None
+    _connection_id = None
+
+    def __init__(self, renderer, preview_axes, preview_width=_DEFAULT_PREVIEW_SIZE,
+                 preview_height=_DEFAULT_PREVIEW_SIZE,
+                 preview_iterations=_DEFAULT_PREVIEW_ITERATIONS, z_values_range_params=None,
+                 quantization_step=None, cache_size=_DEFAULT_CACHE_SIZE,
+                 refresh_interval=_DEFAULT_REFRESH_INTERVAL):
+        """
+        Constructor
+
+        Parameters :
+          * renderer - The fractal renderer whose view supplies the c values
+          * preview_axes - The Matplotlib Axes the preview is shown in (None to only compute
+              previews)
+          * preview_width (optional) - Width of the preview in pixels
+          * preview_height (optional) - Height of the preview in pixels
+          * preview_iterations (optional) - Number of iterations of each preview
+          * z_values_range_params (optional) - Range of z values of the preview
+          * quantization_step (optional) - Spacing of the c values which are previewed (default is
+              the pixel size of the view)
+          * cache_size (optional) - Number of previews kept in the cache
+          * refresh_interval (optional) - Milliseconds between checks for finished previews
+        """
+        if z_values_range_params is None:
+            z_values_range_params = ComplexRangeParams(-_DEFAULT_PREVIEW_RANGE,
+                                                       _DEFAULT_PREVIEW_RANGE,
+                                                       -_DEFAULT_PREVIEW_RANGE,
+                                                       _DEFAULT_PREVIEW_RANGE)
+
+        self._renderer = renderer
+        self._preview_axes = preview_axes
+        self._preview_iterations = preview_iterations
+        self._quantization_step = quantization_step
+        self._cache_size = cache_size
+
+        preview_dimension_params = DimensionParams(preview_width, preview_height)
+        self._preview_z_values_range = generate_complex_range(z_values_range_params,
+                                                              preview_dimension_params)
+        self._preview_cache = collections.OrderedDict()
+        self._condition = threading.Condition()
+
+        if preview_axes is not None:
+            empty_image = numpy.zeros([preview_height, preview_width], dtype=int)
+            self._preview_canvas = preview_axes.imshow(empty_image, vmin=_NOT_ESCAPED_VALUE,
+                                                       vmax=preview_iterations + 1)
+
+            figure_canvas = preview_axes.figure.canvas
+            self._refresh_timer = figure_canvas.new_timer(interval=refresh_interval)
+            self._refresh_timer.add_callback(self._refresh_preview)
+
+            view_canvas = renderer.get_render_axes().figure.canvas
+            self._connection_id = view_canvas.mpl_connect("motion_notify_event",
+                                                          self._handle_mouse_motion)
+
+        self._worker_thread = threading.Thread(target=self._render_previews, daemon=True)
+        self._worker_thread.start()
+
+    def get_preview_c_value(self):
+        return self._shown_c_value
+
+    def get_preview_image(self, c_value):
+        """
+        Returns the cached escape map of shape (preview_width, preview_height) of a quantized c
+          value or None if it has not been rendered
+
+        Parameters :
+          * c_value - The quantized c value
+        """
+        with self._condition:
+            return self._preview_cache.get(c_value)
+
+    def preview_c_value(self, c_value):
+        """
+        Shows the preview of a c value immediately if it is cached, otherwise requests it from the
+          background thread (cancelling any preview still being rendered); returns the quantized
+          c value
+
+        Parameters :
+          * c_value - The complex c value to preview
+        """
+        quantized_c_value = self._quantize_c_value(c_value)
+        with self._condition:
+            preview_image = self._preview_cache.get(quantized_c_value)
+            if preview_image is not None:
+                self._preview_cache.move_to_end(quantized_c_value)
+                if self._requested_c_value is not None:
+                    # The preview being rendered is stale once a cached preview is shown
+                    self._requested_c_value = None
+                    self._request_generation += 1
+            elif quantized_c_value != self._requested_c_value:
+                self._requested_c_value = quantized_c_value
+                self._request_generation += 1
+                self._condition.notify_all()
+
+        if preview_image is not None:
+            self._show_preview(quantized_c_value, preview_image)
+        elif self._refresh_timer is not None:
+            self._refresh_timer.start()
+
+        return quantized_c_value
+
+    def disconnect(self):
+        with self._condition:
+            self._stopped = True
+            self._request_generation += 1
+            self._condition.notify_all()
+
+        if self._connection_id is not None:
+            self._renderer.get_render_axes().figure.canvas.mpl_disconnect(self._connection_id)
+            self._connection_id = None
+        if self._refresh_timer is not None:
+            self._refresh_timer.stop()
+
+        self._worker_thread.join()
+
+    def _handle_mouse_motion(self, event_data):
+        """
+        Handles the Mouse Motion event
+        """
+        if event_data.inaxes is not self._renderer.get_render_axes() or event_data.xdata is None:
+            return
+
+        self.preview_c_value(self._get_c_value(event_data.xdata, event_data.ydata))
+
+    def _refresh_preview(self):
+        """
+        Displays the preview finished by the background thread, if it is still the latest request
+        """
+        with self._condition:
+            finished_c_value = self._finished_c_value
+            self._finished_c_value = None
+            waiting = self._requested_c_value is not None
+            preview_image = None
+            if finished_c_value is not None:
+                preview_image = self._preview_cache.get(finished_c_value)
+
+        if preview_image is not None:
+            self._show_preview(finished_c_value, preview_image)
+        if not waiting and self._refresh_timer is not None:
+            self._refresh_timer.stop()
+
+    def _show_preview(self, c_value, preview_image):
+        self._shown_c_value = c_value
+        if self._preview_canvas is None:
+            return
+
+        self._preview_canvas.set_data(preview_image.T)
+        self._preview_canvas.figure.canvas.draw_idle()
+
+    def _get_c_value(self, x_position, y_position):
+        """
+        Returns the c value at a fractional pixel position of the view
+
+        Parameters :
+          * x_position - Pixel position along the first axis of the view
+          * y_position - Pixel position along the second axis of the view
+        """
+        fractal_iterable = self._renderer.get_fractal_iterable()
+        c_values_range_params = fractal_iterable.get_c_values_range_params()
+        real_axis, imaginary_axis = generate_range_axes(c_values_range_params,
+                                                        fractal_iterable.get_dimension_params(),
+                                                        fractal_iterable.get_exploit_symmetry())
+        real_number = numpy.interp(x_position, numpy.arange(real_axis.size), real_axis)
+        imaginary_number = numpy.interp(y_position, numpy.arange(imaginary_axis.size),
+                                        imaginary_axis)
+        return complex(real_number, imaginary_number)
+
+    def _quantize_c_value(self, c_value):
+        quantization_step = self._quantization_step
+        if quantization_step is None:
+            fractal_iterable = self._renderer.get_fractal_iterable()
+            c_values_range_params = fractal_iterable.get_c_values_range_params()
+            dimension_params = fractal_iterable.get_dimension_params()
+            quantization_step = abs(c_values_range_params.max_real_number -
+                                    c_values_range_params.min_real_number) / max(
+                                        dimension_params.width - 1, 1)
+            if quantization_step == 0:
+                return c_value
+
+        return complex(round(c_value.real / quantization_step) * quantization_step,
+                       round(c_value.imag / quantization_step) * quantization_step)
+
+    def _render_previews(self):
+        while True:
+            with self._condition:
+                while not self._stopped and self._requested_c_value is None:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+
+                c_value = self._requested_c_value
+                request_generation = self._request_generation
+
+            def is_cancelled():
+                return self._request_generation != request_generation
+
+            preview_image = self._render_preview(c_value, is_cancelled)
+
+            with self._condition:
+                if preview_image is not None:
+                    self._preview_cache[c_value] = preview_image
+                    while len(self._preview_cache) > self._cache_size:
+                        self._preview_cache.popitem(last=False)
+                if request_generation == self._request_generation:
+                    self._requested_c_value = None
+                    self._finished_c_value = c_value
+
+    def _render_preview(self, c_value, is_cancelled):
+        """
+        Returns the escape map of shape (preview_width, preview_height) of the Julia Set of a c
+          value or None if the preview was cancelled
+
+        Parameters :
+          * c_value - The c value of the Julia Set
+          * is_cancelled - Function returning whether the preview became stale
+        """
+        # Previews run a fixed number of iterations, so the adaptive budget is not used
+        preview_iterable = copy.copy(self._renderer.get_fractal_iterable())
+        preview_iterable.set_iteration_budget_params(None)
+
+        z_values_range = self._preview_z_values_range
+        preview_shape = z_values_range.real_number_values.shape
+        c_values_range = ComplexRange(numpy.full(preview_shape, c_value.real),
+                                      numpy.full(preview_shape, c_value.imag))
+
+        fractal_iterator = preview_iterable.create_iterator(z_values_range, c_values_range)
+        escape_map_result = compute_escape_map(fractal_iterator,
+                                               z_values_range.real_number_values.size,
+                                               self._preview_iterations, _NOT_ESCAPED_VALUE,
+                                               is_cancelled)
+        if escape_map_result is None:
+            return None
+
+        escape_map, iteration_count = escape_map_result
+        return escape_map.reshape(preview_shape)
@@ -42,6 +42,7 @@ class ZoomHandler(object):
 
     _zoomable_backend = None
     _viewer = None
+    _recorder = None
 
     _x_start = None
     _y_start = None
@@ -51,7 +52,8 @@ class ZoomHandler(object):
     _zoom_box = None
     _zoom_stack = None
 
-    def __init__(self, zoomable_backend, viewer, min_zoom_width=10, min_zoom_height=10):
+    def __init__(self, zoomable_backend, viewer, min_zoom_width=10, min_zoom_height=10,
+                 recorder=None):
         """
         Constructor
 
@@ -60,9 +62,13 @@ class ZoomHandler(object):
           * viewer - The PlotPlayer instance used for playback
           * min_zoom_width (optional) - Minimum zoom box width
           * min_zoom_height (optional) - Minimum zoom box height
+          * recorder (optional) - InteractionRecorder the confirmed zooms & undos are recorded to;
+              seeks & playback are recorded by the render function given to the viewer (see
+              InteractionRecorder.wrap_render_func)
         """
         self._zoomable_backend = zoomable_backend
         self._viewer = viewer
+        self._recorder = recorder
 
         animation_axes = self._viewer.get_render_manager().get_animation_axes()
         self._zoom_box = widgets.RectangleSelector(animation_axes, self.select_zoom_coords,
@@ -101,6 +107,8 @@ class ZoomHandler(object):
             return
 
         self._zoomable_backend.zoom_in(self._x_start, self._y_start, self._x_end, self._y_end)
+        if self._recorder is not None:
+            self._recorder.record_zoom_in(self._x_start, self._y_start, self._x_end, self._y_end)
         self._zoom_ready = False
         self._zoom_box.extents = (0, 0, 0, 0)
 
@@ -111,6 +119,8 @@ class ZoomHandler(object):
         Return to the previous Zoom Coordinates
         """
         if self._zoomable_backend.zoom_out():
+            if self._recorder is not None:
+                self._recorder.record_zoom_out()
             _restart_playback(self._viewer)
 
     def _handle_mouse_button_press(self, event_data):
@@ -0,0 +1,74 @@
+import numpy
+
+from fractimation.data_models.complex_range_params import ComplexRangeParams
+from fractimation.data_models.dimension_params import DimensionParams
+
+from fractimation.functionality.distributed_render import (TileRenderCoordinator,
+                                                           TileRenderWorker)
+
+from fractimation.helpers.escape_map_tools import compute_escape_map
+
+from fractimation.iterators.multibrot import Multibrot
+
+# Checks the error paths of distributed tile rendering with in-process workers : a worker whose
+#   render spec fails to load recovers once the coordinator sends the spec again, and a tile
+#   failing on every attempt fails the render instead of leaving wait() hanging
+width, height = 200, 120                # Width and Height of the image
+tile_size = 50                          # Width and Height of each tile
+max_iterations = 20                     # Iterations each tile runs
+wait_seconds = 30                       # Maximum seconds to wait for each render
+
+class FailingSpecWorker(TileRenderWorker):
+    """Worker whose first render spec load fails (ie. a transient import error)"""
+
+    load_count = 0
+
+    def _load_render_spec(self, render_spec):
+        self.load_count += 1
+        if self.load_count == 1:
+            raise ImportError("Render spec load failed")
+
+        return super()._load_render_spec(render_spec)
+
+class FailingTileWorker(TileRenderWorker):
+    """Worker failing every tile"""
+
+    def _render_tile(self, tile, max_iterations):
+        raise ArithmeticError("Tile render failed")
+
+image_dimensions = DimensionParams(width, height)
+c_values_params = ComplexRangeParams(-2.0, 0.5, -1.25, 1.25)
+fractal = Multibrot(c_values_params, image_dimensions, 2.0)
+
+expected_escape_map, iteration_count = compute_escape_map(
+    fractal.create_iterator(fractal.get_z_values_range(), fractal.get_c_values_range()),
+    width * height, max_iterations)
+expected_escape_map = expected_escape_map.reshape(width, height)
+
+coordinator = TileRenderCoordinator(fractal, max_iterations, tile_size, tile_size)
+coordinator.start()
+try:
+    worker = FailingSpecWorker(*coordinator.get_address())
+    worker.run()
+    escape_map = coordinator.wait(wait_seconds)
+finally:
+    coordinator.stop()
+
+tile_count = coordinator.get_progress()[1]
+if worker.get_rendered_tile_count() != tile_count:
+    raise SystemExit("Worker rendered {} of {} tiles after a failed spec load".format(
+        worker.get_rendered_tile_count(), tile_count))
+if not numpy.array_equal(escape_map, expected_escape_map):
+    raise SystemExit("Escape map differs from a local render after a failed spec load")
+print("Failed render spec load : worker recovered & rendered {} tiles".format(tile_count))
+
+coordinator = TileRenderCoordinator(fractal, max_iterations, tile_size, tile_size)
+coordinator.start()
+try:
+    FailingTileWorker(*coordinator.get_address()).run()
+    coordinator.wait(wait_seconds)
+    raise SystemExit("Render with failing tiles did not fail")
+except RuntimeError as render_error:
+    print("Failing tiles : render failed with '{}'".format(str(render_error).splitlines()[0]))
+finally:
+    coordinator.stop()
@@ -7,6 +7,7 @@ from plotplayer.managers.window_manager import WindowManager
 
 from fractimation.ui.zoom_handler import ZoomHandler
 from fractimation.functionality.zoomable_complex_range import ZoomableComplexRange
+from fractimation.functionality.render_scheduler import RenderScheduler
 
 from fractimation.data_models.complex_range_params import ComplexRangeParams
 from fractimation.data_models.dimension_params import DimensionParams
@@ -28,6 +29,10 @@ max_iterations = 60                                    # Total number of iterati
                                                        # ^^ Careful with this value; we are caching each frame
 color_map = "viridis"                                  # Any valid color map name or combination (default : viridis)
                                                        # ^^ reference : https://matplotlib.org/examples/color/colormaps_reference.html
+render_memory_budget = 2 * 1024 ** 3                   # Bytes of cached frames shared by every viewer (None for unlimited)
+
+# Every viewer renders on one shared pool of threads, the focused viewer first
+render_scheduler = RenderScheduler(memory_budget=render_memory_budget)
 
 # Mandelbrot Set
 real_number_min, real_number_max = -2.0, 0.5               # Min & Max values for X values in fractal equation
@@ -46,7 +51,7 @@ fractal = Multibrot(c_values_params, image_dimensions, escape_value, z_values_ra
 
 image_params = ImageParams(recolor_image=True)
 renderer = CachedImageRenderer(viewer.get_render_manager().get_animation_axes(), fractal, image_dimensions, image_params)
-renderer.preheat_render_cache(max_iterations)
+render_scheduler.register(renderer, max_iterations)
 
 zoom_backend = ZoomableComplexRange(renderer)
 zoom_handler = ZoomHandler(zoom_backend, viewer)
@@ -70,7 +75,7 @@ fractal = Multijulia(z_values_params, image_dimensions, escape_value, c_values_r
 
 image_params = ImageParams(recolor_image=True)
 renderer = CachedImageRenderer(viewer.get_render_manager().get_animation_axes(), fractal, image_dimensions, image_params)
-renderer.preheat_render_cache(max_iterations)
+render_scheduler.register(renderer, max_iterations)
 
 zoom_backend = ZoomableComplexRange(renderer)
 zoom_handler = ZoomHandler(zoom_backend, viewer)
@@ -94,7 +99,7 @@ formula_params = FormulaParams(coefficient_array, escape_value)
 fractal = NewtonMethod(z_values_params, c_values_params, image_dimensions, formula_params)
 
 renderer = CachedImageRenderer(viewer.get_render_manager().get_animation_axes(), fractal, image_dimensions, image_params)
-renderer.preheat_render_cache(max_iterations)
+render_scheduler.register(renderer, max_iterations)
 
 zoom_backend = ZoomableComplexRange(renderer)
 zoom_handler = ZoomHandler(zoom_backend, viewer)
@@ -102,4 +107,5 @@ zoom_handler = ZoomHandler(zoom_backend, viewer)
 viewer.initialize(max_iterations, renderer.render_to_canvas, "newtonFractal")
 
 # Render Viewers
+render_scheduler.start()
 PlotPlayer.show_players()
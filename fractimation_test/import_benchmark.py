@@ -0,0 +1,62 @@
+import statistics
+import subprocess
+import sys
+
+# Modules which form the dependency light core; importing them must not pull in Matplotlib so
+#   worker processes & command line jobs start quickly
+core_modules = ["fractimation.data_models.complex_range_params",
+                "fractimation.data_models.dimension_params",
+                "fractimation.data_models.image_params",
+                "fractimation.helpers.formula_tools",
+                "fractimation.helpers.histogram_tools",
+                "fractimation.helpers.render",
+                "fractimation.iterators.multibrot",
+                "fractimation.iterators.multijulia",
+                "fractimation.iterators.newton_method",
+                "fractimation.iterators.buddhabrot",
+                "fractimation.iterators.barnsley_fern",
+                "fractimation.iterators.koch_snowflake",
+                "fractimation.functionality.persistent_render_cache",
+                "fractimation.renderers.cached_image_renderer",
+                "fractimation.renderers.blitted_image_renderer",
+                "fractimation.renderers.cached_collection_renderer"]
+forbidden_modules = ["matplotlib"]      # Top level packages which the core must not import
+sample_count = 5                        # Number of fresh interpreters to time
+max_import_seconds = 1.0                # Median import time allowed for the whole core
+
+benchmark_code = """
+import sys
+import time
+
+start_time = time.perf_counter()
+for module_name in {modules!r}:
+    __import__(module_name)
+elapsed_time = time.perf_counter() - start_time
+
+loaded_modules = [module_name for module_name in {forbidden!r} if module_name in sys.modules]
+print(elapsed_time)
+print(",".join(loaded_modules))
+""".format(modules=core_modules, forbidden=forbidden_modules)
+
+import_times = []
+for sample_counter in range(0, sample_count):
+    # Every sample runs in a fresh interpreter so nothing is already cached in sys.modules
+    output = subprocess.run([sys.executable, "-c", benchmark_code], check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout
+    output_lines = output.splitlines()
+    import_times.append(float(output_lines[0]))
+
+    loaded_modules = output_lines[1] if len(output_lines) > 1 else ""
+    if loaded_modules:
+        print("FAILED : Core imports loaded {}".format(loaded_modules))
+        sys.exit(1)
+
+median_time = statistics.median(import_times)
+print("Imported {} core modules in {:.1f} ms (median of {} runs, min {:.1f} ms)".format(
+    len(core_modules), median_time * 1000, sample_count, min(import_times) * 1000))
+
+if median_time > max_import_seconds:
+    print("FAILED : Core import time exceeded {:.1f} ms".format(max_import_seconds * 1000))
+    sys.exit(1)
+
+print("Core imports are free of {}".format(", ".join(forbidden_modules)))
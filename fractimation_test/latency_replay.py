@@ -0,0 +1,66 @@
+import sys
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as pyplot
+
+from fractimation.data_models.complex_range_params import ComplexRangeParams
+from fractimation.data_models.dimension_params import DimensionParams
+from fractimation.data_models.image_params import ImageParams
+
+from fractimation.functionality.interaction_replay import (InteractionRecorder,
+                                                           InteractionReplayer,
+                                                           format_latency_report,
+                                                           load_interaction_session)
+from fractimation.functionality.zoomable_complex_range import ZoomableComplexRange
+
+from fractimation.iterators.multibrot import Multibrot
+
+from fractimation.renderers.cached_image_renderer import CachedImageRenderer
+
+# Replays a recorded interaction session (path given as the first argument) or a built in session
+#   headlessly & reports time to first frame & time to complete per action type
+width, height = 640, 360                # Width and Height of the image
+max_iterations = 40                     # Frames played after each zoom
+repeat_count = 3                        # Number of times the session is replayed
+max_first_frame_p95_seconds = None      # Fail when any p95 time to first frame exceeds this
+
+real_number_min, real_number_max = -2.0, 0.5
+imaginary_number_min, imaginary_number_max = -1.25, 1.25
+escape_value = 2.0
+
+if len(sys.argv) > 1:
+    session_actions = load_interaction_session(sys.argv[1])
+else:
+    recorder = InteractionRecorder()
+    recorder.record_playback(0, max_iterations)
+    recorder.record_seek(max_iterations // 2)
+    recorder.record_zoom_in(width // 4, height // 4, width // 2, height // 2)
+    recorder.record_seek(5)
+    recorder.record_zoom_in(width // 3, height // 3, width // 2, height // 2)
+    recorder.record_zoom_out()
+    recorder.record_zoom_out()
+    recorder.record_playback(max_iterations // 4, max_iterations // 2)
+    session_actions = recorder.get_actions()
+
+figure = pyplot.figure()
+axes = figure.add_subplot(1, 1, 1)
+
+image_dimensions = DimensionParams(width, height)
+c_values_params = ComplexRangeParams(real_number_min, real_number_max, imaginary_number_min,
+                                     imaginary_number_max)
+fractal = Multibrot(c_values_params, image_dimensions, escape_value)
+
+renderer = CachedImageRenderer(axes, fractal, image_dimensions, ImageParams(recolor_image=True))
+zoom_backend = ZoomableComplexRange(renderer)
+
+replayer = InteractionReplayer(zoom_backend, renderer, max_iterations)
+latency_report = replayer.replay(session_actions, repeat_count)
+print(format_latency_report(latency_report))
+
+if max_first_frame_p95_seconds is not None:
+    for action_type, action_latency in latency_report.items():
+        if action_latency["time_to_first_frame"]["p95"] > max_first_frame_p95_seconds:
+            print("FAILED : {} p95 time to first frame exceeded {:.1f} ms".format(
+                action_type, max_first_frame_p95_seconds * 1000))
+            sys.exit(1)